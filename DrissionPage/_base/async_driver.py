@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import (open_connection, get_event_loop, ensure_future, wait_for, current_task, IncompleteReadError,
+                     CancelledError)
+from asyncio import TimeoutError as AsyncTimeoutError
+from base64 import b64encode
+from hashlib import sha1
+from inspect import isawaitable
+from os import urandom
+from struct import unpack
+from urllib.parse import urlparse
+
+from websocket import ABNF
+
+from .codec import dumps, loads
+from .driver import NoSession, _unsubscribed
+from .._functions.settings import Settings as _S
+from ..errors import BrowserConnectError
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class AsyncDriver(object):
+    def __init__(self, address, owner=None):
+        self.address = address
+        self.owner = owner
+        self.alert_flag = set()  # 标记alert出现的session
+
+        self._cur_id = 0
+        self._reader = None
+        self._writer = None
+        self._recv_task = None
+        self._tasks = set()
+        self._session_owner = {}
+
+        self.is_running = False
+        self.method_results = {}
+
+        if owner:
+            self.add_session_owner(None, owner)
+
+    async def start(self):
+        if self.is_running:
+            return True
+        u = urlparse(self.address)
+        try:
+            self._reader, self._writer = await open_connection(u.hostname, u.port or 80)
+        except OSError:
+            raise BrowserConnectError(_S._lang.BROWSER_NOT_EXIST)
+
+        key = b64encode(urandom(16)).decode()
+        self._writer.write(f'GET {u.path or "/"} HTTP/1.1\r\nHost: {u.netloc}\r\nUpgrade: websocket\r\n'
+                           f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n'
+                           f'Sec-WebSocket-Version: 13\r\n\r\n'.encode())
+        await self._writer.drain()
+        try:
+            head = (await self._reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+        except (IncompleteReadError, OSError):
+            head = ''
+        status = head.split('\r\n', 1)[0].split(' ')
+        accept = b64encode(sha1(f'{key}{_WS_GUID}'.encode()).digest()).decode()
+        if status[1:2] != ['101'] or accept not in head:
+            self._writer.close()
+            if status[1:2] == ['403']:
+                raise EnvironmentError(_S._lang.joinn(_S._lang.UPGRADE_WS))
+            raise BrowserConnectError(_S._lang.BROWSER_CONNECT_ERR2, INFO=head.split('\r\n', 1)[0])
+
+        self.is_running = True
+        self._recv_task = ensure_future(self._recv_loop())
+        return True
+
+    async def stop(self):
+        self._stop()
+        if self._recv_task:
+            try:
+                await self._recv_task
+            except CancelledError:
+                pass
+        return True
+
+    def _stop(self):
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._recv_task and not self._recv_task.done() and self._recv_task is not _current_task():
+            self._recv_task.cancel()
+
+        for fut, _ in self.method_results.values():
+            if not fut.done():
+                fut.set_result({'error': {'message': 'connection disconnected'}})
+        self.method_results.clear()
+        owners = list(self._session_owner.values())
+        self._session_owner.clear()
+        self.alert_flag.clear()
+        if self.owner and self.owner not in owners:
+            owners.append(self.owner)
+        for owner in owners:
+            owner._on_disconnect()
+
+    async def _send(self, message, timeout, ws_id):
+        if not timeout:
+            try:
+                await self._write(message)
+                return {'id': ws_id, 'result': {}}
+            except (OSError, AttributeError):
+                return {'error': {'message': 'connection disconnected'}}
+
+        sid = message.get('sessionId') if message['method'].startswith(('Input.', 'Runtime.')) else None
+        fut = get_event_loop().create_future()
+        self.method_results[ws_id] = (fut, sid)
+        try:
+            await self._write(message)
+        except (OSError, AttributeError):
+            self.method_results.pop(ws_id, None)
+            return {'error': {'message': 'connection disconnected'}}
+
+        # alert出现后给已发出的请求留0.2秒返回
+        alerted = sid and sid in self.alert_flag and (timeout is None or timeout > .2)
+        try:
+            return await wait_for(fut, .2 if alerted else timeout)
+        except AsyncTimeoutError:
+            if alerted:
+                return {'error': {'message': 'alert exists.'}}
+            return {'id': ws_id, 'error': {'message': 'timeout'}}
+        finally:
+            self.method_results.pop(ws_id, None)
+
+    async def _write(self, message):
+        self._writer.write(ABNF.create_frame(dumps(message), ABNF.OPCODE_TEXT).format())
+        await self._writer.drain()
+
+    async def _recv(self):
+        """读取一条完整的websocket信息，自动回应ping，收到close帧时抛出ConnectionError"""
+        data = b''
+        while True:
+            b1, b2 = await self._reader.readexactly(2)
+            opcode = b1 & 0x0f
+            length = b2 & 0x7f
+            if length == 126:
+                length = unpack('!H', await self._reader.readexactly(2))[0]
+            elif length == 127:
+                length = unpack('!Q', await self._reader.readexactly(8))[0]
+            mask = await self._reader.readexactly(4) if b2 & 0x80 else None
+            payload = await self._reader.readexactly(length)
+            if mask:
+                payload = ABNF.mask(mask, payload)
+
+            if opcode == ABNF.OPCODE_CLOSE:
+                raise ConnectionError
+            elif opcode == ABNF.OPCODE_PING:
+                self._writer.write(ABNF.create_frame(payload, ABNF.OPCODE_PONG).format())
+                continue
+            elif opcode == ABNF.OPCODE_PONG:
+                continue
+
+            data += payload
+            if b1 & 0x80:
+                return data
+
+    async def _recv_loop(self):
+        while self.is_running:
+            try:
+                raw = await self._recv()
+            except (IncompleteReadError, OSError, ValueError, AttributeError):
+                self._stop()
+                return
+            try:
+                raw = raw.decode('utf-8')
+                if _unsubscribed(self._session_owner, raw):
+                    continue
+                msg = loads(raw)
+            except ValueError:  # 无法解析的信息丢弃，不当作连接断开
+                continue
+
+            if 'method' in msg:
+                if msg['method'].startswith('Page.javascriptDialog'):
+                    sid = msg.get('sessionId')
+                    if sid:
+                        if msg['method'].endswith('Opening'):
+                            self.alert_flag.add(sid)
+                            get_event_loop().call_later(.2, self._fail_alerted, sid)
+                        else:
+                            self.alert_flag.discard(sid)
+                self._session_owner.get(msg.get('sessionId'), NoSession)._recv_event(msg)
+
+            else:
+                r = self.method_results.get(msg.get('id'))
+                if r and not r[0].done():
+                    r[0].set_result(msg)
+
+    def _fail_alerted(self, session_id):
+        """alert出现0.2秒后仍未返回的Input和Runtime请求返回alert错误
+        :param session_id: 出现alert的session id
+        :return: None
+        """
+        if session_id not in self.alert_flag:
+            return
+        for fut, sid in self.method_results.values():
+            if sid == session_id and not fut.done():
+                fut.set_result({'error': {'message': 'alert exists.'}})
+
+    def spawn(self, coro):
+        if not isawaitable(coro):
+            return None
+        task = ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def add_session_owner(self, session_id, obj):
+        self._session_owner[session_id] = obj
+
+    def remove_session_owner(self, session_id):
+        self._session_owner.pop(session_id, None)
+
+    async def run(self, _method, _timeout=None, _session_id=None, **kwargs):
+        if not self.is_running:
+            return {'error': 'connection disconnected'}
+
+        if _timeout is None:
+            _timeout = _S.cdp_timeout
+
+        self._cur_id += 1
+        ws_id = self._cur_id
+        result = await self._send(({'id': ws_id, 'method': _method, 'params': kwargs, 'sessionId': _session_id}
+                                   if _session_id else {'id': ws_id, 'method': _method, 'params': kwargs}),
+                                  timeout=_timeout, ws_id=ws_id)
+        if 'error' in result:
+            return {'error': result['error']['message'], 'method': _method,
+                    'args': kwargs, 'data': result['error'].get('data'), 'timeout': _timeout}
+        else:
+            return result['result']
+
+
+def _current_task():
+    """返回当前正在运行的任务，不在事件循环中时返回None"""
+    try:
+        return current_task()
+    except RuntimeError:
+        return None
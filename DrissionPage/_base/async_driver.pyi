@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import StreamReader, StreamWriter, Task, Future
+from typing import Dict, Optional, Set, Tuple, Any, Awaitable
+
+from .._pages.async_tab import AsyncChromiumTab
+
+
+class AsyncDriver(object):
+    """基于asyncio的浏览器驱动，一个连接可供多个标签页通过session共用，不创建线程"""
+    _cur_id: int = ...
+    _reader: Optional[StreamReader] = ...
+    _writer: Optional[StreamWriter] = ...
+    _recv_task: Optional[Task] = ...
+    _tasks: Set[Task] = ...
+    _session_owner: Dict[Optional[str], AsyncChromiumTab] = ...
+    address: str = ...
+    owner: Any = ...
+    alert_flag: Set[str] = ...
+    is_running: bool = ...
+    method_results: Dict[int, Tuple[Future, Optional[str]]] = ...
+
+    def __init__(self, address: str, owner: Any = None):
+        """
+        :param address: 浏览器或标签页的websocket连接地址
+        :param owner: 创建这个驱动的对象
+        """
+        ...
+
+    async def start(self) -> bool:
+        """连接浏览器并启动接收任务"""
+        ...
+
+    async def stop(self) -> bool:
+        """断开连接并等待接收任务结束"""
+        ...
+
+    def _stop(self) -> None:
+        """断开连接，所有等待中的请求返回连接断开信息"""
+        ...
+
+    async def _send(self, message: dict, timeout: float, ws_id: int) -> dict:
+        """发送信息到浏览器，并返回浏览器返回的信息
+        :param message: 发送给浏览器的数据
+        :param timeout: 超时时间，为0时不等待返回
+        :param ws_id: 信息id号
+        :return: 浏览器返回的数据
+        """
+        ...
+
+    async def _write(self, message: dict) -> None:
+        """以websocket文本帧发送数据"""
+        ...
+
+    async def _recv(self) -> bytes: ...
+
+    async def _recv_loop(self) -> None:
+        """接收浏览器信息的任务"""
+        ...
+
+    def _fail_alerted(self, session_id: str) -> None: ...
+
+    def spawn(self, coro: Awaitable) -> Optional[Task]:
+        """在事件循环中运行协程（如异步事件回调），并保留其引用直到完成
+        :param coro: 协程对象，不是可等待对象时不执行
+        :return: Task对象
+        """
+        ...
+
+    def add_session_owner(self, session_id: Optional[str], obj: AsyncChromiumTab) -> None:
+        """登记session对应的对象，该session的事件交由其处理
+        :param session_id: session id
+        :param obj: 处理事件的对象
+        :return: None
+        """
+        ...
+
+    def remove_session_owner(self, session_id: Optional[str]) -> None:
+        """移除session对应的对象
+        :param session_id: session id
+        :return: None
+        """
+        ...
+
+    async def run(self, _method: str, _timeout: Optional[float] = None, _session_id: Optional[str] = None,
+                  **kwargs) -> dict:
+        """执行cdp方法，返回格式与Driver.run()一致
+        :param _method: cdp方法名
+        :param _timeout: 超时时间（秒），为None时使用Settings.cdp_timeout
+        :param _session_id: 要发送到的session id
+        :param kwargs: cdp参数
+        :return: 执行结果
+        """
+        ...
+
+
+def _current_task() -> Optional[Task]: ...
@@ -10,12 +10,12 @@ from copy import copy
 from pathlib import Path
 from queue import Queue, Empty
 from re import sub
-from threading import Thread
 from urllib.parse import quote
 
 from DrissionGet import DrissionGet
 from requests import Session
 
+from .dispatcher import EventDispatcher
 from .._configs.session_options import SessionOptions
 from .._elements.none_element import NoneElement
 from .._functions.elements import get_frame, get_eles
@@ -372,49 +372,74 @@ class Messenger(object):
         self._session_id = None
         self._imm_events = set()
         self._event_queue = Queue()
+        self._dropped_events = {}
         self._messenger_running = False
-        if not hasattr(self, '_recv_th'):
-            self._recv_th = Thread(target=self._handle_event_loop)
-            self._recv_th.daemon = True
+        self._dispatcher = None
         self._event_handlers = {}
         self._debug = False
         self._run_func = self._run_cdp_
+        self._run_many_func = self._run_cdp_many_
         self._enabled = {}
 
     @property
     def _run_cdp(self):
         return self._run_func
 
+    @property
+    def _run_cdp_many(self):
+        return self._run_many_func
+
     def _start_messenger(self):
         self._messenger_running = True
         self._session_id = self._browser._get_session_id(self._target_id, obj=self)
-        if not self._recv_th.is_alive():
-            self._recv_th.start()
+        if not self._browser._dispatcher.is_running:  # 浏览器断开重启后，已停止的线程池换成新的
+            self._browser._dispatcher = EventDispatcher(self._browser._dispatcher.workers)
+        self._dispatcher = self._browser._dispatcher
+        self._dispatcher.register(self)
 
     def _stop_messenger(self):
         self._messenger_running = False
+        if self._dispatcher:
+            self._dispatcher.unregister(self)
         self._browser._detach(self._session_id)
         self._run_func = self._raise_stopped
+        self._run_many_func = self._raise_stopped
 
     def _run_cdp_(self, cmd, _ignore=None, _user=False, _timeout=None, **cmd_args):
         r = self._driver.run(cmd, _timeout=_timeout, _session_id=self._session_id, _debug=self._debug, **cmd_args)
         return r if 'error' not in r or _ignore is True else raise_error(r, self._browser, ignore=_ignore, user=_user)
 
+    def _run_cdp_many_(self, cmds, _ignore=None, _user=False, _timeout=None):
+        rs = self._driver.run_many(cmds, _timeout=_timeout, _session_id=self._session_id, _debug=self._debug)
+        return [r if 'error' not in r or _ignore is True else raise_error(r, self._browser, ignore=_ignore, user=_user)
+                for r in rs]
+
+    def _accept_event(self, method):
+        """判断事件是否有人订阅，没有则记入丢弃数"""
+        if self._event_handlers.get(method):
+            return True
+        self._dropped_events[method] = self._dropped_events.get(method, 0) + 1
+        return False
+
     def _recv_event(self, msg):
-        if self._imm_events and msg.get('method') in self._imm_events:
-            functions = self._event_handlers.get(msg['method'])
-            if functions:
-                for func in functions:
-                    func(**msg['params'])
+        if not self._accept_event(msg.get('method')):
+            return
+        if self._imm_events and msg['method'] in self._imm_events:
+            for func in self._event_handlers.get(msg['method'], ()):
+                func(**msg['params'])
             return
         self._event_queue.put(msg)
+        if self._dispatcher:
+            self._dispatcher.submit(self)
 
-    def _handle_event_loop(self):
-        while self._messenger_running:
+    def _handle_events(self, limit):
+        for _ in range(limit):
+            if not self._messenger_running:
+                return
             try:
-                event = self._event_queue.get(timeout=1)
+                event = self._event_queue.get_nowait()
             except Empty:
-                continue
+                return
             functions = self._event_handlers.get(event['method'])
             if functions:
                 for func in functions:
@@ -7,13 +7,13 @@
 """
 from abc import abstractmethod
 from queue import Queue
-from threading import Thread
-from typing import Union, Tuple, List, Any, Optional, Dict, Callable
+from typing import Union, Tuple, List, Any, Optional, Dict, Callable, Iterable
 
 from DrissionGet import DrissionGet
 from requests import Session
 from requests.structures import CaseInsensitiveDict
 
+from .dispatcher import EventDispatcher
 from .driver import Driver
 from .._browsers.chromium import Chromium
 from .._configs.session_options import SessionOptions
@@ -463,10 +463,12 @@ class Messenger(object):
     _messenger_running: bool = ...
     _event_queue: Queue = ...
     _imm_events: set = ...
+    _dropped_events: Dict[str, int] = ...
     _event_handlers: Dict[str, List[Callable]] = ...
-    _recv_th: Thread = ...
+    _dispatcher: Optional[EventDispatcher] = ...
     _type: str = ...
     _run_func: Callable = ...
+    _run_many_func: Callable = ...
     _enabled: dict = ...
 
     def __init__(self) -> None:
@@ -493,6 +495,27 @@ class Messenger(object):
         """
         ...
 
+    def _run_cdp_many(self,
+                      cmds: Iterable[Union[str, Tuple[str, dict]]],
+                      _ignore: Union[True, None, Exception] = None,
+                      _user: bool = False,
+                      _timeout: float = None) -> List[dict]:
+        """一次性发送多条Chrome DevTools Protocol语句，并统一等待所有结果
+        :param cmds: 由(协议项目, 参数dict)或协议项目组成的列表
+        :param _ignore: 忽略的报错，为True忽略所有
+        :param _user: 是否用户调用
+        :param _timeout: 超时时间
+        :return: 与cmds顺序对应的执行结果列表
+        """
+        ...
+
+    def _accept_event(self, method: str) -> bool:
+        """判断事件是否有人订阅，没有则记入丢弃数
+        :param method: 事件名称
+        :return: 是否有人订阅
+        """
+        ...
+
     def _recv_event(self, msg: dict) -> None:
         """接收从Driver发送过来的信息
         :param msg: 接收到的信息
@@ -500,8 +523,11 @@ class Messenger(object):
         """
         ...
 
-    def _handle_event_loop(self) -> None:
-        """接收到动作时执行相应方法"""
+    def _handle_events(self, limit: int) -> None:
+        """由事件调度器调用，处理队列中的事件
+        :param limit: 本次最多处理的事件数
+        :return: None
+        """
         ...
 
     def _on_disconnect(self) -> None:
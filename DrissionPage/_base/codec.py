@@ -0,0 +1,111 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from json import dumps as _json_dumps, loads as _json_loads
+
+from .._functions.settings import Settings as _S
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+_EVENT_HEAD = '{"method":"'
+_SESSION_KEY = '"sessionId":"'
+
+
+def _orjson_loads(data):
+    """orjson不接受浏览器可能发送的单独代理字符转义，解析失败时交给标准库处理"""
+    try:
+        return orjson.loads(data)
+    except ValueError:
+        return _json_loads(data)
+
+
+def _orjson_dumps(obj):
+    """orjson不支持的数据（如超过64位的整数）交给标准库处理"""
+    try:
+        return orjson.dumps(obj)
+    except TypeError:
+        return _json_dumps(obj)
+
+
+def _ujson_loads(data):
+    """ujson解析失败时交给标准库处理"""
+    try:
+        return ujson.loads(data)
+    except ValueError:
+        return _json_loads(data)
+
+
+def _ujson_dumps(obj):
+    """ujson不支持的数据交给标准库处理"""
+    try:
+        return ujson.dumps(obj, ensure_ascii=False)
+    except (TypeError, OverflowError):
+        return _json_dumps(obj)
+
+
+_CODECS = {'json': (_json_loads, _json_dumps)}
+if orjson:
+    _CODECS['orjson'] = (_orjson_loads, _orjson_dumps)
+if ujson:
+    _CODECS['ujson'] = (_ujson_loads, _ujson_dumps)
+
+_name = 'orjson' if orjson else 'ujson' if ujson else 'json'
+_loads, _dumps = _CODECS[_name]
+
+
+def available_codecs():
+    return list(_CODECS)
+
+
+def current_codec():
+    return _name
+
+
+def set_codec(name='auto'):
+    global _name, _loads, _dumps
+    if name in (None, 'auto'):
+        name = 'orjson' if orjson else 'ujson' if ujson else 'json'
+    elif name not in _CODECS:
+        if name in ('orjson', 'ujson'):
+            raise EnvironmentError(_S._lang.joinn(_S._lang.NEED_LIB_, name, TIP=f'pip install {name}'))
+        raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'name',
+                                        ALLOW_VAL="'auto', 'json', 'orjson', 'ujson'", CURR_VAL=name))
+    _name = name
+    _loads, _dumps = _CODECS[name]
+
+
+def loads(data):
+    return _loads(data)
+
+
+def dumps(obj):
+    return _dumps(obj)
+
+
+def peek_event(raw):
+    if not isinstance(raw, str) or not raw.startswith(_EVENT_HEAD):
+        return None
+    end = raw.find('"', 11)
+    if end < 0:
+        return None
+
+    i = raw.rfind(_SESSION_KEY)
+    if i < 0:
+        return raw[11:end], None
+    # 浏览器发出的事件中sessionId总是最后一个键，无法确定归属时交给完整解析
+    sid = raw[i + 13:-2]
+    if raw.endswith('"}') and '"' not in sid:
+        return raw[11:end], sid
+    return None
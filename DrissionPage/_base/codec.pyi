@@ -0,0 +1,50 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from typing import Any, List, Literal, Optional, Tuple, Union
+
+
+def available_codecs() -> List[str]:
+    """返回可用的json库名称"""
+    ...
+
+
+def current_codec() -> str:
+    """返回当前使用的json库名称"""
+    ...
+
+
+def set_codec(name: Literal['auto', 'json', 'orjson', 'ujson'] = 'auto') -> None:
+    """设置与浏览器通讯时使用的json库
+    :param name: 'auto'时依次选用已安装的orjson、ujson和标准库json
+    :return: None
+    """
+    ...
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """用当前json库解析文本
+    :param data: json文本
+    :return: 解析结果
+    """
+    ...
+
+
+def dumps(obj: Any) -> Union[str, bytes]:
+    """用当前json库序列化对象，orjson返回bytes
+    :param obj: 要序列化的对象
+    :return: json文本
+    """
+    ...
+
+
+def peek_event(raw: str) -> Optional[Tuple[str, Optional[str]]]:
+    """不解析整条信息，读取事件的方法名和session id
+    :param raw: 浏览器发来的原始文本
+    :return: (方法名, session id)，不是事件或格式无法识别时返回None
+    """
+    ...
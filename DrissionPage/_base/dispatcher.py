@@ -0,0 +1,101 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from queue import Queue
+from threading import Thread, Lock, current_thread
+from traceback import print_exc
+
+from .._functions.settings import Settings as _S
+
+
+class EventDispatcher(object):
+    def __init__(self, workers=None, batch=50):
+        self._max_workers = max(1, int(workers or _S.event_workers))
+        self._batch = batch  # 每个对象一次最多处理的事件数，避免单个繁忙session占住线程
+        self._ready = Queue()
+        self._lock = Lock()
+        self._workers = []
+        self._idle = 0
+        self._scheduled = set()  # 已排队或正在处理的对象id
+        self._messengers = {}
+        self.is_running = True
+
+    @property
+    def workers(self):
+        return self._max_workers
+
+    @property
+    def alive_workers(self):
+        with self._lock:
+            return len(self._workers)
+
+    def set_workers(self, num):
+        num = max(1, int(num))
+        with self._lock:
+            surplus = len(self._workers) - num
+            self._max_workers = num
+        for _ in range(max(surplus, 0)):
+            self._ready.put(None)
+
+    def register(self, messenger):
+        with self._lock:
+            self._messengers[id(messenger)] = messenger
+
+    def unregister(self, messenger):
+        with self._lock:
+            self._messengers.pop(id(messenger), None)
+
+    def backlog(self):
+        with self._lock:
+            messengers = list(self._messengers.values())
+        return {m._session_id: m._event_queue.qsize() for m in messengers}
+
+    def submit(self, messenger):
+        with self._lock:
+            if not self.is_running or id(messenger) in self._scheduled:
+                return
+            self._scheduled.add(id(messenger))
+            if self._idle == 0 and len(self._workers) < self._max_workers:
+                th = Thread(target=self._work)
+                th.daemon = True
+                self._workers.append(th)
+                th.start()
+        self._ready.put(messenger)
+
+    def stop(self):
+        with self._lock:
+            if not self.is_running:
+                return
+            self.is_running = False
+            num = len(self._workers)
+        for _ in range(num):
+            self._ready.put(None)
+
+    def _work(self):
+        """工作线程，轮流处理各对象的事件，同一对象同时只在一个线程中处理以保证顺序"""
+        while True:
+            with self._lock:
+                self._idle += 1
+            messenger = self._ready.get()
+            with self._lock:
+                self._idle -= 1
+                if messenger is None:
+                    self._workers.remove(current_thread())
+                    return
+
+            try:
+                messenger._handle_events(self._batch)
+            except Exception:  # 回调出错不能影响其它session
+                print_exc()
+
+            with self._lock:
+                again = messenger._messenger_running and not messenger._event_queue.empty()
+                if not again:
+                    self._scheduled.discard(id(messenger))
+            if again:
+                self._ready.put(messenger)
+
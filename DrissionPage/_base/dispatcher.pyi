@@ -0,0 +1,79 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from queue import Queue
+from threading import Lock, Thread
+from typing import Optional, Dict, List, Set
+
+from .base import Messenger
+
+
+class EventDispatcher(object):
+    _max_workers: int = ...
+    _batch: int = ...
+    _ready: Queue = ...
+    _lock: Lock = ...
+    _workers: List[Thread] = ...
+    _idle: int = ...
+    _scheduled: Set[int] = ...
+    _messengers: Dict[int, Messenger] = ...
+    is_running: bool = ...
+
+    def __init__(self, workers: int = None, batch: int = 50):
+        """浏览器及其所有标签页、iframe共用的事件处理线程池，同一对象的事件按顺序处理
+        :param workers: 最大线程数，为None时使用Settings.event_workers
+        :param batch: 每个对象一次最多处理的事件数
+        """
+        ...
+
+    @property
+    def workers(self) -> int:
+        """返回最大线程数"""
+        ...
+
+    @property
+    def alive_workers(self) -> int:
+        """返回当前已启动的线程数"""
+        ...
+
+    def set_workers(self, num: int) -> None:
+        """设置最大线程数，多出的线程处理完当前事件后退出
+        :param num: 线程数，不小于1
+        :return: None
+        """
+        ...
+
+    def register(self, messenger: Messenger) -> None:
+        """登记一个接收事件的对象
+        :param messenger: Messenger对象
+        :return: None
+        """
+        ...
+
+    def unregister(self, messenger: Messenger) -> None:
+        """注销一个接收事件的对象
+        :param messenger: Messenger对象
+        :return: None
+        """
+        ...
+
+    def backlog(self) -> Dict[Optional[str], int]:
+        """返回各登记对象待处理的事件数，格式：{session id: 数量}"""
+        ...
+
+    def submit(self, messenger: Messenger) -> None:
+        """通知调度器某对象有待处理的事件
+        :param messenger: Messenger对象
+        :return: None
+        """
+        ...
+
+    def stop(self) -> None:
+        """停止所有线程"""
+        ...
+
+    def _work(self) -> None: ...
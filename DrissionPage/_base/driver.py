@@ -5,7 +5,6 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from json import dumps, loads, JSONDecodeError
 from queue import Queue, Empty
 from threading import Thread, Lock
 from time import perf_counter, sleep
@@ -15,10 +14,13 @@ from requests import adapters
 from websocket import (WebSocketTimeoutException, WebSocketConnectionClosedException, create_connection,
                        WebSocketException, WebSocketBadStatusException)
 
+from .codec import dumps, loads, peek_event
 from .._functions.settings import Settings as _S
 from ..errors import BrowserConnectError
 
 adapters.DEFAULT_RETRIES = 5
+_ALERT = object()  # 通知等待中的请求有alert出现
+_DISCONNECTED = object()  # 通知等待中的请求连接已断开
 
 
 class ThreadSafeDict:
@@ -42,6 +44,10 @@ class ThreadSafeDict:
         with self._lock:
             return self._dict.get(k, default)
 
+    def values(self):
+        with self._lock:
+            return list(self._dict.values())
+
     def pop(self, item, default):
         with self._lock:
             self._dict.pop(item, default)
@@ -88,39 +94,116 @@ class Driver(object):
             self.method_results.pop(ws_id, None)
             return {'error': {'message': 'connection disconnected'}}
 
-        end_time = perf_counter() + timeout
+        alert = message.get('sessionId') and message['method'].startswith(('Input.', 'Runtime.'))
+        end_time = None if timeout is None else perf_counter() + timeout
+        wait = timeout
         while self.is_running:
             try:
-                result = self.method_results[ws_id].get(timeout=.2)
-                self.method_results.pop(ws_id, None)
-                return result
+                # alert出现后给已发出的请求留0.2秒返回
+                result = self.method_results[ws_id].get(
+                    timeout=.2 if alert and message['sessionId'] in self.alert_flag and (wait is None or wait > .2)
+                    else wait)
+                if result is _DISCONNECTED:
+                    break
+                elif result is not _ALERT:
+                    self.method_results.pop(ws_id, None)
+                    return result
 
             except Empty:
-                if (self.alert_flag and message['sessionId'] in self.alert_flag
-                        and message['method'].startswith(('Input.', 'Runtime.'))):
+                if alert and message['sessionId'] in self.alert_flag:
                     return {'error': {'message': 'alert exists.'}}
 
-                if timeout is not None and perf_counter() > end_time:
+            if end_time is not None:
+                wait = end_time - perf_counter()
+                if wait <= 0:
                     self.method_results.pop(ws_id, None)
                     return {'id': ws_id, 'error': {'message': 'timeout'}}
 
         return {'error': {'message': 'connection disconnected'}}
 
+    def _send_many(self, messages, timeout):
+        ids = [m['id'] for m in messages]
+        if not timeout:
+            try:
+                for m in messages:
+                    self._ws.send(dumps(m))
+                return {i: {'id': i, 'result': {}} for i in ids}
+            except (OSError, WebSocketConnectionClosedException):
+                return {i: {'error': {'message': 'connection disconnected'}} for i in ids}
+
+        q = Queue()
+        for i in ids:
+            self.method_results[i] = q
+        try:
+            for m in messages:
+                self._ws.send(dumps(m))
+        except (OSError, WebSocketConnectionClosedException):
+            for i in ids:
+                self.method_results.pop(i, None)
+            return {i: {'error': {'message': 'connection disconnected'}} for i in ids}
+
+        def alerted():
+            return self.alert_flag and any(m['id'] not in results and m.get('sessionId') in self.alert_flag
+                                           and m['method'].startswith(('Input.', 'Runtime.')) for m in messages)
+
+        results = {}
+        end_time = None if timeout is None else perf_counter() + timeout
+        wait = timeout
+        while self.is_running and len(results) < len(ids):
+            err = None
+            try:
+                result = q.get(timeout=.2 if (wait is None or wait > .2) and alerted() else wait)
+                if result is _DISCONNECTED:
+                    break
+                elif result is not _ALERT:
+                    self.method_results.pop(result['id'], None)
+                    results[result['id']] = result
+                    continue
+
+            except Empty:
+                if alerted():
+                    err = {'message': 'alert exists.'}
+
+            if err is None and end_time is not None:
+                wait = end_time - perf_counter()
+                if wait <= 0:
+                    err = {'message': 'timeout'}
+            if err:
+                for i in ids:
+                    if i not in results:
+                        self.method_results.pop(i, None)
+                        results[i] = {'id': i, 'error': err}
+
+        for i in ids:
+            if i not in results:
+                results[i] = {'error': {'message': 'connection disconnected'}}
+        return results
+
     def _recv_loop(self):
         while self.is_running:
             try:
-                msg = loads(self._ws.recv())
+                raw = self._ws.recv()
+                if _unsubscribed(self._session_owner, raw):
+                    continue
             except WebSocketTimeoutException:
                 continue
-            except (WebSocketException, OSError, WebSocketConnectionClosedException, JSONDecodeError):
+            except (WebSocketException, OSError, WebSocketConnectionClosedException, ValueError):
                 self._stop()
                 return
+            try:
+                msg = loads(raw)
+            except ValueError:  # 无法解析的信息丢弃，不当作连接断开
+                continue
 
             if 'method' in msg:
                 if msg['method'].startswith('Page.javascriptDialog'):
                     sid = msg.get('sessionId')
                     if sid:
-                        (self.alert_flag.add if msg['method'].endswith('Opening') else self.alert_flag.discard)(sid)
+                        if msg['method'].endswith('Opening'):
+                            self.alert_flag.add(sid)
+                            self._notify(_ALERT)
+                        else:
+                            self.alert_flag.discard(sid)
                 self._session_owner.get(msg.get('sessionId'), NoSession)._recv_event(msg)
 
             else:
@@ -128,6 +211,10 @@ class Driver(object):
                 if r:
                     r.put(msg)
 
+    def _notify(self, signal):
+        for q in self.method_results.values():
+            q.put(signal)
+
     def add_session_owner(self, session_id, obj):
         self._session_owner[session_id] = obj
 
@@ -152,6 +239,31 @@ class Driver(object):
         else:
             return result['result']
 
+    def run_many(self, cmds, _timeout=None, _session_id=None, _debug=False):
+        cmds = [(c, {}) if isinstance(c, str) else (c[0], c[1] if len(c) > 1 and c[1] else {}) for c in cmds]
+        if not self.is_running:
+            return [{'error': 'connection disconnected'} for _ in cmds]
+
+        if _timeout is None:
+            _timeout = _S.cdp_timeout
+
+        messages = []
+        for method, kwargs in cmds:
+            self._cur_id += 1
+            messages.append({'id': self._cur_id, 'method': method, 'params': kwargs, 'sessionId': _session_id}
+                            if _session_id else {'id': self._cur_id, 'method': method, 'params': kwargs})
+        results = self._send_many(messages, timeout=_timeout) if messages else {}
+
+        r = []
+        for msg in messages:
+            result = results[msg['id']]
+            if 'error' in result:
+                r.append({'error': result['error']['message'], 'method': msg['method'],
+                          'args': msg['params'], 'data': result['error'].get('data'), 'timeout': _timeout})
+            else:
+                r.append(result['result'])
+        return r
+
     def start(self):
         self.is_running = True
         try:
@@ -181,6 +293,7 @@ class Driver(object):
             self._ws.close()
             self._ws = None
 
+        self._notify(_DISCONNECTED)
         self.method_results.clear()
         self._session_owner.clear()
         self.alert_flag.clear()
@@ -228,15 +341,34 @@ class DebugDriver(Driver):
         else:
             return result['result']
 
+    def run_many(self, cmds, _timeout=None, _session_id=None, _debug=False):
+        _debug = _debug or self._debug
+        if _debug:
+            for c in cmds:
+                method = c if isinstance(c, str) else c[0]
+                if _debug is True or method.startswith(_debug):
+                    print(f'发 {c}')
+        results = super().run_many(cmds, _timeout=_timeout, _session_id=_session_id)
+        if _debug:
+            for c, result in zip(cmds, results):
+                method = c if isinstance(c, str) else c[0]
+                if _debug is True or method.startswith(_debug):
+                    print(f'回 {result}')
+        return results
+
     def _recv_loop(self):
         while self.is_running:
             try:
-                msg = loads(self._ws.recv())
+                raw = self._ws.recv()
             except WebSocketTimeoutException:
                 continue
-            except (WebSocketException, OSError, WebSocketConnectionClosedException, JSONDecodeError):
+            except (WebSocketException, OSError, WebSocketConnectionClosedException, ValueError):
                 self._stop()
                 return
+            try:
+                msg = loads(raw)
+            except ValueError:
+                continue
 
             if 'method' in msg:
                 if self._debug and (self._debug is True or msg['method'].startswith(self._debug)):
@@ -244,7 +376,11 @@ class DebugDriver(Driver):
                 if msg['method'].startswith('Page.javascriptDialog'):
                     sid = msg.get('sessionId')
                     if sid:
-                        (self.alert_flag.add if msg['method'].endswith('Opening') else self.alert_flag.discard)(sid)
+                        if msg['method'].endswith('Opening'):
+                            self.alert_flag.add(sid)
+                            self._notify(_ALERT)
+                        else:
+                            self.alert_flag.discard(sid)
                 self._session_owner.get(msg.get('sessionId'), NoSession)._debug_recv_event(msg)
 
             else:
@@ -261,3 +397,19 @@ class NoSession(object):
     @classmethod
     def _debug_recv_event(cls, msg):
         pass
+
+
+def _unsubscribed(session_owner, raw):
+    """判断信息是否无人订阅的事件，是则不必解析
+    :param session_owner: session id与接收对象的对应字典
+    :param raw: 浏览器发来的原始文本
+    :return: 是否可跳过
+    """
+    head = peek_event(raw)
+    if head is None or head[0].startswith('Page.javascriptDialog'):
+        return False
+    owner = session_owner.get(head[1])
+    if owner is None:
+        return True
+    accept = getattr(owner, '_accept_event', None)
+    return accept is not None and not accept(head[0])
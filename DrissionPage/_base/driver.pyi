@@ -6,7 +6,7 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from threading import Thread, Lock
-from typing import Callable, Dict, Optional, Set
+from typing import Callable, Dict, Optional, Set, Iterable, List, Tuple, Union
 
 from requests import Response
 from websocket import WebSocket
@@ -87,6 +87,28 @@ class Driver(object):
         """
         ...
 
+    def _send_many(self, messages: List[dict], timeout: float) -> Dict[int, dict]:
+        """一次性发送多条信息到浏览器，并统一等待所有返回信息
+        :param messages: 发送给浏览器的数据组成的列表
+        :param timeout: 超时时间，为None表示无限
+        :return: 以信息id为key，浏览器返回的数据为value的dict
+        """
+        ...
+
+    def run_many(self,
+                 cmds: Iterable[Union[str, Tuple[str, dict]]],
+                 _timeout: Optional[float] = None,
+                 _session_id: Optional[str] = None,
+                 _debug: Union[bool, str] = False) -> List[dict]:
+        """批量执行cdp方法，所有语句连续发出后只等待一次
+        :param cmds: 由(cdp方法名, 参数dict)或cdp方法名组成的列表
+        :param _timeout: 超时时间
+        :param _session_id: session id
+        :param _debug: 是否打印收发信息
+        :return: 与cmds顺序对应的执行结果列表
+        """
+        ...
+
     def add_session_owner(self, session_id: Optional[str], obj: Messenger) -> None: ...
 
     def remove_session_owner(self, session_id: str) -> None: ...
@@ -113,3 +135,6 @@ class Driver(object):
 
 
 class DebugDriver(Driver): ...
+
+
+def _unsubscribed(session_owner: Dict[Optional[str], Messenger], raw: str) -> bool: ...
@@ -7,13 +7,14 @@
 """
 from pathlib import Path
 from re import match
-from threading import Lock
+from threading import Lock, Condition
 from time import sleep
 
 from requests import Session
 
 from .chromium_context import ChromiumContext
 from .._base.base import Messenger
+from .._base.dispatcher import EventDispatcher
 from .._base.driver import Driver, DebugDriver
 from .._configs.chromium_options import ChromiumOptions
 from .._functions.browser import connect_browser
@@ -82,6 +83,7 @@ class Chromium(Messenger):
                                 'Target.detachedFromTarget': [self._onDetachedFromTarget]}
         self._context = None
         self._tabs = Tabs()
+        self._dispatcher = EventDispatcher(_S.event_workers)
         self._driver.owner = self
 
         if (not self._chromium_options.ws_address and not self._ws_only
@@ -412,6 +414,8 @@ class Chromium(Messenger):
         self._tabs.add(sid, target_id, obj=obj)
         if obj:
             self._driver.add_session_owner(sid, obj)
+            if self._listener:
+                self._listener._tab_attached(sid)
         return sid
 
     def _get_tab_ids(self, context_id, tab_type, title, url):
@@ -461,6 +465,8 @@ class Chromium(Messenger):
             self._tabs.add(sid, tab_id, context_id=cid, opener=kwargs['targetInfo'].get('openerId'))
             self._tabs._tab_first_session[tab_id] = sid
             self._tabs.set_newest_tab(cid, tab_id)
+            if self._listener:
+                self._listener._tab_attached(sid)
 
     def _onTargetDestroyed(self, **kwargs):
         tab_id = kwargs['targetId']
@@ -478,6 +484,7 @@ class Chromium(Messenger):
             Chromium._BROWSERS.pop(self.id, None)
             if self._chromium_options.is_auto_port:
                 ensure_del_dir(self._chromium_options.user_data_path)
+            self._dispatcher.stop()
         self._stop_messenger()
         if self._listener:
             self._listener.listening = False
@@ -600,6 +607,7 @@ class Tabs(object):
         self._context_newest_tab = {}  # {context_id: target_id}
         self._tab_first_session = {}  # {target_id: session:id}
         self._proxies = {}  # {context_id: (url, usr, pwd)}
+        self._frame_added = Condition()
 
     @property
     def session_ids(self):
@@ -636,7 +644,14 @@ class Tabs(object):
             self._objects[session_id] = obj
 
     def add_frame(self, frame_id, target_id):
-        self._frames[frame_id] = target_id
+        with self._frame_added:
+            self._frames[frame_id] = target_id
+            self._frame_added.notify_all()
+
+    def wait_frame(self, frame_id, timeout=None):
+        with self._frame_added:
+            self._frame_added.wait_for(lambda: frame_id in self._frames, timeout)
+            return self._frames.get(frame_id)
 
     def remove_frame(self, frame_id):
         self._frames.pop(frame_id, None)
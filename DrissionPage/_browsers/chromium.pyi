@@ -5,11 +5,12 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from threading import Lock
+from threading import Lock, Condition
 from typing import List, Optional, Set, Dict, Union, Tuple, Literal, Any, Iterable
 
 from .chromium_context import ChromiumContext
 from .._base.base import Messenger
+from .._base.dispatcher import EventDispatcher
 from .._base.driver import Driver
 from .._configs.chromium_options import ChromiumOptions
 from .._configs.session_options import SessionOptions
@@ -47,6 +48,7 @@ class Chromium(Messenger):
     _chromium_options: ChromiumOptions = ...
     _session_options: SessionOptions = ...
     _driver: Driver = ...
+    _dispatcher: EventDispatcher = ...
     _tabs: Tabs = ...
     _process_id: Optional[int] = ...
     _dl_mgr: DownloadManager = ...
@@ -402,6 +404,7 @@ class Tabs(object):
     _context_newest_tab: Dict[str, str] = ...
     _tab_first_session: Dict[str, str] = ...
     _proxies: Dict[str, Tuple[str, str, str, str]] = ...
+    _frame_added: Condition = ...
 
     def __init__(self):
         """保存tab id、session id、frame与tab关系"""
@@ -500,6 +503,14 @@ class Tabs(object):
         """
         ...
 
+    def wait_frame(self, frame_id: str, timeout: Optional[float] = None) -> Optional[str]:
+        """等待某个frame与target的关系被记录
+        :param frame_id: frame id
+        :param timeout: 超时时间（秒），为None时一直等待
+        :return: 该frame所属target的id，超时返回None
+        """
+        ...
+
     def remove_frame(self, frame_id: str) -> None:
         """移除一个frame id与target id的关系
         :param frame_id: frame id
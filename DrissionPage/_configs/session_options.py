@@ -9,7 +9,9 @@ from copy import copy
 from pathlib import Path
 
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 
 from .options_manage import OptionsManager
 from .._functions.cookies import cookies_to_tuple, set_session_cookies
@@ -49,6 +51,11 @@ class SessionOptions(object):
         self._stream = None
         self._trust_env = None
         self._max_redirects = None
+        self._pool_connections = None
+        self._pool_maxsize = None
+        self._pool_block = None
+        self._host_limits = None
+        self._http_retry = None
 
         options = om.session_options
         if options.get('headers') is not None:
@@ -78,6 +85,10 @@ class SessionOptions(object):
         if options.get('max_redirects') is not None:
             self._max_redirects = options['max_redirects']
 
+        for i in ('pool_connections', 'pool_maxsize', 'pool_block', 'host_limits', 'http_retry'):
+            if options.get(i) is not None:
+                self.__setattr__(f'_{i}', options[i])
+
         self.set_proxies(om.proxies.get('http'), om.proxies.get('https'))
         self._timeout = om.timeouts.get('base', 10)
         self._download_path = om.paths.get('download_path', '.') or '.'
@@ -256,6 +267,58 @@ class SessionOptions(object):
         self._sets('max_redirects', times)
         return self
 
+    @property
+    def pool_connections(self):
+        return self._pool_connections
+
+    @property
+    def pool_maxsize(self):
+        return self._pool_maxsize
+
+    @property
+    def pool_block(self):
+        return self._pool_block
+
+    def set_pool(self, connections=None, maxsize=None, block=None):
+        if connections is not None:
+            self._sets('pool_connections', connections)
+        if maxsize is not None:
+            self._sets('pool_maxsize', maxsize)
+        if block is not None:
+            self._sets('pool_block', block)
+        return self
+
+    @property
+    def host_limits(self):
+        if self._host_limits is None:
+            self._host_limits = {}
+        return self._host_limits
+
+    def set_host_limit(self, host, num):
+        limits = dict(self.host_limits)
+        if num is None:
+            limits.pop(host, None)
+        else:
+            limits[host] = num
+        self._sets('host_limits', limits or None)
+        return self
+
+    @property
+    def http_retry(self):
+        return self._http_retry
+
+    def set_http_retry(self, total, backoff_factor=0, status_forcelist=None, allowed_methods=None):
+        if total is None:
+            self._sets('http_retry', None)
+            return self
+        retry = {'total': total, 'backoff_factor': backoff_factor}
+        if status_forcelist:
+            retry['status_forcelist'] = list(status_forcelist)
+        if allowed_methods:
+            retry['allowed_methods'] = [i.upper() for i in allowed_methods]
+        self._sets('http_retry', retry)
+        return self
+
     def _sets(self, arg, val):
         if val is None:
             self.__setattr__(f'_{arg}', None)
@@ -324,6 +387,13 @@ class SessionOptions(object):
 
         if self.cookies:
             set_session_cookies(s, self.cookies)
+        if any(i is not None for i in (self._pool_connections, self._pool_maxsize, self._pool_block,
+                                       self._http_retry)):
+            for prefix in ('http://', 'https://'):
+                s.mount(prefix, self._make_adapter())
+        for host, num in self.host_limits.items():
+            for prefix in ((host,) if '://' in host else (f'http://{host}/', f'https://{host}/')):
+                s.mount(prefix, self._make_adapter(1, num, True))
         if self.adapters:
             for url, adapter in self.adapters:
                 s.mount(url, adapter)
@@ -335,6 +405,22 @@ class SessionOptions(object):
 
         return s, h
 
+    def _make_adapter(self, connections=None, maxsize=None, block=None):
+        """按连接池和重试设置生成适配器，传入的参数优先于设置"""
+        kwargs = {}
+        connections = self._pool_connections if connections is None else connections
+        maxsize = self._pool_maxsize if maxsize is None else maxsize
+        block = self._pool_block if block is None else block
+        if connections is not None:
+            kwargs['pool_connections'] = connections
+        if maxsize is not None:
+            kwargs['pool_maxsize'] = maxsize
+        if block is not None:
+            kwargs['pool_block'] = block
+        if self._http_retry:
+            kwargs['max_retries'] = Retry(**{'raise_on_status': False, **self._http_retry})
+        return HTTPAdapter(**kwargs)
+
     def from_session(self, session, headers=None):
         self._headers = CaseInsensitiveDict(copy(session.headers).update(headers)) if headers else session.headers
         self._cookies = session.cookies
@@ -361,7 +447,8 @@ def session_options_to_dict(options):
 
     re_dict = dict()
     attrs = ['headers', 'cookies', 'proxies', 'params', 'verify', 'stream', 'trust_env', 'cert',
-             'max_redirects', 'timeout', 'download_path']
+             'max_redirects', 'timeout', 'download_path', 'pool_connections', 'pool_maxsize', 'pool_block',
+             'host_limits', 'http_retry']
 
     for attr in attrs:
         val = options.__getattribute__(f'_{attr}')
@@ -7,7 +7,7 @@
 """
 from http.cookiejar import CookieJar, Cookie
 from pathlib import Path
-from typing import Any, Union, Tuple, Optional
+from typing import Any, Union, Tuple, Optional, Dict, Iterable
 
 from requests import Session
 from requests.adapters import HTTPAdapter
@@ -33,6 +33,11 @@ class SessionOptions(object):
     _stream: Optional[bool] = ...
     _trust_env: Optional[bool] = ...
     _max_redirects: Optional[int] = ...
+    _pool_connections: Optional[int] = ...
+    _pool_maxsize: Optional[int] = ...
+    _pool_block: Optional[bool] = ...
+    _host_limits: Optional[Dict[str, int]] = ...
+    _http_retry: Optional[dict] = ...
     _timeout: float = ...
     _del_set: set = ...
     _retry_times: int = ...
@@ -254,6 +259,65 @@ class SessionOptions(object):
         """
         ...
 
+    @property
+    def pool_connections(self) -> Optional[int]:
+        """返回连接池缓存的host数量设置"""
+        ...
+
+    @property
+    def pool_maxsize(self) -> Optional[int]:
+        """返回每个host最多保持的连接数设置"""
+        ...
+
+    @property
+    def pool_block(self) -> Optional[bool]:
+        """返回连接数达到上限时是否等待空闲连接的设置"""
+        ...
+
+    def set_pool(self,
+                 connections: int = None,
+                 maxsize: int = None,
+                 block: bool = None) -> SessionOptions:
+        """设置连接池，多线程访问同一host时，pool_maxsize应不小于线程数，否则多出的连接用完即关闭，为None的参数不修改
+        :param connections: 连接池缓存的host数量
+        :param maxsize: 每个host最多保持的连接数
+        :param block: 连接数达到上限时是否等待空闲连接，为False时新建连接且用完即关闭
+        :return: 返回当前对象
+        """
+        ...
+
+    @property
+    def host_limits(self) -> Dict[str, int]:
+        """返回各host的最大连接数设置"""
+        ...
+
+    def set_host_limit(self, host: str, num: Optional[int]) -> SessionOptions:
+        """设置访问某个host时最多同时使用的连接数，超出的请求等待空闲连接
+        :param host: host，如'example.com'或'example.com:8080'，包含'://'时作为适配器的url前缀使用
+        :param num: 最大连接数，为None时删除该host的设置
+        :return: 返回当前对象
+        """
+        ...
+
+    @property
+    def http_retry(self) -> Optional[dict]:
+        """返回连接层的重试策略设置"""
+        ...
+
+    def set_http_retry(self,
+                       total: Optional[int],
+                       backoff_factor: float = 0,
+                       status_forcelist: Iterable[int] = None,
+                       allowed_methods: Iterable[str] = None) -> SessionOptions:
+        """设置连接层的重试策略，由urllib3在连接出错或返回指定状态码时自动重试，与set_retry()的页面级重试互不影响
+        :param total: 最多重试次数，为None时删除该设置
+        :param backoff_factor: 退避系数，第n次重试前等待backoff_factor * 2 ** (n - 1)秒
+        :param status_forcelist: 需要重试的状态码
+        :param allowed_methods: 允许重试的请求方式，为None时只重试幂等的请求方式
+        :return: 返回当前对象
+        """
+        ...
+
     def _sets(self, arg: str, val: Any) -> None:
         """给属性赋值或标记删除
         :param arg: 属性名称
@@ -281,6 +345,18 @@ class SessionOptions(object):
         """根据内在的配置生成Session对象，headers从对象中分离"""
         ...
 
+    def _make_adapter(self,
+                      connections: int = None,
+                      maxsize: int = None,
+                      block: bool = None) -> HTTPAdapter:
+        """按连接池和重试设置生成适配器，传入的参数优先于设置
+        :param connections: 连接池缓存的host数量
+        :param maxsize: 每个host最多保持的连接数
+        :param block: 连接数达到上限时是否等待空闲连接
+        :return: HTTPAdapter对象
+        """
+        ...
+
     def from_session(self, session: Session, headers: CaseInsensitiveDict = None) -> SessionOptions:
         """从Session对象中读取配置
         :param session: Session对象
@@ -0,0 +1,248 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import sleep
+from json import dumps
+from pathlib import Path
+from time import perf_counter
+
+from .chromium_element import _parse_js_steps, convert_argument, make_js_for_find_ele_by_xpath
+from .none_element import NoneElement
+from .session_element import make_session_ele
+from .._functions.locator import get_loc, quotes_escape
+from .._functions.settings import Settings as _S
+from .._functions.web import is_js_func, get_ele_txt, make_absolute_link, format_html
+from ..errors import (AlertExistsError, ContextLostError, ElementLostError, JavaScriptError, LocatorError,
+                      NoRectError)
+
+
+class AsyncChromiumElement(object):
+    def __init__(self, owner, obj_id):
+        self.owner = owner
+        self._obj_id = obj_id
+        self._type = 'AsyncChromiumElement'
+
+    def __repr__(self):
+        return f'<AsyncChromiumElement obj_id={self._obj_id}>'
+
+    @property
+    def timeout(self):
+        return self.owner.timeout
+
+    async def ele(self, locator, index=1, timeout=None):
+        return await find_eles(self, locator, index=index, timeout=timeout, method='ele()')
+
+    async def eles(self, locator, timeout=None):
+        return await find_eles(self, locator, index=None, timeout=timeout)
+
+    async def run_js(self, script, *args, as_expr=False, timeout=None):
+        return await run_js(self, script, as_expr, self.owner.timeouts.script if timeout is None else timeout, args)
+
+    async def tag(self):
+        return await self.run_js('return this.localName;')
+
+    async def html(self):
+        return await self.run_js('return this.outerHTML;')
+
+    async def text(self):
+        return get_ele_txt(make_session_ele(await self.html()))
+
+    async def attr(self, name):
+        r = await self.run_js('return [this.getAttribute(arguments[0]), this.baseURI];', name)
+        if r[0] is None:
+            return None
+        if name in ('href', 'src') and not r[0].lower().startswith('javascript:'):
+            return make_absolute_link(r[0], r[1])
+        return format_html(r[0])
+
+    async def click(self, by_js=False):
+        if not by_js:
+            await self.run_js('this.scrollIntoViewIfNeeded ? this.scrollIntoViewIfNeeded() '
+                              ': this.scrollIntoView({block: "center"});')
+            quads = (await self.owner._run_cdp('DOM.getContentQuads', objectId=self._obj_id,
+                                               _ignore=True)).get('quads')
+            if quads:
+                q = quads[0]
+                x = int(sum(q[::2]) / 4)
+                y = int(sum(q[1::2]) / 4)
+                await self.owner._run_cdp('Input.dispatchMouseEvent', type='mousePressed', x=x, y=y,
+                                          button='left', clickCount=1, _ignore=AlertExistsError)
+                await self.owner._run_cdp('Input.dispatchMouseEvent', type='mouseReleased', x=x, y=y,
+                                          button='left', _ignore=AlertExistsError)
+                return self
+            elif by_js is False:
+                raise NoRectError
+
+        await self.run_js('this.click();')
+        return self
+
+
+async def run_js(page_or_ele, script, as_expr, timeout, args=None):
+    if isinstance(page_or_ele, AsyncChromiumElement):
+        is_page = False
+        page = page_or_ele.owner
+    else:
+        is_page = True
+        page = page_or_ele
+
+    if page.has_alert:
+        raise AlertExistsError
+
+    try:
+        if Path(script).exists():
+            with open(script, 'r', encoding='utf-8') as f:
+                script = f.read()
+    except (OSError, ValueError):
+        pass
+
+    end_time = perf_counter() + timeout
+    for i in range(2):  # 页面刷新后缓存的document对象失效，重新获取一次
+        try:
+            if as_expr:
+                res = await page._run_cdp('Runtime.evaluate', expression=script, returnByValue=False,
+                                          awaitPromise=True, userGesture=True, _timeout=timeout,
+                                          _ignore=AlertExistsError)
+            else:
+                args = args or ()
+                if not is_js_func(script):
+                    script = f'function(){{{script}}}'
+                obj_id = await page._get_doc_id() if is_page else page_or_ele._obj_id
+                res = await page._run_cdp('Runtime.callFunctionOn', functionDeclaration=script, objectId=obj_id,
+                                          arguments=[_convert_argument(arg) for arg in args], returnByValue=False,
+                                          awaitPromise=True, userGesture=True, _timeout=timeout,
+                                          _ignore=AlertExistsError)
+            break
+        except TimeoutError:
+            raise TimeoutError(_S._lang.joinn(_S._lang.TIMEOUT_, _S._lang.RUN_JS, timeout))
+        except (ContextLostError, ElementLostError):
+            if not is_page:
+                raise ElementLostError()
+            if i or page._doc_id is None:
+                raise ContextLostError()
+            page._doc_id = None
+
+    if 'error' in res:  # _timeout=0或js激活alert时
+        return None
+
+    exceptionDetails = res.get('exceptionDetails')
+    if exceptionDetails:
+        raise JavaScriptError(INFO=res['result'].get('description').replace('\n', ' '),
+                              JS=script, DETAIL=exceptionDetails)
+
+    try:
+        return await parse_js_result(page, res.get('result'), end_time)
+    except Exception:
+        raise RuntimeError(_S._lang.joinn(_S._lang.JS_RESULT_ERR, INFO=res, JS=script, TIP=_S._lang.FEEDBACK))
+
+
+async def parse_js_result(page, result, end_time):
+    steps = _parse_js_steps(result, end_time)
+    r = None
+    while True:
+        try:
+            step = steps.send(r)
+        except StopIteration as e:
+            return e.value
+        if step[0] in ('ele', 'shadow'):
+            r = AsyncChromiumElement(page, step[1])
+        else:
+            r = await page._run_cdp(step[0], **step[1])
+
+
+async def find_eles(ele_or_page, locator, index=1, timeout=None, method=None):
+    if isinstance(locator, (str, tuple)):
+        mode, loc = get_loc(locator)
+    else:
+        raise LocatorError(ALLOW_TYPE=_S._lang.LOC_FORMAT, CURR_VAL=locator)
+
+    is_ele = isinstance(ele_or_page, AsyncChromiumElement)
+    if mode == 'xpath' and is_ele and loc.lstrip().startswith('/'):
+        loc = f'.{loc}'
+    elif mode == 'css selector' and loc.lstrip().startswith('>'):
+        loc = f':scope{loc}'
+
+    type_txt = '9' if index == 1 else '7'
+    if mode == 'xpath':
+        jss = [(make_js_for_find_ele_by_xpath(loc, type_txt, 'this'), loc)]
+    elif mode == 'css selector':
+        jss = [(_make_js_for_find_ele_by_css(loc, index), None)]
+    elif mode == 'any':
+        xpath = f'.//*/text()[contains(., {quotes_escape(loc)})]/..'
+        jss = [(make_js_for_find_ele_by_xpath(xpath, type_txt, 'this'), xpath),
+               (_make_js_for_find_ele_by_css(loc, index), None),
+               (make_js_for_find_ele_by_xpath(loc, type_txt, 'this'), loc)]
+    else:
+        raise LocatorError(ALLOW_TYPE='xpath, css selector, text', CURR_VAL=locator)
+
+    if timeout is None:
+        timeout = ele_or_page.timeout
+    end_time = perf_counter() + timeout
+    while True:
+        for js, xpath in jss:
+            r = await _do_find(ele_or_page, js, xpath, index, mode == 'any')
+            if r is not None:
+                return r
+        if perf_counter() >= end_time:
+            break
+        await sleep(.05)
+
+    if index is None:
+        return []
+    return NoneElement(method=method, args={'locator': locator, 'index': index, 'timeout': timeout})
+
+
+async def _do_find(ele_or_page, js, xpath, index, ignore_err):
+    """执行一次查找
+    :param ele_or_page: 在其中查找的元素或页面
+    :param js: 查找用的js方法
+    :param xpath: xpath查找时传入xpath文本，css查找时为None
+    :param index: 获取第几个，None表示获取全部
+    :param ignore_err: 是否忽略定位符错误
+    :return: 找到的结果，未找到返回None
+    """
+    try:
+        r = await run_js(ele_or_page, js, False, ele_or_page.timeout)
+    except JavaScriptError as e:
+        info = str(e)
+        if xpath and 'The result is not a node set' in info:
+            return await run_js(ele_or_page, make_js_for_find_ele_by_xpath(xpath, '1', 'this'), False,
+                                ele_or_page.timeout)
+        elif ignore_err or not xpath:
+            return None
+        elif 'is not a valid XPath expression' in info:
+            raise LocatorError(_S._lang.INVALID_XPATH_, xpath)
+        raise LocatorError(_S._lang.FIND_ELE_ERR, INFO=info)
+
+    if index == 1 or not isinstance(r, list):
+        return r
+    elif index is None:
+        return r or None
+    try:
+        return r[index - 1] if index > 0 else r[index]
+    except IndexError:
+        return None
+
+
+def _make_js_for_find_ele_by_css(css, index):
+    """生成用css selector查找元素的js方法
+    :param css: css selector
+    :param index: 获取第几个，None表示获取全部
+    :return: js文本
+    """
+    if index == 1:
+        return f'function(){{return this.querySelector({dumps(css)});}}'
+    return f'function(){{return Array.from(this.querySelectorAll({dumps(css)}));}}'
+
+
+def _convert_argument(arg):
+    """把参数转换为js可用格式，异步元素以其object id传入
+    :param arg: 参数
+    :return: 转换后的参数
+    """
+    if isinstance(arg, AsyncChromiumElement):
+        return {'objectId': arg._obj_id}
+    return convert_argument(arg)
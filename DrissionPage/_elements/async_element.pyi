@@ -0,0 +1,139 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from typing import Union, Tuple, List, Any, Optional
+
+from .none_element import NoneElement
+from .._pages.async_tab import AsyncChromiumTab
+
+
+class AsyncChromiumElement(object):
+    """AsyncChromiumTab中的元素对象，只保存object id，所有与浏览器交互的方法均为协程"""
+    owner: AsyncChromiumTab = ...
+    _obj_id: str = ...
+    _type: str = ...
+
+    def __init__(self, owner: AsyncChromiumTab, obj_id: str):
+        """
+        :param owner: 元素所在页面对象
+        :param obj_id: 元素的object id
+        """
+        ...
+
+    @property
+    def timeout(self) -> float:
+        """返回查找元素时默认超时时间"""
+        ...
+
+    async def ele(self,
+                  locator: Union[Tuple[str, str], str],
+                  index: int = 1,
+                  timeout: float = None) -> Union[AsyncChromiumElement, str, float, NoneElement]:
+        """返回当前元素下级符合条件的一个元素，定位符解析与ChromiumElement相同，不支持ax定位
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个
+        :param timeout: 查找元素超时时间（秒），默认与元素所在页面等待时间一致
+        :return: 元素对象或属性、文本节点文本
+        """
+        ...
+
+    async def eles(self,
+                   locator: Union[Tuple[str, str], str],
+                   timeout: float = None) -> List[Union[AsyncChromiumElement, str]]:
+        """返回当前元素下级所有符合条件的子元素
+        :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+        :param timeout: 查找元素超时时间（秒），默认与元素所在页面等待时间一致
+        :return: 元素对象或属性、文本组成的列表
+        """
+        ...
+
+    async def run_js(self, script: str, *args, as_expr: bool = False, timeout: float = None) -> Any:
+        """对本元素执行javascript代码，结果解析方式与ChromiumElement.run_js()相同
+        :param script: js文本，文本中用this表示本元素
+        :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+        :param as_expr: 是否作为表达式运行，为True时args无效
+        :param timeout: js超时时间（秒），为None则使用页面timeouts.script设置
+        :return: 运行的结果
+        """
+        ...
+
+    async def tag(self) -> str:
+        """返回元素tag"""
+        ...
+
+    async def html(self) -> str:
+        """返回元素outerHTML文本"""
+        ...
+
+    async def text(self) -> str:
+        """返回元素内所有文本，文本已格式化"""
+        ...
+
+    async def attr(self, name: str) -> Optional[str]:
+        """返回一个attribute属性值
+        :param name: 属性名
+        :return: 属性值文本，没有该属性返回None
+        """
+        ...
+
+    async def click(self, by_js: Optional[bool] = False) -> AsyncChromiumElement:
+        """点击元素，先滚动到可见再在元素中点模拟点击
+        :param by_js: 是否用js点击，为None时元素无位置则改用js点击，为False时元素无位置则抛出异常
+        :return: 元素对象
+        """
+        ...
+
+
+async def run_js(page_or_ele: Union[AsyncChromiumTab, AsyncChromiumElement],
+                 script: str,
+                 as_expr: bool,
+                 timeout: float,
+                 args: tuple = None) -> Any:
+    """运行javascript代码
+    :param page_or_ele: 页面对象或元素对象
+    :param script: js文本
+    :param as_expr: 是否作为表达式运行，为True时args无效
+    :param timeout: 超时时间（秒）
+    :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+    :return: js执行结果
+    """
+    ...
+
+
+async def parse_js_result(page: AsyncChromiumTab, result: dict, end_time: float) -> Any:
+    """解析js返回的结果，与同步版本共用解析步骤"""
+    ...
+
+
+async def find_eles(ele_or_page: Union[AsyncChromiumTab, AsyncChromiumElement],
+                    locator: Union[Tuple[str, str], str],
+                    index: Optional[int] = 1,
+                    timeout: float = None,
+                    method: str = None) -> Union[AsyncChromiumElement, str, float, NoneElement,
+List[Union[AsyncChromiumElement, str]]]:
+    """在页面或元素中查找元素，超时前每0.05秒重试一次
+    :param ele_or_page: 在其中查找的页面或元素
+    :param locator: 元素的定位信息，可以是loc元组，或查询字符串
+    :param index: 获取第几个，从1开始，可传入负数获取倒数第几个，None表示获取全部
+    :param timeout: 超时时间（秒）
+    :param method: 调用的方法名，用于生成NoneElement
+    :return: 单个元素或元素列表
+    """
+    ...
+
+
+async def _do_find(ele_or_page: Union[AsyncChromiumTab, AsyncChromiumElement],
+                   js: str,
+                   xpath: Optional[str],
+                   index: Optional[int],
+                   ignore_err: bool) -> Any: ...
+
+
+def _make_js_for_find_ele_by_css(css: str, index: Optional[int]) -> str: ...
+
+
+def _convert_argument(arg: Any) -> dict: ...
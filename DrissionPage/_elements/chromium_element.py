@@ -15,7 +15,7 @@ from time import perf_counter, sleep
 from DrissionRecord.tools import get_usable_path, make_valid_name
 
 from .none_element import NoneElement
-from .session_element import make_session_ele
+from .session_element import make_session_ele, find_in_snapshot
 from .._base.base import DrissionElement, BaseElement
 from .._functions.elements import ChromiumElementsList, SessionElementsList
 from .._functions.keys import input_text_or_keys, Keys
@@ -52,11 +52,14 @@ class ChromiumElement(DrissionElement):
         self._wait = None
         self._type = 'ChromiumElement'
         self._doc_id = None
+        self._nid = node_id
+        self._oid = obj_id
+        self._bid = backend_id
 
-        if node_id and obj_id and backend_id:
-            self._node_id = node_id
-            self._obj_id = obj_id
-            self._backend_id = backend_id
+        if not (node_id or obj_id or backend_id):
+            raise ElementLostError
+        elif (node_id and obj_id and backend_id) or _S.lazy_ele_ids:
+            pass
         elif node_id:
             self._node_id = node_id
             self._obj_id = self._get_obj_id(node_id)
@@ -69,8 +72,6 @@ class ChromiumElement(DrissionElement):
             self._obj_id = self._get_obj_id(backend_id=backend_id)
             self._node_id = self._get_node_id(obj_id=self._obj_id)
             self._backend_id = backend_id
-        else:
-            raise ElementLostError
 
     def __call__(self, locator, index=1, timeout=None):
         return self.ele(locator, index=index, timeout=timeout)
@@ -89,6 +90,41 @@ class ChromiumElement(DrissionElement):
                                             backendNodeId=self._backend_id)['node']['localName'].lower()
         return self._tag
 
+    @property
+    def _node_id(self):
+        if not self._nid:
+            self._nid = self._get_node_id(obj_id=self._obj_id)
+        return self._nid
+
+    @_node_id.setter
+    def _node_id(self, node_id):
+        self._nid = node_id
+
+    @property
+    def _obj_id(self):
+        if not self._oid:
+            self._oid = (self._get_obj_id(backend_id=self._bid) if self._bid
+                         else self._get_obj_id(node_id=self._nid))
+        return self._oid
+
+    @_obj_id.setter
+    def _obj_id(self, obj_id):
+        self._oid = obj_id
+
+    @property
+    def _backend_id(self):
+        if not self._bid:
+            n = self.owner._run_cdp('DOM.describeNode', **({'nodeId': self._nid} if self._nid
+                                                           else {'objectId': self._oid}))['node']
+            if self._tag is None:
+                self._tag = n['localName'].lower()
+            self._bid = n['backendNodeId']
+        return self._bid
+
+    @_backend_id.setter
+    def _backend_id(self, backend_id):
+        self._bid = backend_id
+
     @property
     def html(self):
         return self.owner._run_cdp('DOM.getOuterHTML', backendNodeId=self._backend_id)['outerHTML']
@@ -412,11 +448,17 @@ class ChromiumElement(DrissionElement):
         return self._ele(locator, timeout=timeout, index=None)
 
     def s_ele(self, locator=None, index=1, timeout=None):
+        r = find_in_snapshot(self, locator, index=index, method='s_ele()') if locator is not None else None
+        if r is not None:
+            return r
         return (make_session_ele(self, locator, index=index, method='s_ele()')
                 if locator is None or self.ele(locator, index=index, timeout=timeout)
                 else NoneElement(self.owner, method='s_ele()', args={'locator': locator, 'index': index}))
 
     def s_eles(self, locator=None, timeout=None):
+        r = find_in_snapshot(self, locator, index=None) if locator is not None else None
+        if r is not None:
+            return r
         return (make_session_ele(self, locator, index=None)
                 if self.ele(locator, timeout=timeout) else SessionElementsList())
 
@@ -975,13 +1017,23 @@ def do_find_xpath(ele, js, xpath, node_txt, ind):
         res = ele.owner._run_cdp('Runtime.getProperties', objectId=res['result']['objectId'],
                                  ownProperties=True, _ignore=True)['result'][:-1]
         if ind is None:
+            obj_ids = [i['value']['objectId'] for i in res if i['value']['type'] == 'object']
+            if not obj_ids:
+                eles = []
+            elif _S.lazy_ele_ids:
+                frames = {i['value']['objectId'] for i in res
+                          if i['value'].get('className') in ('HTMLIFrameElement', 'HTMLFrameElement',
+                                                             'HTMLObjectElement')}
+                eles = _make_lazy_eles(ele.owner, obj_ids, 'obj_id', frames)
+            else:
+                eles = make_chromium_eles(ele.owner, _ids=obj_ids, index=None, id_type='obj_id')
+            if eles is False:
+                return None
+            eles = iter(eles)
             r = ChromiumElementsList(owner=ele.owner)
             for i in res:
-                if i['value']['type'] == 'object':
-                    r.append(make_chromium_eles(ele.owner, _ids=i['value']['objectId'], id_type='obj_id'))
-                else:
-                    r.append(i['value']['value'])
-            return None if False in r else r
+                r.append(next(eles) if i['value']['type'] == 'object' else i['value']['value'])
+            return r
 
         else:
             eles_count = len(res)
@@ -1001,6 +1053,11 @@ def do_find_css(page, cdp, css, arg, nid, ind):
     r = page._run_cdp(cdp, nodeId=nid, selector=css, _ignore=True).get(arg)
     if not r or (ind and ind > 1 and len(r) < abs(ind)):
         return None
+    if ind is None and _S.lazy_ele_ids:
+        frames = page._run_cdp('DOM.querySelectorAll', nodeId=nid, selector='iframe,frame,object',
+                               _ignore=True).get('nodeIds', ())
+        r = _make_lazy_eles(page, r, 'node_id', set(frames))
+        return None if r is False else r
     r = make_chromium_eles(page, _ids=r, index=ind, id_type='node_id')
     return None if r is False else r
 
@@ -1086,6 +1143,8 @@ def make_chromium_eles(page, _ids, index=1, id_type='obj_id', ele_only=False):
             return get_node_func(page, _id, ele_only)
 
     else:  # 获取全部
+        if len(_ids) > 1:
+            return _get_nodes_in_batch(page, _ids, id_type, ele_only)
         nodes = ChromiumElementsList(owner=page)
         for _id in _ids:
             # if _id == 0:
@@ -1098,6 +1157,45 @@ def make_chromium_eles(page, _ids, index=1, id_type='obj_id', ele_only=False):
         return nodes
 
 
+def _get_nodes_in_batch(page, _ids, id_type, ele_only):
+    """批量返回元素对象或文本组成的列表，describeNode和resolveNode一次性发出，出错返回False"""
+    # CDP没有批量获取各节点id的方法，只能合并往返，命令数仍与元素数成正比；开启lazy_ele_ids时不发命令
+    if not all(_ids):
+        return False
+    arg = {'obj_id': 'objectId', 'node_id': 'nodeId', 'backend_id': 'backendNodeId'}[id_type]
+    cmds = [('DOM.describeNode', {arg: _id}) for _id in _ids]
+    if id_type != 'obj_id':
+        cmds.extend(('DOM.resolveNode', {arg: _id}) for _id in _ids)
+    rs = page._run_cdp_many(cmds, _ignore=True)
+
+    count = len(_ids)
+    infos = rs[count:] if id_type != 'obj_id' else [{'object': {'objectId': _id}} for _id in _ids]
+    nodes = ChromiumElementsList(owner=page)
+    for node, info in zip(rs[:count], infos):
+        if 'error' in node:
+            return False
+        if node['node']['nodeName'] in ('#text', '#comment'):
+            if not ele_only:
+                nodes.append(node['node']['nodeValue'])
+        elif 'error' in info:
+            return False
+        else:
+            nodes.append(_make_ele(page, info['object']['objectId'], node))
+    return nodes
+
+
+def _make_lazy_eles(page, _ids, id_type, frame_ids=()):
+    """返回不即时获取其它id的元素对象列表，框架元素仍立即生成，出错返回False"""
+    frame_ids = [i for i in _ids if i in frame_ids]
+    frames = make_chromium_eles(page, frame_ids, index=None, id_type=id_type) if frame_ids else []
+    if frames is False:
+        return False
+    frames = dict(zip(frame_ids, frames))
+    arg = 'obj_id' if id_type == 'obj_id' else 'node_id'
+    return ChromiumElementsList(page, [frames[i] if i in frames else ChromiumElement(page, **{arg: i})
+                                       for i in _ids])
+
+
 def _get_node_info(page, id_type, _id):
     if not _id:
         return False
@@ -1143,6 +1241,7 @@ def _get_node_by_node_id(page, node_id, ele_only):
 def _make_ele(page, obj_id, node):
     ele = ChromiumElement(page, obj_id=obj_id, node_id=node['node']['nodeId'],
                           backend_id=node['node']['backendNodeId'])
+    ele._tag = node['node']['localName'].lower()
     if ele.tag in __FRAME_ELEMENT__:
         from .._pages.chromium_frame import ChromiumFrame
         ele = ChromiumFrame(page, ele, node)
@@ -1245,6 +1344,27 @@ def run_js(page_or_ele, script, as_expr, timeout, args=None):
 
 
 def parse_js_result(page, ele, result, end_time):
+    steps = _parse_js_steps(result, end_time)
+    r = None
+    while True:
+        try:
+            step = steps.send(r)
+        except StopIteration as e:
+            return e.value
+        if step[0] == 'ele':
+            r = make_chromium_eles(page, _ids=step[1])
+        elif step[0] == 'shadow':
+            r = ShadowRoot(ele, obj_id=step[1])
+        else:
+            r = page._run_cdp(step[0], **step[1])
+
+
+def _parse_js_steps(result, end_time):
+    """解析js返回值的生成器，不直接发送请求，而是yield出需执行的步骤，由同步或异步调用方执行后send回结果
+    :param result: js返回的RemoteObject
+    :param end_time: 结束时间点
+    :return: 解析结果
+    """
     if 'unserializableValue' in result:
         return result['unserializableValue']
 
@@ -1257,34 +1377,36 @@ def parse_js_result(page, ele, result, end_time):
         elif sub_type == 'node':
             class_name = result['className']
             if class_name == 'ShadowRoot':
-                return ShadowRoot(ele, obj_id=result['objectId'])
+                return (yield 'shadow', result['objectId'])
             elif class_name == 'HTMLDocument':
                 return result
             else:
-                r = make_chromium_eles(page, _ids=result['objectId'])
+                r = yield 'ele', result['objectId']
                 if r is False:
                     raise ElementLostError
                 return r
 
         elif sub_type == 'array':
-            r = page._run_cdp('Runtime.getProperties', objectId=result['objectId'], ownProperties=True)['result']
-            return [parse_js_result(page, ele, result=i['value'], end_time=end_time) for i in r if i['name'].isdigit()]
+            r = (yield 'Runtime.getProperties', {'objectId': result['objectId'], 'ownProperties': True})['result']
+            res = []
+            for i in r:
+                if i['name'].isdigit():
+                    res.append((yield from _parse_js_steps(i['value'], end_time)))
+            return res
 
         elif result.get('className') == 'Blob':
-            data = page._run_cdp('IO.read',
-                                 handle=f"blob:{page._run_cdp('IO.resolveBlob', objectId=result['objectId'])['uuid']}")[
-                'data']
-            return data
+            uuid = (yield 'IO.resolveBlob', {'objectId': result['objectId']})['uuid']
+            return (yield 'IO.read', {'handle': f'blob:{uuid}'})['data']
 
         elif 'objectId' in result:
             timeout = end_time - perf_counter()
             if timeout < 0:
                 return None
             js = 'function(){return JSON.stringify(this);}'
-            r = page._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=result['objectId'],
-                              returnByValue=False, awaitPromise=True, userGesture=True, _ignore=AlertExistsError,
-                              _timeout=timeout)
-            return loads(parse_js_result(page, ele, r.get('result'), end_time))
+            r = yield 'Runtime.callFunctionOn', {'functionDeclaration': js, 'objectId': result['objectId'],
+                                                 'returnByValue': False, 'awaitPromise': True, 'userGesture': True,
+                                                 '_ignore': AlertExistsError, '_timeout': timeout}
+            return loads((yield from _parse_js_steps(r.get('result'), end_time)))
 
         else:
             return result.get('value', result)
@@ -30,9 +30,9 @@ class ChromiumElement(DrissionElement):
     _tag: Optional[str] = ...
     owner: Union[ChromiumTab, ChromiumFrame] = ...
     tab: ChromiumTab = ...
-    _node_id: int = ...
-    _obj_id: str = ...
-    _backend_id: int = ...
+    _nid: Optional[int] = ...
+    _oid: Optional[str] = ...
+    _bid: Optional[int] = ...
     _doc_id: Optional[str] = ...
     _scroll: Optional[ElementScroller] = ...
     _clicker: Optional[Clicker] = ...
@@ -48,7 +48,7 @@ class ChromiumElement(DrissionElement):
                  node_id: int = None,
                  obj_id: str = None,
                  backend_id: int = None):
-        """node_id、obj_id和backend_id必须至少传入一个
+        """node_id、obj_id和backend_id必须至少传入一个，开启Settings.lazy_ele_ids时未传入的id在首次使用时才获取
         :param owner: 元素所在页面对象
         :param node_id: cdp中的node id
         :param obj_id: js中的object id
@@ -76,6 +76,21 @@ class ChromiumElement(DrissionElement):
         """返回元素tag"""
         ...
 
+    @property
+    def _node_id(self) -> int:
+        """返回元素cdp中的node id，未获取时先获取"""
+        ...
+
+    @property
+    def _obj_id(self) -> str:
+        """返回元素js中的object id，未获取时先获取"""
+        ...
+
+    @property
+    def _backend_id(self) -> int:
+        """返回元素backend id，未获取时先获取"""
+        ...
+
     @property
     def html(self) -> str:
         """返回元素outerHTML文本"""
@@ -1103,6 +1118,7 @@ def make_chromium_eles(page: Union[ChromiumBase, ChromiumTab, ChromiumFrame],
     :param id_type: 可选：'obj_id'、'backend_id'、'node_id'
     :param ele_only: 是否只返回ele，在页面查找元素时生效
     :return: 浏览器元素对象或它们组成的列表，生成失败返回False
+    获取多个时所有节点的describeNode和resolveNode合并为一次往返发出，命令数仍与元素数成正比
     """
     ...
 
@@ -8,8 +8,8 @@
 from html import unescape
 from re import match, sub, DOTALL, search
 
-from lxml.etree import tostring
-from lxml.html import HtmlElement, fromstring
+from lxml.etree import tostring, XPath, XPathSyntaxError, XMLPullParser, HTMLPullParser
+from lxml.html import HtmlElement, HtmlElementClassLookup, fromstring
 
 from .none_element import NoneElement
 from .._base.base import DrissionElement, BasePage, BaseElement
@@ -190,7 +190,7 @@ def make_session_ele(html_or_ele, loc=None, index=1, method=None):
         elif mode == 'css selector' and loc.lstrip().startswith('>'):
             loc = f'{html_or_ele.css_selector}{loc}'
             if html_or_ele.owner:
-                html_or_ele = fromstring(html_or_ele.owner.html)
+                html_or_ele = _page_tree(html_or_ele.owner)
             else:  # 接收html文本，无page的情况
                 html_or_ele = fromstring(html_or_ele('xpath:/ancestor::*').html)
 
@@ -203,20 +203,14 @@ def make_session_ele(html_or_ele, loc=None, index=1, method=None):
         elif mode == 'css selector' and loc.lstrip().startswith('>'):
             loc = f'{html_or_ele.css_selector}{loc}'
 
-        # 获取整个页面html再定位到当前元素，以实现查找上级元素
         page = html_or_ele.owner
-        xpath = html_or_ele.xpath
-        # ChromiumElement，兼容传入的元素在iframe内的情况
-        if html_or_ele._doc_id is None:
-            doc = html_or_ele._run_js('return this.ownerDocument;')
-            html_or_ele._doc_id = doc['objectId'] if doc else False
-
-        if html_or_ele._doc_id:
-            html = html_or_ele.owner._run_cdp('DOM.getOuterHTML', objectId=html_or_ele._doc_id)['outerHTML']
+        node = _snapshot_node(html_or_ele, check=True)
+        if node is not None:  # 页面快照有效时直接使用快照中的节点
+            html_or_ele = node
+
+        # 获取整个页面html再定位到当前元素，以实现查找上级元素
         else:
-            html = html_or_ele.owner.html
-        html_or_ele = fromstring(html)
-        html_or_ele = html_or_ele.xpath(xpath)[0]
+            html_or_ele = _chromium_ele_node(html_or_ele)
 
     elif the_type == 'ChromiumFrame':
         page = html_or_ele
@@ -225,10 +219,7 @@ def make_session_ele(html_or_ele, loc=None, index=1, method=None):
     # 各种页面对象
     elif isinstance(html_or_ele, BasePage):
         page = html_or_ele
-        html = html_or_ele.html
-        if html.startswith('<?xml '):
-            html = sub(r'^<\?xml.*?>', '', html)
-        html_or_ele = fromstring(html)
+        html_or_ele = _page_tree(page)
 
     # ShadowRoot
     elif isinstance(html_or_ele, BaseElement):
@@ -297,3 +288,168 @@ def make_session_ele(html_or_ele, loc=None, index=1, method=None):
         elif 'Expected selector' in str(e):
             raise LocatorError(_S._lang.INVALID_CSS_, raw_loc)
         raise e
+
+
+def make_html_tree(html):
+    if html.startswith('<?xml '):
+        html = sub(r'^<\?xml.*?>', '', html)
+    return fromstring(html)
+
+
+def _chromium_ele_node(ele):
+    """获取元素所在文档的html并解析，返回元素对应的lxml节点"""
+    xpath = ele.xpath
+    # ChromiumElement，兼容传入的元素在iframe内的情况
+    if ele._doc_id is None:
+        doc = ele._run_js('return this.ownerDocument;')
+        ele._doc_id = doc['objectId'] if doc else False
+
+    if ele._doc_id:
+        html = ele.owner._run_cdp('DOM.getOuterHTML', objectId=ele._doc_id)['outerHTML']
+    else:
+        html = ele.owner.html
+    return fromstring(html).xpath(xpath)[0]
+
+
+def _snapshot_node(ele, check=False):
+    """元素所在页面有有效快照时，返回元素在快照中对应的lxml节点，否则返回None"""
+    snapshot = getattr(ele.owner, '_snapshot', None)
+    node = None if snapshot is None else snapshot.node(ele._backend_id)
+    return None if node is None or (check and not snapshot.check()) else node
+
+
+def find_in_snapshot(ele_or_page, loc, index=1, method=None):
+    if isinstance(ele_or_page, BasePage):
+        snapshot = getattr(ele_or_page, '_snapshot', None)
+        if snapshot is None or snapshot.root is None:
+            return None
+    elif _snapshot_node(ele_or_page) is None:
+        return None
+    r = make_session_ele(ele_or_page, loc, index=index, method=method)
+    return None if isinstance(r, NoneElement) or (index is None and not r) else r
+
+
+def _page_tree(page):
+    """获取页面的lxml树，s模式的页面使用按响应缓存的解析结果"""
+    if not getattr(page, '_d_mode', False) and hasattr(page, '_s_tree'):
+        return page._s_tree()
+    snapshot = getattr(page, '_snapshot', None)
+    root = None if snapshot is None else snapshot.root
+    return make_html_tree(page.html) if root is None or not snapshot.check() else root
+
+
+def iter_stream_eles(chunks, locator, page=None, xml=False, encoding=None):
+    finder, tag = _stream_finder(locator, xml)
+    if xml:
+        parser = XMLPullParser(events=('start', 'end'), huge_tree=True, resolve_entities=False)
+    else:
+        parser = HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    parser.set_element_class_lookup(HtmlElementClassLookup())
+
+    root = None
+    opened = 0  # 未结束的同名元素数，其条件可能引用内部的元素，这些元素要保留到它结束
+    for _ in _feed(parser, chunks):
+        for event, e in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = e
+                if isinstance(e.tag, str) and e.tag.startswith('{'):  # 去掉命名空间，使定位符无需前缀
+                    e.tag = e.tag.split('}', 1)[1]
+                if e.tag == tag:
+                    opened += 1
+                continue
+
+            if tag is not None and e.tag != tag:
+                if not opened:
+                    _free_node(e)
+                continue
+
+            opened -= tag is not None
+            eles = finder(root)  # 已结束的元素随时释放，树中只剩当前路径，在根上查找代价很小
+            if isinstance(eles, list) and any(i is e for i in eles):
+                yield SessionElement(e, page)
+                _free_node(e)
+            elif not opened if tag is not None else e.getparent() is root:  # 不能确定标签时只释放顶层元素
+                _free_node(e)
+
+
+def _feed(parser, chunks):
+    """把数据块逐个送入解析器，每送入一块产出一次，最后关闭解析器"""
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            yield
+    parser.close()
+    yield
+
+
+def _free_node(node):
+    """清空已处理完的元素，并删除它和各级祖先之前的兄弟节点，释放内存"""
+    node.clear(keep_tail=True)
+    parent = node.getparent()
+    while parent is not None:
+        while node.getprevious() is not None:
+            del parent[0]
+        node = parent
+        parent = node.getparent()
+
+
+def _stream_finder(locator, xml):
+    """把定位符转换为编译好的xpath，并尽量得出匹配元素的标签名，用于跳过无关元素"""
+    mode, path = get_loc(locator)
+    if mode in ('css selector', 'any'):
+        from lxml.cssselect import CSSSelector, ExpressionError
+        text_path = f'//*/text()[contains(., {quotes_escape(path)})]/..'
+        try:
+            path = CSSSelector(path, translator='xml' if xml else 'html').path
+        except (ExpressionError, SyntaxError):
+            if mode == 'css selector':
+                raise LocatorError(_S._lang.INVALID_CSS_, locator)
+            path = text_path
+        else:
+            if mode == 'any':  # 流式解析时无法先查文本再回退，两者都匹配
+                path = f'{text_path} | {path}'
+    elif mode != 'xpath':
+        raise ValueError(_S._lang.joinn(_S._lang.UNSUPPORTED_AX))
+
+    try:
+        finder = XPath(path)
+    except XPathSyntaxError:
+        raise LocatorError(_S._lang.INVALID_XPATH_, locator)
+    tag = _last_tag(path)
+    return finder, tag if xml or tag is None else tag.lower()
+
+
+def _last_tag(xpath):
+    """获取xpath最后一步的标签名，无法确定时返回None"""
+    depth = 0
+    quote = None
+    start = 0
+    for i, c in enumerate(xpath):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '\'"':
+            quote = c
+        elif c in '[(':
+            depth += 1
+        elif c in '])':
+            depth -= 1
+        elif depth == 0:
+            if c == '|':
+                return None
+            elif c == '/':
+                start = i + 1
+
+    step = xpath[start:].strip()
+    if '::' in step:
+        axis, step = step.split('::', 1)
+        if axis not in ('child', 'descendant', 'descendant-or-self', 'self'):
+            return None
+    name = step.split('[', 1)[0].strip()
+    if name == '*':
+        r = search(r'^\*\[\s*name\(\)\s*=\s*([\'"])([^\'"]+)\1\s*[]\s]', step)
+        return r.group(2) if r else None
+    if not name or name.startswith(('.', '@')) or '(' in name or ':' in name:
+        return None
+    return name
@@ -5,8 +5,9 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from typing import Union, List, Tuple, Optional
+from typing import Union, List, Tuple, Optional, Iterable, Iterator
 
+from lxml.etree import XPath, XMLPullParser, HTMLPullParser
 from lxml.html import HtmlElement
 
 from .._base.base import DrissionElement, BaseElement
@@ -305,3 +306,101 @@ ChromiumBase],
     :return: 返回SessionElement元素或列表，或属性文本
     """
     ...
+
+
+def make_html_tree(html: str) -> HtmlElement:
+    """把html文本解析为lxml树，会去掉开头的xml声明
+    :param html: html文本
+    :return: lxml树的根元素
+    """
+    ...
+
+
+def _chromium_ele_node(ele: ChromiumElement) -> HtmlElement:
+    """获取元素所在文档的html并解析，返回元素对应的lxml节点
+    :param ele: ChromiumElement对象
+    :return: lxml元素
+    """
+    ...
+
+
+def _snapshot_node(ele: ChromiumElement, check: bool = False) -> Optional[HtmlElement]:
+    """元素所在页面有有效快照时，返回元素在快照中对应的lxml节点，否则返回None
+    :param ele: ChromiumElement对象
+    :param check: 是否向页面确认快照获取后文档没有变化
+    :return: lxml元素或None
+    """
+    ...
+
+
+def find_in_snapshot(ele_or_page: Union[ChromiumElement, ChromiumBase],
+                     loc: Union[str, Tuple[str, str]],
+                     index: Optional[int] = 1,
+                     method: Optional[str] = None) -> Union[SessionElement, SessionElementsList, str, float, None]:
+    """页面快照有效时在快照中查找元素，快照无效或找不到时返回None
+    :param ele_or_page: ChromiumElement对象或页面对象
+    :param loc: 定位元组或字符串
+    :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个，None获取所有
+    :param method: 调用此方法的方法
+    :return: 返回SessionElement元素或列表，或属性文本，找不到时返回None
+    """
+    ...
+
+
+def _page_tree(page: Union[SessionPage, ChromiumBase]) -> HtmlElement:
+    """获取页面的lxml树，s模式的页面使用按响应缓存的解析结果
+    :param page: 页面对象
+    :return: lxml树的根元素
+    """
+    ...
+
+
+def iter_stream_eles(chunks: Iterable[bytes],
+                     locator: Union[Tuple[str, str], str],
+                     page: Optional[SessionPage] = None,
+                     xml: bool = False,
+                     encoding: Optional[str] = None) -> Iterator[SessionElement]:
+    """增量解析数据块，元素结束时若匹配定位符则返回，取下一个元素时清空该元素并释放它之前的兄弟节点；
+    不匹配的元素在结束时释放，能从定位符得出标签名时保留同名元素内部的元素直到它结束，否则只释放顶层元素
+    :param chunks: 生成bytes数据块的可迭代对象
+    :param locator: 定位符或定位元组，不支持ax定位
+    :param page: 元素所属页面对象
+    :param xml: 是否按xml解析
+    :param encoding: html的编码，为None时自动判断
+    :return: 生成SessionElement的迭代器
+    """
+    ...
+
+
+def _feed(parser: Union[XMLPullParser, HTMLPullParser], chunks: Iterable[bytes]) -> Iterator[None]:
+    """把数据块逐个送入解析器，每送入一块产出一次，最后关闭解析器
+    :param parser: 解析器
+    :param chunks: 数据块
+    :return: 生成器
+    """
+    ...
+
+
+def _free_node(node: HtmlElement) -> None:
+    """清空已处理完的元素，并删除它和各级祖先之前的兄弟节点，释放内存
+    :param node: lxml元素
+    :return: None
+    """
+    ...
+
+
+def _stream_finder(locator: Union[Tuple[str, str], str], xml: bool) -> Tuple[XPath, Optional[str]]:
+    """把定位符转换为编译好的xpath，并尽量得出匹配元素的标签名，用于跳过无关元素
+    :param locator: 定位符或定位元组
+    :param xml: 是否按xml解析
+    :return: (XPath对象, 标签名)，无法确定标签名时为None
+    """
+    ...
+
+
+def _last_tag(xpath: str) -> Optional[str]:
+    """获取xpath最后一步的标签名，无法确定时返回None
+    :param xpath: xpath语句
+    :return: 标签名或None
+    """
+    ...
@@ -5,10 +5,13 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from json import dumps
+
 from .locator import is_str_loc, is_selenium_loc
 from .._elements.none_element import NoneElement
 from .._functions.settings import Settings as _S
 from .._functions.tools import wait_until
+from .._functions.web import get_ele_txt, make_absolute_link, format_html
 from ..errors import LocatorError
 
 
@@ -191,18 +194,11 @@ class ChromiumFilterOne(SessionFilterOne):
 
     def _any_state(self, name, equal=True):
         num = 0
-        if equal:
-            for i in self._list:
-                if not isinstance(i, str) and getattr(i.states, name):
-                    num += 1
-                    if self._index == num:
-                        return i
-        else:
-            for i in self._list:
-                if not isinstance(i, str) and not getattr(i.states, name):
-                    num += 1
-                    if self._index == num:
-                        return i
+        for i, bits in zip(self._list, _get_states(self._list, (name,))):
+            if bits is not None and bits[0] is bool(equal):
+                num += 1
+                if self._index == num:
+                    return i
         return NoneElement(self._list._owner, f'{name}()', args={'equal': equal, 'index': self._index})
 
 
@@ -250,14 +246,9 @@ class ChromiumFilter(ChromiumFilterOne):
 
     def _any_state(self, name, equal=True):
         r = ChromiumElementsList(owner=self._list._owner)
-        if equal:
-            for i in self._list:
-                if not isinstance(i, str) and getattr(i.states, name):
-                    r.append(i)
-        else:
-            for i in self._list:
-                if not isinstance(i, str) and not getattr(i.states, name):
-                    r.append(i)
+        for i, bits in zip(self._list, _get_states(self._list, (name,))):
+            if bits is not None and bits[0] is bool(equal):
+                r.append(i)
         self._list = r
         return self
 
@@ -275,6 +266,15 @@ class Getter(object):
     def attrs(self, name):
         return [e.attr(name) for e in self._list if not isinstance(e, str)]
 
+    def columns(self, text=False, raw_text=False, attrs=None, props=None, as_rows=False):
+        attrs = (attrs,) if isinstance(attrs, str) else tuple(attrs or ())
+        props = (props,) if isinstance(props, str) else tuple(props or ())
+        keys = (('text',) if text else ()) + (('raw_text',) if raw_text else ()) + attrs + props
+        if len(set(keys)) != len(keys):
+            raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'attrs, props', CURR_VAL=keys))
+        rows = _get_columns(self._list, text, raw_text, attrs, props)
+        return rows if as_rows else {k: [r[n] for r in rows] for n, k in enumerate(keys)}
+
 
 def get_eles(locators, owner, any_one=False, first_ele=True, timeout=10):
     def do():
@@ -389,24 +389,11 @@ def _search(_list, displayed=None, checked=None, selected=None, enabled=None, cl
     :return: 筛选结果
     """
     r = ChromiumElementsList(owner=_list._owner)
-    for i in _list:
-        if not isinstance(i, str) and (
-                (displayed is not None and (displayed is True and i.states.is_displayed)
-                 or (displayed is False and not i.states.is_displayed))
-                or (checked is not None and (checked is True and i.states.is_checked)
-                    or (checked is False and not i.states.is_checked))
-                or (selected is not None and (selected is True and i.states.is_selected)
-                    or (selected is False and not i.states.is_selected))
-                or (enabled is not None and (enabled is True and i.states.is_enabled)
-                    or (enabled is False and not i.states.is_enabled))
-                or (clickable is not None and (clickable is True and i.states.is_clickable)
-                    or (clickable is False and not i.states.is_clickable))
-                or (have_rect is not None and (have_rect is True and i.states.has_rect)
-                    or (have_rect is False and not i.states.has_rect))
-                or (have_text is not None and (have_text is True and i.raw_text)
-                    or (have_text is False and not i.raw_text))
-                or (tag is not None and i.tag == tag.lower())):
-            r.append(i)
+    names, values = _search_args(displayed, checked, selected, enabled, clickable, have_rect, have_text, tag)
+    if names:
+        for i, bits in zip(_list, _get_states(_list, names, tag)):
+            if bits is not None and any(b is v for b, v in zip(bits, values)):
+                r.append(i)
     return ChromiumFilter(r)
 
 
@@ -425,28 +412,165 @@ def _search_one(_list, index=1, displayed=None, checked=None, selected=None, ena
     :return: 筛选结果
     """
     num = 0
-    for i in _list:
-        if not isinstance(i, str) and (
-                (displayed is not None and (displayed is True and i.states.is_displayed)
-                 or (displayed is False and not i.states.is_displayed))
-                or (checked is not None and (checked is True and i.states.is_checked)
-                    or (checked is False and not i.states.is_checked))
-                or (selected is not None and (selected is True and i.states.is_selected)
-                    or (selected is False and not i.states.is_selected))
-                or (enabled is not None and (enabled is True and i.states.is_enabled)
-                    or (enabled is False and not i.states.is_enabled))
-                or (clickable is not None and (clickable is True and i.states.is_clickable)
-                    or (clickable is False and not i.states.is_clickable))
-                or (have_rect is not None and (have_rect is True and i.states.has_rect)
-                    or (have_rect is False and not i.states.has_rect))
-                or (have_text is not None and (have_text is True and i.raw_text)
-                    or (have_text is False and not i.raw_text))
-                or (tag is not None and i.tag == tag.lower())):
-            num += 1
-            if num == index:
-                return i
+    names, values = _search_args(displayed, checked, selected, enabled, clickable, have_rect, have_text, tag)
+    if names:
+        for i, bits in zip(_list, _get_states(_list, names, tag)):
+            if bits is not None and any(b is v for b, v in zip(bits, values)):
+                num += 1
+                if num == index:
+                    return i
 
     return NoneElement(_list._owner, method='filter()', args={'displayed': displayed, 'checked': checked,
                                                               'selected': selected, 'enabled': enabled,
                                                               'clickable': clickable, 'have_rect': have_rect,
                                                               'have_text': have_text, 'tag': tag})
+
+
+def _search_args(displayed, checked, selected, enabled, clickable, have_rect, have_text, tag):
+    """把search()的参数转换为状态名称和期望值组成的两个tuple，忽略值为None的项"""
+    args = (('is_displayed', displayed), ('is_checked', checked), ('is_selected', selected),
+            ('is_enabled', enabled), ('is_clickable', clickable), ('has_rect', have_rect),
+            ('raw_text', have_text), ('tag', None if tag is None else True))
+    args = [(k, bool(v)) for k, v in args if v is not None]
+    return tuple(k for k, _ in args), tuple(v for _, v in args)
+
+
+__STATES_JS__ = {
+    'is_displayed': '(s().visibility!=="hidden"&&s().display!=="none"&&!e.hidden)',
+    'is_checked': 'e.checked',
+    'is_selected': 'e.selected',
+    'is_enabled': '!e.disabled',
+    'is_clickable': '(e.getClientRects().length>0&&!e.disabled&&s().visibility!=="hidden"'
+                    '&&s().display!=="none"&&!e.hidden&&s().pointerEvents!=="none")',
+    'has_rect': 'e.getClientRects().length>0',
+    'raw_text': 'e.innerText',
+}
+
+__ATTRS_JS__ = {'text': 'e.outerHTML', 'innerText': 'e.innerText', 'html': 'e.outerHTML', 'outerHTML': 'e.outerHTML',
+                'innerHTML': 'e.innerHTML'}
+
+
+def _get_states(_list, names, tag=None):
+    """获取列表中每个元素的多个状态，同一页面中的元素在一次Runtime.callFunctionOn中获取
+    :param _list: 元素列表
+    :param names: 状态名称组成的tuple，可用ElementStates中的状态名、'raw_text'和'tag'
+    :param tag: names中有'tag'时用于比较的元素类型
+    :return: 与列表等长的列表，每项为各状态bool值组成的tuple，文本项为None
+    """
+    js = {**__STATES_JS__, 'tag': f'e.localName==={dumps(tag.lower() if tag else "")}'}
+    exp = '|'.join(f'({js[name]}?{1 << k}:0)' for k, name in enumerate(names))
+    js = ('function(){return Array.prototype.map.call(arguments,function(e){let c;'
+          f'const s=()=>c||(c=window.getComputedStyle(e));return {exp};}});}}')
+    res = _run_in_pages(_list, js)
+    for n, i in enumerate(_list):
+        if isinstance(i, str):
+            continue
+        elif res[n] is None:
+            res[n] = tuple(_get_state(i, name, tag) for name in names)
+        else:
+            res[n] = tuple(bool(res[n] & (1 << k)) for k in range(len(names)))
+    return res
+
+
+def _get_columns(_list, text, raw_text, attrs, props):
+    """获取列表中每个元素的文本、多个attribute和property，同一页面中的元素在一次Runtime.callFunctionOn中获取
+    :param _list: 元素列表
+    :param text: 是否获取text
+    :param raw_text: 是否获取raw_text
+    :param attrs: attribute名称组成的tuple
+    :param props: property名称组成的tuple
+    :return: 每个元素一行，每行为text、raw_text、各attribute、各property组成的tuple，忽略文本项
+    """
+    base = 'href' in attrs or 'src' in attrs
+    cols = ((['e.outerHTML'] if text else []) + (['e.innerText'] if raw_text else [])
+            + [__ATTRS_JS__.get(n, f'e.getAttribute({dumps(n)})') for n in attrs])
+    js = (f'function(){{const p={dumps(props)};'
+          'return Array.prototype.map.call(arguments,function(e){'
+          f'const r=[{",".join(cols)}];'
+          'for(const n of p){const v=e[n];r.push(v===undefined?null:v);}'
+          f'{"r.push(e.baseURI);" if base else ""}return r;}});}}')
+    res = _run_in_pages(_list, js)
+    start = int(bool(text)) + int(bool(raw_text))
+    rows = []
+    for i, r in zip(_list, res):
+        if isinstance(i, str):
+            continue
+        elif r is None:
+            rows.append(((i.text,) if text else ()) + ((i.raw_text,) if raw_text else ())
+                        + tuple(i.attr(n) for n in attrs) + tuple(_get_prop(i, n) for n in props))
+            continue
+
+        if text:
+            r[0] = _html_text(r[0])
+        if raw_text:
+            r[start - 1] = format_html(r[start - 1])
+        for n, name in enumerate(attrs, start):  # 与attr()的特殊名称处理一致
+            if name == 'text':
+                r[n] = _html_text(r[n])
+            elif name == 'innerText':
+                r[n] = format_html(r[n])
+        if base:
+            uri = r.pop()
+            for n, name in enumerate(attrs, start):
+                if name == 'src' or (name == 'href' and r[n] and
+                                     not r[n].lower().startswith(('javascript:', 'mailto:'))):
+                    r[n] = make_absolute_link(r[n], uri)
+        for n in range(start + len(attrs), len(r)):
+            if isinstance(r[n], str):
+                r[n] = format_html(r[n])
+        rows.append(tuple(r))
+    return rows
+
+
+def _html_text(html):
+    """把outerHTML转换为与元素text属性相同的文本"""
+    from .._elements.session_element import make_session_ele
+    return get_ele_txt(make_session_ele(html))
+
+
+def _run_in_pages(_list, js):
+    """对列表中的元素按所在页面分组，每个页面执行一次js，js以各元素为参数，返回与参数对应的数组
+    :param _list: 元素列表
+    :param js: js函数文本
+    :return: 与列表等长的列表，每项为该元素的返回值，文本项、非ChromiumElement或出错时为None
+    """
+    res = [None] * len(_list)
+    groups = {}
+    for n, i in enumerate(_list):
+        owner = getattr(i, 'owner', None)
+        if owner is not None and getattr(i, '_type', None) == 'ChromiumElement':
+            groups.setdefault(id(owner), (owner, []))[1].append(n)
+
+    for owner, indexes in groups.values():
+        eles = [_list[n] for n in indexes]
+        lazy = [e for e in eles if not e._oid]
+        if lazy:
+            rs = owner._run_cdp_many([('DOM.resolveNode', {'backendNodeId': e._bid} if e._bid
+                                      else {'nodeId': e._nid}) for e in lazy], _ignore=True)
+            for e, r in zip(lazy, rs):
+                if 'error' not in r:
+                    e._obj_id = r['object']['objectId']
+        if not all(e._oid for e in eles):
+            continue
+
+        r = owner._run_cdp('Runtime.callFunctionOn', functionDeclaration=js, objectId=eles[0]._oid,
+                           arguments=[{'objectId': e._oid} for e in eles], returnByValue=True, _ignore=True)
+        if 'error' in r or 'exceptionDetails' in r:
+            continue
+        for n, v in zip(indexes, r['result']['value']):
+            res[n] = v
+    return res
+
+
+def _get_prop(ele, name):
+    """逐个获取元素的property，没有该方法的元素返回None"""
+    return ele.property(name) if hasattr(ele, 'property') else None
+
+
+def _get_state(ele, name, tag=None):
+    """逐个获取元素的一个状态"""
+    if name == 'raw_text':
+        return bool(ele.raw_text)
+    elif name == 'tag':
+        return ele.tag == tag.lower()
+    return bool(getattr(ele.states, name))
@@ -563,6 +563,22 @@ class Getter(object):
         """
         ...
 
+    def columns(self,
+                text: bool = False,
+                raw_text: bool = False,
+                attrs: Union[str, Iterable[str], None] = None,
+                props: Union[str, Iterable[str], None] = None,
+                as_rows: bool = False) -> Union[Dict[str, list], List[tuple]]:
+        """批量获取所有元素的文本、attribute和property，同一页面中的元素只执行一次js，忽略文本项
+        :param text: 是否获取text，与元素text属性一致
+        :param raw_text: 是否获取raw_text，即innerText
+        :param attrs: 要获取的attribute名称或其组成的列表，href和src返回绝对路径
+        :param props: 要获取的property名称或其组成的列表，不能与attrs中的名称相同
+        :param as_rows: 为True时返回每个元素一行组成的列表，顺序为text、raw_text、attrs、props，否则返回以名称为键的dict
+        :return: 以名称为键、值列表为值的dict，或每行为一个tuple的列表
+        """
+        ...
+
 
 def get_eles(locators: Union[str, tuple, List[Union[str, tuple]]],
              owner: BaseParser,
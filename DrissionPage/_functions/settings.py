@@ -20,6 +20,9 @@ class Settings(object):
     auto_handle_alert = None
     suffixes_list = str(Path(__file__).parent.resolve() / 'suffixes.dat').replace('\\', '/')
     wait_stop_before_click = False
+    lazy_ele_ids = False
+    event_workers = 8
+    json_codec = 'auto'
     _lang = get_txt_class(None)
     _debug = None  # 为None时不开启，为True或指定目标时全部开启，为False时由Messenger决定
 
@@ -28,6 +31,23 @@ class Settings(object):
         cls.wait_stop_before_click = on_off
         return cls
 
+    @classmethod
+    def set_lazy_ele_ids(cls, on_off=True):
+        cls.lazy_ele_ids = on_off
+        return cls
+
+    @classmethod
+    def set_event_workers(cls, num):
+        cls.event_workers = num
+        return cls
+
+    @classmethod
+    def set_json_codec(cls, name='auto'):
+        from .._base.codec import set_codec
+        set_codec(name)
+        cls.json_codec = name
+        return cls
+
     @classmethod
     def set_raise_when_ele_not_found(cls, on_off=True):
         cls.raise_when_ele_not_found = on_off
@@ -21,6 +21,9 @@ class Settings(object):
     auto_handle_alert: Optional[bool] = ...
     suffixes_list: str = ...
     wait_stop_before_click: bool = ...
+    lazy_ele_ids: bool = ...
+    event_workers: int = ...
+    json_codec: Literal['auto', 'json', 'orjson', 'ujson'] = ...
     _lang: Texts = ...
 
     @classmethod
@@ -31,6 +34,30 @@ class Settings(object):
         """
         ...
 
+    @classmethod
+    def set_lazy_ele_ids(cls, on_off: bool = True) -> Settings:
+        """设置元素对象是否延迟获取node id、object id和backend id，开启后批量获取的元素在首次使用时才获取各id
+        :param on_off: bool表示开或关
+        :return: None
+        """
+        ...
+
+    @classmethod
+    def set_event_workers(cls, num: int) -> Settings:
+        """设置之后创建的浏览器对象处理事件回调的最大线程数，浏览器及其所有标签页、iframe共用这些线程
+        :param num: 线程数
+        :return: None
+        """
+        ...
+
+    @classmethod
+    def set_json_codec(cls, name: Literal['auto', 'json', 'orjson', 'ujson'] = 'auto') -> Settings:
+        """设置与浏览器通讯时使用的json库，'auto'时依次选用已安装的orjson、ujson和标准库json
+        :param name: 'auto', 'json', 'orjson', 'ujson'
+        :return: None
+        """
+        ...
+
     @classmethod
     def set_raise_when_ele_not_found(cls, on_off: bool = True) -> Settings:
         """设置找不到元素时是否立即抛出异常
@@ -111,6 +111,7 @@ class Texts(object):
     GET_WINDOW_SIZE_FAILED = '获取窗口信息失败。'
     SET_FAILED_ = '{}设置失败。'
     NOT_LISTENING = '监听未启动或已停止。'
+    INTERCEPT_UNSUPPORTED_ = 'intercept模式下不支持{}。'
     NOT_BLOB = '该链接非blob类型。'
     CANNOT_INPUT_FILE = '该输入框无法接管，请改用对<input>元素输入路径的方法设置。'
     NO_SUCH_KEY_ = '没有这个按键: {}'
@@ -321,6 +322,7 @@ class English(Texts):
     GET_WINDOW_SIZE_FAILED = 'Failed to obtain window information. Procedure'
     SET_FAILED_ = 'The argument {} setting failed.'
     NOT_LISTENING = 'Listening is not started or stopped.'
+    INTERCEPT_UNSUPPORTED_ = '{} is not supported in intercept mode.'
     NOT_BLOB = 'The link is not of blob type.'
     CANNOT_INPUT_FILE = 'This input field cannot handle. Instead, set the input path to the <input> element.'
     NO_SUCH_KEY_ = 'There is no button: {}'
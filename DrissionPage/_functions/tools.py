@@ -137,24 +137,33 @@ def get_hwnds_from_pid(pid, title):
     return hwnds
 
 
-def wait_until(func, timeout, gap=.01, err_txt=None, **kwargs):
+def wait_until(func, timeout, gap=.01, err_txt=None, _cond=None, **kwargs):
+    if _cond is None:
+        r = _wait_until(func, timeout, gap, sleep, kwargs)
+    else:
+        with _cond:
+            r = _wait_until(func, timeout, gap, _cond.wait, kwargs)
+    if r is not None:
+        return r
+    elif err_txt is not None:
+        raise WaitTimeoutError(err_txt)
+    return None
+
+
+def _wait_until(func, timeout, gap, pause, kwargs):
     if timeout is None:
         r = func(**kwargs)
         while r is None:
-            sleep(gap)
+            pause(gap)
             r = func(**kwargs)
         return r
     end_time = perf_counter() + timeout
     r = func(**kwargs)
     if r is None and timeout:
         while r is None and perf_counter() < end_time:
-            sleep(gap)
+            pause(gap)
             r = func(**kwargs)
-    if r is not None:
-        return r
-    elif err_txt is not None:
-        raise WaitTimeoutError(err_txt)
-    return None
+    return r
 
 
 def configs_to_here(save_name=None):
@@ -7,7 +7,7 @@
 """
 from os import popen
 from pathlib import Path
-from threading import Lock
+from threading import Lock, Condition
 from typing import Union, Tuple, Callable, Any
 
 from .._browsers.chromium import Chromium
@@ -81,12 +81,14 @@ def get_hwnds_from_pid(pid: Union[str, int], title: str) -> list:
     ...
 
 
-def wait_until(func: Callable, timeout: float, gap: float = .01, err_txt:str=None, **kwargs) -> Any:
+def wait_until(func: Callable, timeout: float, gap: float = .01, err_txt:str=None,
+               _cond: Condition = None, **kwargs) -> Any:
     """等待传入的方法返回值不为假
     :param func: 要执行的方法
     :param timeout: 超时时间（秒）
-    :param gap: 间隔时间（秒）
+    :param gap: 间隔时间（秒），传入_cond时为最长等待通知时间
     :param err_txt: 超时抛出异常的文本，不为None时才抛出异常
+    :param _cond: 状态改变时会notify的Condition对象，传入时在其上等待而不是sleep，func在其锁内执行
     :return: 执行结果
     """
     ...
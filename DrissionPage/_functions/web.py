@@ -355,6 +355,7 @@ class NavResult(object):
         self.headers = None
         self.request = None
         self.Response = None
+        self.error = None
 
     def __repr__(self):
         return f'<NavResult url: {self.url}, status: {self.status} >'
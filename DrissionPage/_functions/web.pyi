@@ -156,6 +156,7 @@ class NavResult(object):
     headers: Union[CaseInsensitiveDict, dict, None] = ...
     request: Union[PreparedRequest, dict, None] = ...
     Response: Optional[Response] = ...
+    error: Optional[Exception] = ...
 
     @property
     def ok(self) -> Optional[bool]:
@@ -0,0 +1,249 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import get_event_loop, wait_for
+from asyncio import TimeoutError as AsyncTimeoutError
+from inspect import isawaitable
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import quote
+
+from .chromium_base import Timeout
+from .._base.async_driver import AsyncDriver
+from .._elements.async_element import run_js, find_eles
+from .._functions.settings import Settings as _S
+from .._functions.tools import raise_error
+from .._functions.web import NavResult
+from .._units.listener import AsyncListener
+
+
+class AsyncChromiumTab(object):
+    def __init__(self, browser, tab_id=None, driver=None):
+        self._browser = browser
+        self._target_id = tab_id
+        self._driver = driver
+        self._own_driver = driver is None
+        self._session_id = None
+        self._frame_id = None
+        self._doc_id = None
+        self._listener = None
+        self._nav_result = None
+        self._load_future = None
+        self._timeouts = Timeout(**browser.timeouts.as_dict)
+        self._type = 'AsyncChromiumTab'
+
+        self._enabled = {}
+        self._dropped_events = {}
+        self._event_handlers = {
+            'Page.loadEventFired': [self._onLoadEventFired],
+            'Page.frameNavigated': [self._onFrameNavigated],
+        }
+
+    def __repr__(self):
+        return f'<AsyncChromiumTab browser_id={self._browser.id} tab_id={self._target_id}>'
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+    @property
+    def browser(self):
+        return self._browser
+
+    @property
+    def tab_id(self):
+        return self._target_id
+
+    @property
+    def timeout(self):
+        return self._timeouts.base
+
+    @property
+    def timeouts(self):
+        return self._timeouts
+
+    @property
+    def has_alert(self):
+        return bool(self._session_id) and self._session_id in self._driver.alert_flag
+
+    @property
+    def listen(self):
+        if self._listener is None:
+            self._listener = AsyncListener(self)
+        return self._listener
+
+    async def connect(self):
+        if self._session_id:
+            return self
+        if self._driver is None:
+            self._driver = AsyncDriver(self._browser._driver.address)
+        await self._driver.start()
+        if self._target_id is None:
+            r = await self._driver.run('Target.createTarget', url='about:blank')
+            if 'error' in r:
+                raise_error(r, self._browser)
+            self._target_id = r['targetId']
+
+        r = await self._driver.run('Target.attachToTarget', targetId=self._target_id, flatten=True)
+        if 'error' in r:
+            raise_error(r, self._browser)
+        self._session_id = r['sessionId']
+        self._driver.add_session_owner(self._session_id, self)
+        await self._enable_domain('Page')
+        self._frame_id = (await self._run_cdp('Page.getFrameTree'))['frameTree']['frame']['id']
+        return self
+
+    async def disconnect(self):
+        if self._session_id and self._driver.is_running:
+            self._driver.remove_session_owner(self._session_id)
+            await self._driver.run('Target.detachFromTarget', sessionId=self._session_id, _timeout=2)
+        self._session_id = None
+        self._enabled = {}
+        self._doc_id = None
+        if self._own_driver and self._driver:
+            await self._driver.stop()
+            self._driver = None
+
+    async def close(self):
+        driver = self._driver
+        tid = self._target_id
+        own = self._own_driver
+        self._own_driver = False
+        await self.disconnect()
+        self._own_driver = own
+        if driver and driver.is_running:
+            await driver.run('Target.closeTarget', targetId=tid)
+            if own:
+                await driver.stop()
+                self._driver = None
+
+    async def get(self, url, timeout=None, raise_err=False):
+        is_file = False
+        if isinstance(url, Path) or ('://' not in url and ':\\\\' not in url):
+            p = Path(url)
+            if p.exists():
+                url = str(p.resolve())
+                is_file = True
+        url = url if is_file else quote(url, safe='-_.~!*\'"();:@&=+$,/\\?#[]%')
+
+        timeout = timeout if timeout is not None else self.timeouts.page_load
+        end_time = perf_counter() + timeout
+        self._nav_result = NavResult()
+        await self._enable_domain('Network')
+        self._set_callback('Network.responseReceived', self._get_status_code)
+        self._set_callback('Network.requestWillBeSent', self._get_request)
+        self._load_future = get_event_loop().create_future()
+        err = None
+        try:
+            result = await self._run_cdp('Page.navigate', frameId=self._frame_id, url=url, _timeout=timeout)
+            if 'errorText' in result:
+                self._nav_result.status = result['errorText']
+                err = ConnectionError(_S._lang.joinn(_S._lang.CONNECT_ERR, INFO=result['errorText']))
+            elif result.get('loaderId'):
+                try:
+                    await wait_for(self._load_future, max(end_time - perf_counter(), .1))
+                except AsyncTimeoutError:
+                    await self._run_cdp('Page.stopLoading', _ignore=True)
+                    err = TimeoutError(_S._lang.joinn(_S._lang.TIMEOUT_, _S._lang.PAGE_CONNECT, timeout))
+        except TimeoutError:
+            self._nav_result.status = 'net::ERR_TIMED_OUT'
+            err = TimeoutError(_S._lang.joinn(_S._lang.TIMEOUT_, _S._lang.PAGE_CONNECT, timeout))
+        finally:
+            self._load_future = None
+            self._remove_callback('Network.responseReceived', self._get_status_code)
+            self._remove_callback('Network.requestWillBeSent', self._get_request)
+            await self._disable_domain('Network')
+
+        if err and raise_err:
+            raise err
+        return self._nav_result
+
+    async def ele(self, locator, index=1, timeout=None):
+        return await find_eles(self, locator, index=index, timeout=timeout, method='ele()')
+
+    async def eles(self, locator, timeout=None):
+        return await find_eles(self, locator, index=None, timeout=timeout)
+
+    async def run_js(self, script, *args, as_expr=False, timeout=None):
+        return await run_js(self, script, as_expr, self.timeouts.script if timeout is None else timeout, args)
+
+    async def _get_doc_id(self):
+        """获取document对象的object id，页面刷新前使用缓存"""
+        if self._doc_id is None:
+            self._doc_id = (await self._run_cdp('Runtime.evaluate', expression='document'))['result']['objectId']
+        return self._doc_id
+
+    async def _run_cdp(self, cmd, _ignore=None, _user=False, _timeout=None, **cmd_args):
+        r = await self._driver.run(cmd, _timeout=_timeout, _session_id=self._session_id, **cmd_args)
+        return r if 'error' not in r or _ignore is True else raise_error(r, self._browser, ignore=_ignore, user=_user)
+
+    async def _enable_domain(self, domain, **kwargs):
+        if domain in self._enabled:
+            self._enabled[domain] += 1
+        else:
+            self._enabled[domain] = 1
+            await self._run_cdp(f'{domain}.enable', **kwargs)
+
+    async def _disable_domain(self, domain, **kwargs):
+        if domain in self._enabled:
+            self._enabled[domain] -= 1
+            if self._enabled[domain] <= 0:
+                await self._run_cdp(f'{domain}.disable', _ignore=True, **kwargs)
+                self._enabled.pop(domain, None)
+
+    def _set_callback(self, event, callback):
+        if callback:
+            self._event_handlers.setdefault(event, []).append(callback)
+        else:
+            self._event_handlers.pop(event, None)
+
+    def _remove_callback(self, event, callback):
+        functions = self._event_handlers.get(event)
+        try:
+            functions.remove(callback)
+        except (ValueError, AttributeError):
+            pass
+
+    def _accept_event(self, method):
+        """判断事件是否有人订阅，没有则记入丢弃数"""
+        if self._event_handlers.get(method):
+            return True
+        self._dropped_events[method] = self._dropped_events.get(method, 0) + 1
+        return False
+
+    def _recv_event(self, msg):
+        if not self._accept_event(msg['method']):
+            return
+        for func in self._event_handlers[msg['method']]:
+            r = func(**msg['params'])
+            if isawaitable(r):
+                self._driver.spawn(r)
+
+    def _on_disconnect(self):
+        self._session_id = None
+        if self._load_future and not self._load_future.done():
+            self._load_future.cancel()
+
+    def _onLoadEventFired(self, **kwargs):
+        if self._load_future and not self._load_future.done():
+            self._load_future.set_result(True)
+
+    def _onFrameNavigated(self, **kwargs):
+        if not kwargs['frame'].get('parentId'):
+            self._doc_id = None
+
+    def _get_status_code(self, **kwargs):
+        if kwargs.get('frameId') == self._frame_id and kwargs['type'] == 'Document':
+            self._nav_result.status = kwargs['response']['status']
+            self._nav_result.url = kwargs['response']['url']
+            self._nav_result.headers = kwargs['response']['headers']
+
+    def _get_request(self, **kwargs):
+        if kwargs.get('frameId') == self._frame_id and kwargs.get('type') == 'Document':
+            self._nav_result.request = kwargs['request']
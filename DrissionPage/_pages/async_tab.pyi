@@ -0,0 +1,171 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from asyncio import Future
+from pathlib import Path
+from typing import Union, Tuple, List, Any, Optional, Callable, Dict
+
+from .chromium_base import Timeout
+from .._base.async_driver import AsyncDriver
+from .._browsers.chromium import Chromium
+from .._elements.async_element import AsyncChromiumElement
+from .._elements.none_element import NoneElement
+from .._functions.web import NavResult
+from .._units.listener import AsyncListener
+
+
+class AsyncChromiumTab(object):
+    """用asyncio驱动的标签页对象，不创建线程，多个标签页可共用一个AsyncDriver在同一事件循环中并发操作"""
+    _browser: Chromium = ...
+    _target_id: Optional[str] = ...
+    _driver: Optional[AsyncDriver] = ...
+    _own_driver: bool = ...
+    _session_id: Optional[str] = ...
+    _frame_id: Optional[str] = ...
+    _doc_id: Optional[str] = ...
+    _listener: Optional[AsyncListener] = ...
+    _nav_result: Optional[NavResult] = ...
+    _load_future: Optional[Future] = ...
+    _timeouts: Timeout = ...
+    _type: str = ...
+    _enabled: Dict[str, int] = ...
+    _dropped_events: Dict[str, int] = ...
+    _event_handlers: Dict[str, List[Callable]] = ...
+
+    def __init__(self, browser: Chromium, tab_id: str = None, driver: AsyncDriver = None):
+        """创建对象后需await connect()或用async with连接
+        :param browser: Chromium对象，用于获取连接地址和超时设置
+        :param tab_id: 要连接的标签页id，为None时连接时新建标签页
+        :param driver: 共用的AsyncDriver对象，为None时自行创建并在断开时关闭
+        """
+        ...
+
+    async def __aenter__(self) -> AsyncChromiumTab: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def browser(self) -> Chromium:
+        """返回浏览器对象"""
+        ...
+
+    @property
+    def tab_id(self) -> Optional[str]:
+        """返回标签页id"""
+        ...
+
+    @property
+    def timeout(self) -> float:
+        """返回查找元素时默认超时时间"""
+        ...
+
+    @property
+    def timeouts(self) -> Timeout:
+        """返回超时设置"""
+        ...
+
+    @property
+    def has_alert(self) -> bool:
+        """返回页面是否有弹出框"""
+        ...
+
+    @property
+    def listen(self) -> AsyncListener:
+        """返回用于聆听数据包的异步对象"""
+        ...
+
+    async def connect(self) -> AsyncChromiumTab:
+        """连接浏览器并附加到标签页
+        :return: 当前对象
+        """
+        ...
+
+    async def disconnect(self) -> None:
+        """断开与标签页的连接，不关闭标签页"""
+        ...
+
+    async def close(self) -> None:
+        """关闭标签页并断开连接"""
+        ...
+
+    async def get(self, url: Union[str, Path], timeout: float = None, raise_err: bool = False) -> NavResult:
+        """访问url，等待页面load事件
+        :param url: 目标url，可指定本地文件路径
+        :param timeout: 连接超时时间（秒），为None时使用timeouts.page_load
+        :param raise_err: 连接出错时是否抛出异常
+        :return: NavResult对象
+        """
+        ...
+
+    async def ele(self,
+                  locator: Union[Tuple[str, str], str],
+                  index: int = 1,
+                  timeout: float = None) -> Union[AsyncChromiumElement, str, float, NoneElement]:
+        """获取一个符合条件的元素对象，定位符解析与ChromiumTab相同，不支持ax定位
+        :param locator: 定位符或元组
+        :param index: 获取第几个元素，从1开始，可传入负数获取倒数第几个
+        :param timeout: 查找超时时间（秒）
+        :return: 元素对象或属性、文本节点文本
+        """
+        ...
+
+    async def eles(self,
+                   locator: Union[Tuple[str, str], str],
+                   timeout: float = None) -> List[Union[AsyncChromiumElement, str]]:
+        """获取所有符合条件的元素对象
+        :param locator: 定位符或元组
+        :param timeout: 查找超时时间（秒）
+        :return: 元素对象或属性、文本组成的列表
+        """
+        ...
+
+    async def run_js(self, script: str, *args, as_expr: bool = False, timeout: float = None) -> Any:
+        """运行javascript代码，结果解析方式与ChromiumTab.run_js()相同
+        :param script: js文本或js文件路径
+        :param args: 参数，按顺序在js文本中对应arguments[0]、arguments[1]...
+        :param as_expr: 是否作为表达式运行，为True时args无效
+        :param timeout: js超时时间（秒），为None则使用timeouts.script设置
+        :return: 运行的结果
+        """
+        ...
+
+    async def _get_doc_id(self) -> str: ...
+
+    async def _run_cdp(self, cmd: str, _ignore=None, _user: bool = False, _timeout: float = None,
+                       **cmd_args) -> dict:
+        """执行cdp命令，错误处理与同步页面对象一致"""
+        ...
+
+    async def _enable_domain(self, domain: str, **kwargs) -> None: ...
+
+    async def _disable_domain(self, domain: str, **kwargs) -> None: ...
+
+    def _set_callback(self, event: str, callback: Optional[Callable]) -> None:
+        """设置事件回调，回调可以是普通方法或协程方法
+        :param event: 事件名
+        :param callback: 回调方法，为None时清除该事件所有回调
+        :return: None
+        """
+        ...
+
+    def _remove_callback(self, event: str, callback: Callable) -> None: ...
+
+    def _accept_event(self, method: str) -> bool: ...
+
+    def _recv_event(self, msg: dict) -> None:
+        """在接收任务中执行事件回调，协程回调交给driver调度"""
+        ...
+
+    def _on_disconnect(self) -> None: ...
+
+    def _onLoadEventFired(self, **kwargs) -> None: ...
+
+    def _onFrameNavigated(self, **kwargs) -> None: ...
+
+    def _get_status_code(self, **kwargs) -> None: ...
+
+    def _get_request(self, **kwargs) -> None: ...
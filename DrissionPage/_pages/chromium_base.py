@@ -18,7 +18,7 @@ from .._base.base import BasePage, Messenger
 from .._configs.session_options import SessionOptions
 from .._elements.chromium_element import run_js, make_chromium_eles, find_by_ax, wait_for_ele
 from .._elements.none_element import NoneElement
-from .._elements.session_element import make_session_ele
+from .._elements.session_element import make_session_ele, find_in_snapshot
 from .._functions.cookies import CookiesList
 from .._functions.elements import SessionElementsList, get_frame, ChromiumElementsList
 from .._functions.locator import get_loc, quotes_escape
@@ -32,6 +32,7 @@ from .._units.rect import TabRect
 from .._units.screencast import Screencast
 from .._units.scroller import PageScroller
 from .._units.setter import ChromiumBaseSetter
+from .._units.snapshot import PageSnapshot
 from .._units.states import PageStates
 from .._units.waiter import BaseWaiter
 from ..errors import (ContextLostError, CDPError, PageDisconnectedError, ElementLostError, JavaScriptError,
@@ -69,6 +70,7 @@ class ChromiumBase(BasePage, Messenger):
         self._init_jss = []
         self._disconnect_flag = False
         self._type = 'ChromiumBase'
+        self._snapshot = None
         if not hasattr(self, '_listener'):
             self._listener = None
 
@@ -182,6 +184,7 @@ class ChromiumBase(BasePage, Messenger):
     def _onFrameStartedLoading(self, **kwargs):
         self.browser._tabs.add_frame(kwargs['frameId'], self.tab_id)
         if kwargs['frameId'] == self._frame_id:
+            self._discard_snapshot()
             self._doc_got = False
             self._ready_state = 'connecting'
             self._is_loading = True
@@ -393,6 +396,9 @@ class ChromiumBase(BasePage, Messenger):
     def run_cdp_loaded(self, cmd, **cmd_args):
         return self._run_cdp_loaded(cmd, _user=True, **cmd_args)
 
+    def run_cdp_batch(self, cmds, timeout=None):
+        return self._run_cdp_many(cmds, _user=True, _timeout=timeout)
+
     def _run_cdp_loaded(self, cmd, _ignore=None, _user=False, _timeout=None, **cmd_args):
         self.wait.doc_loaded()
         return self._run_cdp(cmd, _ignore=_ignore, _user=_user, _timeout=_timeout, **cmd_args)
@@ -445,6 +451,9 @@ class ChromiumBase(BasePage, Messenger):
         return self._ele(locator, timeout=timeout, index=None)
 
     def s_ele(self, locator=None, index=1, timeout=None):
+        r = find_in_snapshot(self, locator, index=index, method='s_ele()') if locator else None
+        if r is not None:
+            return r
         if timeout is None:
             timeout = self.timeout
         return (NoneElement(self, method='s_ele()', args={'locator': locator, 'index': index, 'timeout': timeout})
@@ -452,9 +461,24 @@ class ChromiumBase(BasePage, Messenger):
                 else make_session_ele(self, locator, index=index, method='s_ele()'))
 
     def s_eles(self, locator, timeout=None):
+        r = find_in_snapshot(self, locator, index=None)
+        if r is not None:
+            return r
         return (make_session_ele(self, locator, index=None)
                 if self.wait.eles_loaded(locator, timeout=timeout) else SessionElementsList())
 
+    def snapshot(self):
+        self._discard_snapshot()
+        self._snapshot = PageSnapshot(self)
+        return self._snapshot
+
+    def _discard_snapshot(self):
+        """使当前页面快照失效"""
+        snapshot = getattr(self, '_snapshot', None)
+        if snapshot is not None:
+            self._snapshot = None
+            snapshot.discard()
+
     def _find_elements(self, locator, timeout, index=1, relative=False, raise_err=None):
         if isinstance(locator, (str, tuple)):
             mode, loc = get_loc(locator)
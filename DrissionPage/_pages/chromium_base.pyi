@@ -6,7 +6,7 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
-from typing import Union, Tuple, Any, Optional, Literal
+from typing import Union, Tuple, Any, Optional, Literal, Iterable, List
 
 from requests import Session
 
@@ -29,6 +29,7 @@ from .._units.rect import TabRect, FrameRect
 from .._units.screencast import Screencast
 from .._units.scroller import Scroller, PageScroller
 from .._units.setter import ChromiumBaseSetter
+from .._units.snapshot import PageSnapshot
 from .._units.states import PageStates
 from .._units.waiter import BaseWaiter
 
@@ -60,6 +61,7 @@ class ChromiumBase(BasePage, Messenger):
     _screencast: Optional[Screencast] = ...
     _actions: Optional[Actions] = ...
     _listener: Optional[Listener] = ...
+    _snapshot: Optional[PageSnapshot] = ...
     _states: Optional[PageStates] = ...
     _alert: Alert = ...
     _has_alert: bool = ...
@@ -316,6 +318,16 @@ class ChromiumBase(BasePage, Messenger):
         """
         ...
 
+    def run_cdp_batch(self,
+                      cmds: Iterable[Union[str, Tuple[str, dict]]],
+                      timeout: float = None) -> List[dict]:
+        """批量执行Chrome DevTools Protocol语句，所有语句连续发出，只等待一次往返
+        :param cmds: 由(协议项目, 参数dict)或协议项目组成的列表
+        :param timeout: 超时时间（秒），为None使用Settings.cdp_timeout
+        :return: 与cmds顺序对应的执行结果列表
+        """
+        ...
+
     def _run_cdp_loaded(self, cmd: str, **cmd_args) -> dict:
         """执行Chrome DevTools Protocol语句，执行前等待页面加载完毕
         :param cmd: 协议项目
@@ -441,6 +453,17 @@ class ChromiumBase(BasePage, Messenger):
         """
         ...
 
+    def snapshot(self) -> PageSnapshot:
+        """获取页面快照，页面发生变化或跳转前，s_ele()和s_eles()（包括元素对象的）直接从快照中查找，
+        不再每次获取和解析整个页面，快照中找不到时仍按原方式查找
+        :return: PageSnapshot对象
+        """
+        ...
+
+    def _discard_snapshot(self) -> None:
+        """使当前页面快照失效"""
+        ...
+
     def _find_elements(self,
                        locator: Union[Tuple[str, str], str, ChromiumElement, ChromiumFrame],
                        timeout: float,
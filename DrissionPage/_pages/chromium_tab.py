@@ -41,6 +41,7 @@ class ChromiumTab(ChromiumBase, SessionPage):
         self._mode_obj = super()
         self._response = None
         self._encoding = None
+        self._tree = None
         super().__init__(browser, tab_id, context_id)
         self._tab = self
         self._type = 'ChromiumTab'
@@ -6,16 +6,19 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
+from queue import Queue, Full
 from re import search, DOTALL
+from threading import Thread, Lock, Event
 from time import sleep
-from urllib.parse import urlparse
+from urllib.parse import urlparse, quote
 
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.structures import CaseInsensitiveDict
 from tldextract import TLDExtract
 
 from .._base.base import BasePage
-from .._elements.session_element import SessionElement, make_session_ele
+from .._elements.session_element import SessionElement, make_session_ele, make_html_tree, iter_stream_eles
 from .._functions.cookies import cookie_to_dict, CookiesList
 from .._functions.settings import Settings as _S
 from .._functions.web import format_headers, NavResult
@@ -28,6 +31,7 @@ class SessionPage(BasePage):
         self._response = None
         self._set = None
         self._encoding = None
+        self._tree = None
         self._type = 'SessionPage'
         self._set_session_options(session_or_options)
         self._s_set_runtime_settings()
@@ -110,6 +114,7 @@ class SessionPage(BasePage):
                 r.status_code = 200
                 r.url = self._url
                 self._response = r
+                self._tree = None
             return True
         if timeout is None:
             timeout = self._timeout
@@ -122,6 +127,40 @@ class SessionPage(BasePage):
         kwargs['timeout'] = timeout
         return self._s_connect(url=url, mode='post', retry=retry, interval=interval, raise_err=raise_err, **kwargs)
 
+    def get_many(self, urls, concurrency=5, retry=None, interval=None, timeout=None, **kwargs):
+        results = sorted(self._fetch_iter(urls, concurrency, retry, interval, timeout, None, kwargs),
+                         key=lambda x: x[0])
+        return [r[1:] for r in results]
+
+    def fetch_iter(self, urls, concurrency=5, retry=None, interval=None, timeout=None, buffer=None, **kwargs):
+        results = self._fetch_iter(urls, concurrency, retry, interval, timeout, buffer, kwargs)
+        try:
+            for r in results:
+                yield r[1:]
+        finally:
+            results.close()
+
+    def iter_eles(self, url, locator, retry=None, interval=None, timeout=None, raise_err=False, xml=None,
+                  chunk_size=65536, **kwargs):
+        url = quote(str(url), safe='-_.~!*\'"();:@&=+$,/\\?#[]%')
+        if timeout is None:
+            timeout = self._timeout
+        kwargs['timeout'] = timeout
+        r = self._stream_response(url, retry, interval, raise_err, **kwargs)
+        if r is None:
+            return
+        try:
+            if xml is None:
+                content_type = r.headers.get('content-type', '').lower()
+                xml = 'xml' in content_type or (not content_type and urlparse(url).path.lower().endswith('.xml'))
+            charset = search(r'charset[=: ]*([^;\s]+)', r.headers.get('content-type', '').lower())
+            encoding = self._encoding or (charset.group(1) if charset else None)
+            page = self._result_page(url, r, make_nav_result(r))
+            for ele in iter_stream_eles(r.iter_content(chunk_size), locator, page=page, xml=xml, encoding=encoding):
+                yield ele
+        finally:
+            r.close()
+
     def ele(self, locator, index=1, timeout=None):
         return self._ele(locator, index=index, method='ele()')
 
@@ -161,6 +200,14 @@ class SessionPage(BasePage):
                 r.append({'name': c['name'], 'value': c['value'], 'domain': c['domain']})
         return r
 
+    def _s_tree(self):
+        """获取当前响应解析后的lxml树，同一响应和编码只解析一次"""
+        r = self._response
+        encoding = None if r is None else r.encoding
+        if self._tree is None or self._tree[0] is not r or self._tree[1] != encoding:
+            self._tree = (r, encoding, make_html_tree(self.html))
+        return self._tree[2]
+
     def close(self):
         self._session.close()
         if self._response is not None:
@@ -168,49 +215,134 @@ class SessionPage(BasePage):
 
     def _s_connect(self, url, mode, retry=None, interval=None, raise_err=False, **kwargs):
         retry, interval, is_file = self._before_connect(url, retry, interval)
+        self._tree = None
         self._response = self._make_response(url=self._url, mode=mode, retry=retry, interval=interval,
                                              raise_err=raise_err, **kwargs)
 
-        self._nav_result = NavResult()
-        if self._response is not None:
-            self._nav_result.status = self._response.status_code
-            self._nav_result.url = self._response.url
-            self._nav_result.headers = self._response.headers
-            self._nav_result.request = self._response.request
-            self._nav_result.Response = self._response
-
+        self._nav_result = make_nav_result(self._response)
         self._url_available = self._nav_result.ok
         if not self._url_available and raise_err:
             raise ConnectionError(_S._lang.joinn(_S._lang.STATUS_CODE_, self._response.status_code))
         return self._nav_result
 
-    def _make_response(self, url, mode='get', retry=None, interval=None, raise_err=False, **kwargs):
-        kwargs = CaseInsensitiveDict(kwargs)
-        if 'headers' in kwargs:
-            kwargs['headers'] = CaseInsensitiveDict(format_headers(kwargs['headers']))
-        else:
-            kwargs['headers'] = CaseInsensitiveDict()
-
-        # 设置referer和host值
-        parsed_url = urlparse(url)
-        hostname = parsed_url.netloc
-        scheme = parsed_url.scheme
-        if not check_headers(kwargs['headers'], self._headers, 'Referer'):
-            kwargs['headers']['Referer'] = self.url if self.url else f'{scheme}://{hostname}'
-        elif not kwargs['headers']['Referer']:
-            kwargs['headers'].pop('Referer')
-        if not check_headers(kwargs['headers'], self._headers, 'Host'):
-            kwargs['headers']['Host'] = hostname
-        elif not kwargs['headers']['Host']:
-            kwargs['headers'].pop('Host')
-        if not check_headers(kwargs, self._headers, 'timeout'):
-            kwargs['timeout'] = self.timeout
+    def _fetch_iter(self, urls, concurrency, retry, interval, timeout, buffer, kwargs):
+        """多线程获取多个url，按完成顺序返回(序号, url, NavResult, 页面对象)，结果缓存满时暂停获取"""
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'concurrency',
+                                            ALLOW_VAL='int >= 1', CURR_VAL=concurrency))
+        size = self._pool_size()
+        if size and concurrency > size:  # 不改动session的适配器，以免覆盖连接池、重试等设置，并发数以连接池为上限
+            concurrency = size
+        retry = retry if retry is not None else self.retry_times
+        interval = interval if interval is not None else self.retry_interval
+        kwargs['timeout'] = self._timeout if timeout is None else timeout
+        urls = enumerate(urls)
+        lock = Lock()
+        stop = Event()
+        results = Queue(maxsize=buffer or concurrency)
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=.1)
+                    return
+                except Full:
+                    pass
+
+        def work():
+            while not stop.is_set():
+                with lock:
+                    try:
+                        i, url = next(urls)
+                    except StopIteration:
+                        break
+                    except Exception as e:  # url来源出错时交给调用者处理
+                        put(e)
+                        break
+                url = quote(str(url), safe='-_.~!*\'"();:@&=+$,/\\?#[]%')
+                err = None
+                try:
+                    r = self._make_response(url=url, mode='get', retry=retry, interval=interval, raise_err=True,
+                                            **kwargs)
+                except Exception as e:  # 出错的请求不中断其它请求，异常记录在NavResult中
+                    r, err = None, e
+                nav = make_nav_result(r)
+                nav.error = err
+                put((i, url, nav, self._result_page(url, r, nav)))
+            put(None)
+
+        for _ in range(concurrency):
+            th = Thread(target=work)
+            th.daemon = True
+            th.start()
+
+        done = 0
+        try:
+            while done < concurrency:
+                item = results.get()
+                if item is None:
+                    done += 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
+
+    def _pool_size(self):
+        """session连接池对每个host保持的连接数，适配器不是HTTPAdapter时返回None"""
+        sizes = [a._pool_maxsize for a in (self.session.get_adapter(p) for p in ('http://', 'https://'))
+                 if isinstance(a, HTTPAdapter)]
+        return max(sizes) if sizes else None
+
+    def _result_page(self, url, response, nav_result):
+        """生成保存一个响应的页面对象，与当前页面共用session和headers"""
+        page = SessionPage.__new__(SessionPage)
+        BasePage.__init__(page)
+        page._session_options = self._session_options
+        page._session = self._session
+        page._headers = self._headers
+        page._timeout = self._timeout
+        page._download_path = self._download_path
+        page.retry_times = self.retry_times
+        page.retry_interval = self.retry_interval
+        page._set = None
+        page._encoding = self._encoding
+        page._tree = None
+        page._type = 'SessionPage'
+        page._url = url
+        page._response = response
+        page._nav_result = nav_result
+        page._url_available = nav_result.ok
+        return page
+
+    def _stream_response(self, url, retry=None, interval=None, raise_err=False, **kwargs):
+        """以流式方式发送get请求，只等待响应头，不读取响应体"""
+        kwargs = self._request_kwargs(url, kwargs)
+        kwargs['stream'] = True
+        r = err = None
+        retry = retry if retry is not None else self.retry_times
+        interval = interval if interval is not None else self.retry_interval
+        for i in range(retry + 1):
+            try:
+                r = self.session.get(url, **kwargs)
+                if r.ok:
+                    return r
+                r.close()
+            except Exception as e:
+                err = e
+            if i < retry:
+                sleep(interval)
 
-        h = CaseInsensitiveDict(self._headers)
-        for k, v in kwargs['headers'].items():
-            h[k] = v
-        kwargs['headers'] = h
+        if raise_err:
+            if err:
+                raise err
+            raise (ConnectionError(_S._lang.joinn(_S._lang.STATUS_CODE_, r.status_code)) if r is not None
+                   else ConnectionError(_S._lang.joinn(_S._lang.CONNECT_ERR)))
+        return None
 
+    def _make_response(self, url, mode='get', retry=None, interval=None, raise_err=False, **kwargs):
+        kwargs = self._request_kwargs(url, kwargs)
         r = err = None
         retry = retry if retry is not None else self.retry_times
         interval = interval if interval is not None else self.retry_interval
@@ -251,6 +383,46 @@ class SessionPage(BasePage):
             else:
                 return None
 
+    def _request_kwargs(self, url, kwargs):
+        """处理请求参数，合并headers并设置Referer和Host"""
+        kwargs = CaseInsensitiveDict(kwargs)
+        if 'headers' in kwargs:
+            kwargs['headers'] = CaseInsensitiveDict(format_headers(kwargs['headers']))
+        else:
+            kwargs['headers'] = CaseInsensitiveDict()
+
+        # 设置referer和host值
+        parsed_url = urlparse(url)
+        hostname = parsed_url.netloc
+        scheme = parsed_url.scheme
+        if not check_headers(kwargs['headers'], self._headers, 'Referer'):
+            kwargs['headers']['Referer'] = self.url if self.url else f'{scheme}://{hostname}'
+        elif not kwargs['headers']['Referer']:
+            kwargs['headers'].pop('Referer')
+        if not check_headers(kwargs['headers'], self._headers, 'Host'):
+            kwargs['headers']['Host'] = hostname
+        elif not kwargs['headers']['Host']:
+            kwargs['headers'].pop('Host')
+        if not check_headers(kwargs, self._headers, 'timeout'):
+            kwargs['timeout'] = self.timeout
+
+        h = CaseInsensitiveDict(self._headers)
+        for k, v in kwargs['headers'].items():
+            h[k] = v
+        kwargs['headers'] = h
+        return kwargs
+
+
+def make_nav_result(response):
+    nav_result = NavResult()
+    if response is not None:
+        nav_result.status = response.status_code
+        nav_result.url = response.url
+        nav_result.headers = response.headers
+        nav_result.request = response.request
+        nav_result.Response = response
+    return nav_result
+
 
 def check_headers(kwargs, headers, arg):
     return arg in kwargs or arg in headers
@@ -6,8 +6,9 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from pathlib import Path
-from typing import Any, Union, Tuple, Optional
+from typing import Any, Union, Tuple, Optional, Iterable, Iterator, List, Generator
 
+from lxml.html import HtmlElement
 from requests import Session, Response
 from requests.structures import CaseInsensitiveDict
 
@@ -29,6 +30,7 @@ class SessionPage(BasePage):
     _timeout: float = ...
     _set: Optional[SessionPageSetter] = ...
     _encoding: Optional[str] = ...
+    _tree: Optional[Tuple[Optional[Response], Optional[str], HtmlElement]] = ...
     _page: SessionPage = ...
 
     def __repr__(self) -> str: ...
@@ -200,6 +202,73 @@ class SessionPage(BasePage):
         """
         ...
 
+    def get_many(self,
+                 urls: Iterable[str],
+                 concurrency: int = 5,
+                 retry: int | None = None,
+                 interval: float | None = None,
+                 timeout: float | None = None,
+                 **kwargs) -> List[Tuple[str, NavResult, SessionPage]]:
+        """用get方式多线程获取多个url，全部完成后按urls的顺序返回结果，出错的请求其异常记录在NavResult的error属性
+        :param urls: 要获取的url
+        :param concurrency: 同时进行的请求数，不超过session连接池大小，可用SessionOptions.set_pool()调大
+        :param retry: 每个请求的重试次数，为None时使用页面对象retry_times属性值
+        :param interval: 重试间隔（秒），为None时使用页面对象retry_interval属性值
+        :param timeout: 连接超时时间，为None使用内置设置
+        :param kwargs: 连接参数，与get()相同
+        :return: (url, NavResult对象, 页面对象)组成的列表，页面对象与当前页面共用session，可直接用于查找元素
+        """
+        ...
+
+    def fetch_iter(self,
+                   urls: Iterable[str],
+                   concurrency: int = 5,
+                   retry: int | None = None,
+                   interval: float | None = None,
+                   timeout: float | None = None,
+                   buffer: int | None = None,
+                   **kwargs) -> Iterator[Tuple[str, NavResult, SessionPage]]:
+        """用get方式多线程获取多个url，按完成顺序逐个返回结果，
+        未被取走的结果达到buffer个时暂停发送新请求，停止迭代后不再发送新请求，出错的请求其异常记录在NavResult的error属性
+        :param urls: 要获取的url，可以是生成器，会按需读取
+        :param concurrency: 同时进行的请求数，不超过session连接池大小，可用SessionOptions.set_pool()调大
+        :param retry: 每个请求的重试次数，为None时使用页面对象retry_times属性值
+        :param interval: 重试间隔（秒），为None时使用页面对象retry_interval属性值
+        :param timeout: 连接超时时间，为None使用内置设置
+        :param buffer: 最多缓存多少个未取走的结果，为None时与concurrency相同
+        :param kwargs: 连接参数，与get()相同
+        :return: 生成(url, NavResult对象, 页面对象)的迭代器，页面对象与当前页面共用session，可直接用于查找元素
+        """
+        ...
+
+    def iter_eles(self,
+                  url: str,
+                  locator: Union[Tuple[str, str], str],
+                  retry: int | None = None,
+                  interval: float | None = None,
+                  timeout: float | None = None,
+                  raise_err: bool = False,
+                  xml: bool | None = None,
+                  chunk_size: int = 65536,
+                  **kwargs) -> Iterator[SessionElement]:
+        """用get方式以流式获取url，边下载边解析，逐个返回匹配的元素，适用于大型xml或html文件
+        已返回的元素在取下一个元素时会被清空，需要的数据应在此之前读取；
+        定位符在已解析的部分上执行，依赖位置、后续内容或已被释放的前面兄弟节点的条件可能不准确；
+        不匹配的元素结束后即释放，定位符无法得出标签名（如只按属性或文本查找）时只释放顶层元素，大文件中效率较低；
+        xml文件的命名空间会被去掉，定位符中无需写前缀
+        :param url: 目标url
+        :param locator: 定位符或定位元组，不支持ax定位
+        :param retry: 重试次数，为None时使用页面对象retry_times属性值
+        :param interval: 重试间隔（秒），为None时使用页面对象retry_interval属性值
+        :param timeout: 连接超时时间，为None使用内置设置
+        :param raise_err: 连接失败时是否抛出异常，为False时不返回任何元素
+        :param xml: 是否按xml解析，为None时根据content-type和url后缀判断
+        :param chunk_size: 每次读取的字节数
+        :param kwargs: 连接参数，与get()相同
+        :return: 生成SessionElement的迭代器，元素的owner是保存该响应的页面对象
+        """
+        ...
+
     def ele(self,
             locator: Union[Tuple[str, str], str, SessionElement],
             index: int = 1,
@@ -286,6 +355,71 @@ class SessionPage(BasePage):
         """
         ...
 
+    def _s_tree(self) -> HtmlElement:
+        """获取当前响应解析后的lxml树，同一响应和编码只解析一次，get()、post()和设置编码后重新解析
+        :return: lxml树的根元素
+        """
+        ...
+
+    def _fetch_iter(self,
+                    urls: Iterable[str],
+                    concurrency: int,
+                    retry: Optional[int],
+                    interval: Optional[float],
+                    timeout: Optional[float],
+                    buffer: Optional[int],
+                    kwargs: dict) -> Generator[Tuple[int, str, NavResult, SessionPage], None, None]:
+        """多线程获取多个url，按完成顺序返回(序号, url, NavResult, 页面对象)，结果缓存满时暂停获取
+        :param urls: 要获取的url
+        :param concurrency: 同时进行的请求数
+        :param retry: 重试次数
+        :param interval: 重试间隔（秒）
+        :param timeout: 连接超时时间
+        :param buffer: 最多缓存多少个未取走的结果
+        :param kwargs: 连接参数
+        :return: 生成器
+        """
+        ...
+
+    def _pool_size(self) -> Optional[int]:
+        """session连接池对每个host保持的连接数
+        :return: 连接数，适配器不是HTTPAdapter时返回None
+        """
+        ...
+
+    def _result_page(self, url: str, response: Optional[Response], nav_result: NavResult) -> SessionPage:
+        """生成保存一个响应的页面对象，与当前页面共用session和headers
+        :param url: 请求的url
+        :param response: Response对象
+        :param nav_result: NavResult对象
+        :return: 页面对象
+        """
+        ...
+
+    def _stream_response(self,
+                         url: str,
+                         retry: int = None,
+                         interval: float = None,
+                         raise_err: bool = False,
+                         **kwargs) -> Optional[Response]:
+        """以流式方式发送get请求，只等待响应头，不读取响应体
+        :param url: 目标url
+        :param retry: 重试次数
+        :param interval: 重试间隔（秒）
+        :param raise_err: 是否抛出异常
+        :param kwargs: 其它参数
+        :return: 成功时返回Response对象，失败且不抛出异常时返回None
+        """
+        ...
+
+    def _request_kwargs(self, url: str, kwargs: dict) -> CaseInsensitiveDict:
+        """处理连接参数，补全headers中的Referer、Host及timeout
+        :param url: 目标url
+        :param kwargs: 连接参数
+        :return: 处理后的连接参数
+        """
+        ...
+
     def _make_response(self,
                        url: str,
                        mode: str = 'get',
@@ -305,6 +439,14 @@ class SessionPage(BasePage):
         ...
 
 
+def make_nav_result(response: Optional[Response]) -> NavResult:
+    """根据Response对象生成NavResult对象
+    :param response: Response对象，为None时返回空的NavResult
+    :return: NavResult对象
+    """
+    ...
+
+
 def check_headers(kwargs: Union[dict, CaseInsensitiveDict],
                   headers: Union[dict, CaseInsensitiveDict],
                   arg: str) -> bool:
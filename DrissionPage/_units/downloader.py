@@ -8,6 +8,7 @@
 from os.path import sep
 from pathlib import Path
 from shutil import move
+from threading import Condition
 from time import sleep, perf_counter
 
 from DrissionRecord.tools import get_usable_path
@@ -29,6 +30,7 @@ class DownloadManager(object):
         self._missions = {}  # {guid: DownloadMission}
         self._tab_missions = {}  # {tab_id: [DownloadMission, ...]}
         self._flags = {}  # {tab_id: [bool, DownloadMission]}
+        self._flag_cond = Condition()  # flag改变时通知等待者
         self._waiting_tab = set()  # click.to_download()专用
         self._tmp_path = '.'
 
@@ -66,7 +68,9 @@ class DownloadManager(object):
         TabDownloadSettings(tab_id).when_file_exists = mode
 
     def set_flag(self, tab_id, flag):
-        self._flags[tab_id] = flag
+        with self._flag_cond:
+            self._flags[tab_id] = flag
+            self._flag_cond.notify_all()
 
     def get_flag(self, tab_id):
         return self._flags.get(tab_id)
@@ -162,9 +166,9 @@ class DownloadManager(object):
             self._tab_missions.setdefault(tab_id, set()).add(m)
 
         if self.get_flag('browser') is not None:
-            self._flags['browser'] = m
+            self.set_flag('browser', m)
         elif self.get_flag(tab) is not None:
-            self._flags[tab] = m
+            self.set_flag(tab, m)
 
     def _onDownloadProgress(self, **kwargs):
         if kwargs['guid'] in self._missions:
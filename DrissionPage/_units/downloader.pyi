@@ -5,6 +5,7 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from threading import Condition
 from typing import Dict, Optional, Union, Literal, Set
 
 from .._browsers.chromium import Chromium
@@ -18,6 +19,7 @@ class DownloadManager(object):
     _missions: Dict[str, DownloadMission] = ...
     _tab_missions: Dict[str, Set[DownloadMission]] = ...
     _flags: dict = ...
+    _flag_cond: Condition = ...
     _waiting_tab: set = ...
     _running: bool = ...
     _tmp_path: str = ...
@@ -0,0 +1,189 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
+
+from .._base.codec import dumps as _dumps
+from .._functions.settings import Settings as _S
+from ..version import __version__
+
+COLUMNS = ('url', 'method', 'status', 'type', 'mime_type', 'started', 'timing', 'size', 'request_headers',
+           'response_headers', 'error')
+DEFAULT_COLUMNS = ('url', 'method', 'status', 'type', 'started', 'timing', 'size')
+_FORMATS = {'.har': 'har', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+
+def _request(p):
+    return (p._raw_request or {}).get('request') or {}
+
+
+def _response(p):
+    return p._raw_response or {}
+
+
+_GETTERS = {
+    'url': lambda p: _request(p).get('url'),
+    'method': lambda p: _request(p).get('method'),
+    'status': lambda p: _response(p).get('status'),
+    'type': lambda p: p._resource_type,
+    'mime_type': lambda p: _response(p).get('mimeType'),
+    'started': lambda p: (p._raw_request or {}).get('wallTime'),
+    'timing': lambda p: _response(p).get('timing'),
+    'size': lambda p: p._body_size,
+    'request_headers': lambda p: _request(p).get('headers'),
+    'response_headers': lambda p: _response(p).get('headers'),
+    'error': lambda p: (p._raw_fail_info or {}).get('errorText') if p.is_failed else None,
+}
+
+
+class PacketExporter(object):
+    def __init__(self, path, fmt=None, columns=None, batch_size=1000):
+        self.path = Path(path)
+        if fmt is None:
+            fmt = _FORMATS.get(self.path.suffix.lower(), 'jsonl')
+        if fmt not in ('har', 'jsonl', 'parquet'):
+            raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'fmt',
+                                            ALLOW_VAL="'har', 'jsonl', 'parquet'", CURR_VAL=fmt))
+        columns = DEFAULT_COLUMNS if columns is None else tuple(columns)
+        for c in columns:
+            if c not in COLUMNS:
+                raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'columns', ALLOW_VAL=COLUMNS, CURR_VAL=c))
+        self.fmt = fmt
+        self.columns = columns
+        self.count = 0
+        self._batch_size = batch_size
+        self._rows = []
+        self._writer = None
+        self._closed = False
+
+        if fmt == 'parquet':
+            try:
+                import pyarrow  # noqa
+            except ImportError:
+                raise EnvironmentError(_S._lang.joinn(_S._lang.NEED_LIB_, 'pyarrow', TIP='pip install pyarrow'))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None if fmt == 'parquet' else open(self.path, 'wb')
+        if fmt == 'har':  # entries逐条写入，关闭时补全结尾
+            creator = _to_bytes(_dumps({'name': 'DrissionPage', 'version': __version__}))
+            self._file.write(b'{"log":{"version":"1.2","creator":' + creator + b',"entries":[')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def write(self, packet):
+        if isinstance(packet, (list, tuple)):
+            for p in packet:
+                self.write(p)
+            return
+        if getattr(packet, 'type', None) != 'DataPacket':  # 只导出http数据包
+            return
+
+        row = {c: _GETTERS[c](packet) for c in self.columns}
+        if self.fmt == 'jsonl':
+            self._file.write(_to_bytes(_dumps(row)) + b'\n')
+        elif self.fmt == 'har':
+            if self.count:
+                self._file.write(b',')
+            self._file.write(_to_bytes(_dumps(_har_entry(row))))
+        else:
+            self._rows.append({k: _dumps_text(v) if isinstance(v, dict) else v for k, v in row.items()})
+            if len(self._rows) >= self._batch_size:
+                self._flush_rows()
+        self.count += 1
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.fmt == 'parquet':
+            self._flush_rows()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        else:
+            if self.fmt == 'har':
+                self._file.write(b']}}')
+            self._file.close()
+            self._file = None
+
+    def _flush_rows(self):
+        """把缓存的行写入parquet文件，首批数据决定表结构"""
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self._writer is None:
+            table = pa.Table.from_pylist(self._rows)
+            self._writer = pq.ParquetWriter(str(self.path), table.schema)
+        else:
+            table = pa.Table.from_pylist(self._rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+
+def _to_bytes(data):
+    """codec的dumps可能返回str或bytes，统一为bytes"""
+    return data if isinstance(data, bytes) else data.encode('utf-8')
+
+
+def _dumps_text(data):
+    """dict数据在parquet中以json文本保存，保证各批次结构一致"""
+    data = _dumps(data)
+    return data.decode('utf-8') if isinstance(data, bytes) else data
+
+
+def _har_entry(row):
+    """把一行数据转换为HAR的entry，未选择的列用HAR规定的默认值填充"""
+    url = row.get('url') or ''
+    started = row.get('started')
+    started = datetime.fromtimestamp(started, timezone.utc).isoformat() if started else ''
+    timings = _har_timings(row.get('timing'))
+    size = row.get('size')
+    return {'startedDateTime': started,
+            'time': sum(v for k, v in timings.items() if v > 0 and k != 'ssl'),  # ssl已包含在connect中
+            'request': {'method': row.get('method') or '', 'url': url, 'httpVersion': '',
+                        'headers': _har_headers(row.get('request_headers')), 'cookies': [],
+                        'queryString': [{'name': k, 'value': v}
+                                        for k, v in parse_qsl(urlparse(url).query, keep_blank_values=True)],
+                        'headersSize': -1, 'bodySize': -1},
+            'response': {'status': row.get('status') or 0, 'statusText': '', 'httpVersion': '',
+                         'headers': _har_headers(row.get('response_headers')), 'cookies': [],
+                         'content': {'size': -1 if size is None else size, 'mimeType': row.get('mime_type') or ''},
+                         'redirectURL': '', 'headersSize': -1, 'bodySize': -1 if size is None else size},
+            'cache': {},
+            'timings': timings,
+            '_resourceType': row.get('type'),
+            '_error': row.get('error')}
+
+
+def _har_headers(headers):
+    """把headers字典转换为HAR的列表格式"""
+    return [{'name': k, 'value': v} for k, v in (headers or {}).items()]
+
+
+def _har_timings(timing):
+    """把CDP的ResourceTiming转换为HAR的timings，单位毫秒，未知的为-1"""
+    if not timing:
+        return {'blocked': -1, 'dns': -1, 'connect': -1, 'ssl': -1, 'send': 0, 'wait': 0, 'receive': 0}
+
+    def span(start, end):
+        s, e = timing.get(start, -1), timing.get(end, -1)
+        return e - s if s >= 0 and e >= 0 else -1
+
+    blocked = timing['dnsStart'] if timing.get('dnsStart', -1) >= 0 else timing.get('sendStart', -1)
+    return {'blocked': blocked, 'dns': span('dnsStart', 'dnsEnd'), 'connect': span('connectStart', 'connectEnd'),
+            'ssl': span('sslStart', 'sslEnd'), 'send': max(span('sendStart', 'sendEnd'), 0),
+            'wait': max(span('sendEnd', 'receiveHeadersEnd'), 0), 'receive': 0}
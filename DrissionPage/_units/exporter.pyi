@@ -0,0 +1,100 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from pathlib import Path
+from typing import Union, Optional, Iterable, Literal, Tuple, List, Any, Dict, Callable, BinaryIO
+
+from .listener import DataPacket, WebSocketPacket, SSEPacket
+
+__COLUMN__ = Literal['url', 'method', 'status', 'type', 'mime_type', 'started', 'timing', 'size', 'request_headers',
+'response_headers', 'error']
+
+COLUMNS: Tuple[str, ...] = ...
+DEFAULT_COLUMNS: Tuple[str, ...] = ...
+_FORMATS: Dict[str, str] = ...
+_GETTERS: Dict[str, Callable[[DataPacket], Any]] = ...
+
+
+def _request(p: DataPacket) -> dict: ...
+
+
+def _response(p: DataPacket) -> dict: ...
+
+
+class PacketExporter(object):
+    path: Path = ...
+    fmt: Literal['har', 'jsonl', 'parquet'] = ...
+    columns: Tuple[__COLUMN__, ...] = ...
+    count: int = ...
+    _batch_size: int = ...
+    _rows: List[dict] = ...
+    _writer: Any = ...
+    _file: Optional[BinaryIO] = ...
+    _closed: bool = ...
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 fmt: Optional[Literal['har', 'jsonl', 'parquet']] = None,
+                 columns: Optional[Iterable[__COLUMN__]] = None,
+                 batch_size: int = 1000):
+        """把数据包逐个写入文件，只保留选定的列，不在内存中积累数据包
+        :param path: 文件路径
+        :param fmt: 文件格式，'har'、'jsonl'或'parquet'（需安装pyarrow），为None时根据后缀判断，默认'jsonl'
+        :param columns: 要保存的列，可选'url'、'method'、'status'、'type'、'mime_type'、'started'、'timing'、'size'、
+                        'request_headers'、'response_headers'、'error'，为None时使用DEFAULT_COLUMNS
+        :param batch_size: parquet格式每批写入的行数
+        """
+        ...
+
+    def __enter__(self) -> PacketExporter: ...
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def closed(self) -> bool:
+        """返回是否已关闭"""
+        ...
+
+    def write(self, packet: Union[DataPacket, WebSocketPacket, SSEPacket, List[DataPacket]]) -> None:
+        """写入数据包，非http数据包会被忽略
+        :param packet: 数据包或其列表
+        :return: None
+        """
+        ...
+
+    def close(self) -> None:
+        """写入剩余数据并关闭文件"""
+        ...
+
+    def _flush_rows(self) -> None:
+        """把缓存的行写入parquet文件，首批数据决定表结构"""
+        ...
+
+
+def _to_bytes(data: Union[str, bytes]) -> bytes:
+    """codec的dumps可能返回str或bytes，统一为bytes"""
+    ...
+
+
+def _dumps_text(data: Any) -> str:
+    """dict数据在parquet中以json文本保存，保证各批次结构一致"""
+    ...
+
+
+def _har_entry(row: dict) -> dict:
+    """把一行数据转换为HAR的entry，未选择的列用HAR规定的默认值填充"""
+    ...
+
+
+def _har_headers(headers: Optional[dict]) -> List[dict]:
+    """把headers字典转换为HAR的列表格式"""
+    ...
+
+
+def _har_timings(timing: Optional[dict]) -> Dict[str, float]:
+    """把CDP的ResourceTiming转换为HAR的timings，单位毫秒，未知的为-1"""
+    ...
@@ -5,18 +5,30 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from base64 import b64decode
+from asyncio import Event as AsyncEvent, wait_for as async_wait_for, TimeoutError as AsyncTimeoutError
+from base64 import b64decode, b64encode
+from collections import deque
 from json import JSONDecodeError, loads
-from queue import Queue
-from re import search
-from time import perf_counter, sleep
+from os.path import basename
+from pathlib import Path
+from queue import Queue, Empty
+from random import randrange
+from re import compile, escape, search, error as RegexError
+from tempfile import TemporaryFile, SpooledTemporaryFile
+from threading import Thread, Condition, Lock
+from time import perf_counter
+from traceback import print_exc
+from urllib.parse import urlparse
 
 from ftfy import fix_text
+from DrissionRecord.tools import get_usable_path, make_valid_name
 from requests.structures import CaseInsensitiveDict
 
+from .exporter import PacketExporter
+from .._base.codec import dumps as _dumps, loads as _loads
 from .._functions.settings import Settings as _S
 from .._functions.tools import wait_until
-from ..errors import WaitTimeoutError
+from ..errors import WaitTimeoutError, PageDisconnectedError
 
 
 class BaseListener(object):
@@ -26,6 +38,7 @@ class BaseListener(object):
 
         self._urls = True
         self._is_regex = False
+        self._url_matcher = None
         self._method = {'GET', 'POST'}
         self._res_type = True
 
@@ -60,56 +73,101 @@ class BaseListener(object):
 
         if is_regex is not None:
             self._is_regex = is_regex
+        self._url_matcher = _compile_urls(self._urls, self._is_regex)
 
     def resume(self):
         self._init_callback()
         self.listening = True
 
+    def _fetch_patterns(self):
+        """根据监听目标生成Fetch.enable使用的拦截规则"""
+        if self._urls is True or self._is_regex:
+            if self._res_type is True:
+                return [{'requestStage': 'Response'}]
+            return [{'resourceType': m, 'requestStage': 'Response'} for m in self._res_type]
+
+        patterns = []
+        for t in self._urls:
+            if self._res_type is True:
+                patterns.append({'urlPattern': f'*{t}*', 'requestStage': 'Response'})
+            else:
+                base = {'urlPattern': f'*{t}*', 'requestStage': 'Response'}
+                for m in self._res_type:
+                    patterns.append({**base, 'resourceType': m})
+        return patterns
+
 
 class Listener(BaseListener):
     def __init__(self, owner):
         super().__init__(owner)
         self._caught = None
-        self._running_requests = 0
-        self._running_targets = 0
+        self._inflight = set()  # 正在进行的请求id
+        self._inflight_targets = set()
+        self._inflight_changed = [0, 0]  # 上述两个集合最后变化的时间
+        self._idle_cond = Condition()
 
         self._request_ids = None
         self._extra_info_ids = None
         self._ws_info = {}
+        self._body_mode = 'eager'
+        self._max_body_size = 0
+        self._queue_size = 0
+        self._overflow = 'block'
+        self._intercept = False
+        self._fetch_on = False
+        self._stats = {}  # {(host, 资源类型): _StatsBucket}
+        self._ws_channel = None
+        self._ws_urls = {}  # {request_id: (url, initiator)} 所有未关闭的websocket连接
 
         self.tab_id = None
 
-    def start(self, urls=None, is_regex=None):
+    @property
+    def dropped(self):
+        return self._caught.dropped if self._caught is not None else 0
+
+    def start(self, urls=None, is_regex=None, body_mode=None, max_body_size=None, queue_size=None, overflow=None,
+              intercept=None):
+        if intercept is not None and intercept != self._intercept:
+            if self.listening:
+                self.stop()
+            self._intercept = intercept
         if urls is not None and is_regex is None:
             is_regex = False
         if urls or is_regex is not None:
             self.set_urls(urls, is_regex)
+        if body_mode is not None:
+            if body_mode not in ('eager', 'lazy', 'never'):
+                raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'body_mode',
+                                                ALLOW_VAL="'eager', 'lazy', 'never'", CURR_VAL=body_mode))
+            self._body_mode = body_mode
+        if max_body_size is not None:
+            self._max_body_size = max_body_size
+        if overflow is not None:
+            if overflow not in CaptureQueue.OVERFLOW:
+                raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'overflow',
+                                                ALLOW_VAL=str(CaptureQueue.OVERFLOW)[1:-1], CURR_VAL=overflow))
+            self._overflow = overflow
+        if queue_size is not None:
+            self._queue_size = queue_size
         self.clear()
         if not self.listening:
             self.resume()
-            self._owner._enable_domain('Network')
+            if self._intercept:
+                self._enable_fetch()
+            else:
+                self._owner._enable_domain('Network')
 
     def wait(self, count=1, timeout=None, fit_count=True, raise_err=None):
         if not self.listening:
             self.start()
-        success = False
-        if not timeout:
-            while self._owner._messenger_running and self.listening and self._caught.qsize() < count:
-                sleep(.01)
-            success = self._owner._messenger_running
-
-        else:
-            end = perf_counter() + timeout
-            while self._owner._messenger_running and self.listening and perf_counter() < end:
-                if self._caught.qsize() >= count:
-                    success = True
-                    break
-                sleep(.01)
+        end = perf_counter() + timeout if timeout else None
+        q = _wait_caught(lambda: self._caught, count, end,
+                         lambda: self._owner._messenger_running and self.listening)
 
-        if success:
+        if q:
             if count == 1:
-                return self._caught.get_nowait()
-            return [self._caught.get_nowait() for _ in range(count)]
+                return q.get_nowait()
+            return [q.get_nowait() for _ in range(count)]
 
         if fit_count or not self._caught.qsize():
             if raise_err is True or (_S.raise_when_wait_failed is True and raise_err is None):
@@ -120,103 +178,66 @@ class Listener(BaseListener):
             return [self._caught.get_nowait() for _ in range(self._caught.qsize())]
 
     def browser_wait(self, count=1, timeout=None, fit_count=True, raise_err=None):
-        if not self._owner.browser.listen.listening:
-            self._owner.browser.listen.start()
-        success = False
-
-        if not timeout:
-            while (self._owner.browser.listen.listening and
-                   (self._owner.tab_id not in self._owner.browser.listen._caught or
-                    self._owner.browser.listen._caught[self._owner.tab_id].qsize() < count)):
-                sleep(.01)
-            success = self._owner._messenger_running
+        listen = self._owner.browser.listen
+        if not listen.listening:
+            listen.start()
+        tid = self._owner.tab_id
+        end = perf_counter() + timeout if timeout else None
+        q = _wait_caught(lambda: listen._caught.setdefault(tid, Queue(maxsize=0)), count, end,
+                         lambda: listen.listening)
 
-        else:
-            end = perf_counter() + timeout
-            while self._owner.browser.listen.listening and perf_counter() < end:
-                if (self._owner.tab_id in self._owner.browser.listen._caught and
-                        self._owner.browser.listen._caught[self._owner.tab_id].qsize() >= count):
-                    success = True
-                    break
-                sleep(.01)
-
-        if success:
+        if q:
             if count == 1:
-                return self._owner.browser.listen._caught[self._owner.tab_id].get_nowait()
-            return [self._owner.browser.listen._caught[self._owner.tab_id].get_nowait() for _ in range(count)]
+                return q.get_nowait()
+            return [q.get_nowait() for _ in range(count)]
 
-        if fit_count or not self._owner.browser.listen._caught[self._owner.tab_id].qsize():
+        if fit_count or not listen._caught[tid].qsize():
             if raise_err is True or (_S.raise_when_wait_failed is True and raise_err is None):
                 raise WaitTimeoutError(_S._lang.WAITING_FAILED_, _S._lang.DATA_PACKET, timeout)
             else:
                 return False
         else:
-            return [self._owner.browser.listen._caught[self._owner.tab_id].get_nowait()
-                    for _ in range(self._owner.browser.listen._caught[self._owner.tab_id].qsize())]
+            return [listen._caught[tid].get_nowait() for _ in range(listen._caught[tid].qsize())]
 
     def steps(self, count=None, timeout=None, gap=1):
         if not self.listening:
             self.start()
-        caught = 0
-        if timeout is None:
-            while self._owner._messenger_running and self.listening:
-                if self._caught.qsize() >= gap:
-                    yield self._caught.get_nowait() if gap == 1 else [self._caught.get_nowait() for _ in range(gap)]
-                    if count:
-                        caught += gap
-                        if caught >= count:
-                            return None
-                sleep(.03)
+        return _steps(lambda: self._caught, count, timeout, gap,
+                      lambda: self._owner._messenger_running and self.listening)
 
-        else:
-            end = perf_counter() + timeout
-            while self._owner._messenger_running and self.listening and perf_counter() < end:
-                if self._caught.qsize() >= gap:
-                    yield self._caught.get_nowait() if gap == 1 else [self._caught.get_nowait() for _ in range(gap)]
-                    end = perf_counter() + timeout
-                    if count:
-                        caught += gap
-                        if caught >= count:
-                            return None
-                sleep(.03)
-            return False
+    def export(self, path, count=None, timeout=None, fmt=None, columns=None):
+        with PacketExporter(path, fmt=fmt, columns=columns) as exporter:
+            for packet in self.steps(count=count, timeout=timeout):
+                exporter.write(packet)
+        return str(exporter.path.resolve())
 
     def browser_steps(self, count=None, timeout=None, gap=1):
-        if not self._owner.browser.listen.listening:
-            self._owner.browser.listen.start()
-        caught = 0
-        _caught = self._owner.browser.listen._caught
+        listen = self._owner.browser.listen
+        if not listen.listening:
+            listen.start()
         tid = self._owner.tab_id
-        if timeout is None:
-            while self._owner.browser.listen.listening:
-                if tid in _caught and _caught[tid].qsize() >= gap:
-                    yield _caught[tid].get_nowait() if gap == 1 else [_caught[tid].get_nowait() for _ in range(gap)]
-                    if count:
-                        caught += gap
-                        if caught >= count:
-                            return None
-                sleep(.01)
-
-        else:
-            end = perf_counter() + timeout
-            while self._owner.browser.listen.listening and perf_counter() < end:
-                if tid in _caught and _caught[tid].qsize() >= gap:
-                    yield _caught[tid].get_nowait() if gap == 1 else [_caught[tid].get_nowait() for _ in range(gap)]
-                    end = perf_counter() + timeout
-                    if count:
-                        caught += gap
-                        if caught >= count:
-                            return None
-                sleep(.01)
-            return False
+        return _steps(lambda: listen._caught.setdefault(tid, Queue(maxsize=0)), count, timeout, gap,
+                      lambda: listen.listening)
 
     def stop(self):
         if self.listening:
             self.pause(clear=True)
-        self._owner._disable_domain('Network')
+        if self._fetch_on:
+            self._disable_fetch()
+        else:
+            self._owner._disable_domain('Network')
 
     def pause(self, clear=True):
-        if self.listening:
+        if self.listening and self._fetch_on:
+            self._owner._remove_callback('Fetch.requestPaused', self._request_paused)
+            self.listening = False
+            if self._caught is not None:
+                _notify_caught(self._caught)
+            if self._ws_channel is not None:
+                self._ws_channel._notify()
+            with self._idle_cond:
+                self._idle_cond.notify_all()
+        elif self.listening:
             self._owner._set_callback('Network.requestWillBeSent', None)
             self._owner._set_callback('Network.responseReceived', None)
             self._owner._set_callback('Network.loadingFinished', None)
@@ -231,6 +252,12 @@ class Listener(BaseListener):
             self._owner._set_callback('Network.webSocketClosed', None)
             self._owner._set_callback('Network.eventSourceMessageReceived', None)
             self.listening = False
+            if self._caught is not None:
+                _notify_caught(self._caught)
+            if self._ws_channel is not None:
+                self._ws_channel._notify()
+            with self._idle_cond:
+                self._idle_cond.notify_all()
         if clear:
             self.clear()
 
@@ -238,27 +265,76 @@ class Listener(BaseListener):
         self._request_ids = {}
         self._extra_info_ids = {}
         self._ws_info = {}
-        self._caught = Queue(maxsize=0)
-        self._running_requests = 0
-        self._running_targets = 0
-
-    def wait_silent(self, timeout=None, targets_only=False, limit=0):
+        if self._caught is not None:
+            self._caught.close()
+        self._caught = CaptureQueue(self._owner, self._queue_size, self._overflow)
+        with self._idle_cond:
+            self._inflight = set()
+            self._inflight_targets = set()
+            self._inflight_changed = [perf_counter()] * 2
+            self._idle_cond.notify_all()
+        self._stats = {}
+
+    def ws_channel(self, urls=True, is_regex=False, size=1000):
+        if self._ws_channel is not None:
+            self._ws_channel.close()
+        need_callback = self.listening and not self._fetch_on and not (
+                self._res_type is True or 'WebSocket' in self._res_type)
+        self._ws_channel = WebSocketChannel(self, urls, is_regex, size)
+        if need_callback:
+            self._init_ws_callback()
+        return self._ws_channel
+
+    def summary(self):
+        hosts = {}
+        types = {}
+        requests = 0
+        for (host, res_type), b in list(self._stats.items()):
+            requests += b.count
+            h = hosts.setdefault(host, {'count': 0, 'bytes': 0, 'timed': 0, 'sum': 0, 'min': None, 'max': None,
+                                        'samples': []})
+            h['count'] += b.count
+            h['bytes'] += b.bytes
+            if b.timed:
+                h['timed'] += b.timed
+                h['sum'] += b.time_sum
+                h['min'] = b.time_min if h['min'] is None else min(h['min'], b.time_min)
+                h['max'] = b.time_max if h['max'] is None else max(h['max'], b.time_max)
+                weight = b.timed / len(b.samples)  # 样本已抽样时按其代表的请求数加权
+                h['samples'].extend((t, weight) for t in b.samples)
+            t = types.setdefault(res_type, {'count': 0, 'bytes': 0})
+            t['count'] += b.count
+            t['bytes'] += b.bytes
+
+        for h in hosts.values():
+            samples = sorted(h.pop('samples'))
+            timed, total = h.pop('timed'), h.pop('sum')
+            h['avg'] = round(total / timed, 3) if timed else None
+            h['p50'] = _percentile(samples, 50)
+            h['p95'] = _percentile(samples, 95)
+        return {'requests': requests, 'hosts': hosts, 'types': types}
+
+    def wait_silent(self, timeout=None, targets_only=False, limit=0, idle=0):
         if not self.listening:
             raise RuntimeError(_S._lang.joinn(_S._lang.NOT_LISTENING))
-        if timeout is None:
-            while ((not targets_only and self._running_requests > limit)
-                   or (targets_only and self._running_targets > limit)):
-                sleep(.01)
-            return True
-
-        end_time = perf_counter() + timeout
-        while perf_counter() < end_time:
-            if ((not targets_only and self._running_requests <= limit)
-                    or (targets_only and self._running_targets <= limit)):
-                return True
-            sleep(.01)
-        else:
-            return False
+        if self._intercept:  # 拦截模式只收到命中规则的响应，无法得知进行中的请求
+            raise RuntimeError(_S._lang.joinn(_S._lang.INTERCEPT_UNSUPPORTED_, 'wait_silent()'))
+        end_time = None if timeout is None else perf_counter() + timeout
+        with self._idle_cond:
+            while self.listening:
+                ids = self._inflight_targets if targets_only else self._inflight
+                now = perf_counter()
+                wait = None
+                if len(ids) <= limit:
+                    wait = self._inflight_changed[targets_only] + idle - now  # 连接数变化后重新计时
+                    if wait <= 0:
+                        return True
+                if end_time is not None:
+                    if now >= end_time:
+                        return False
+                    wait = end_time - now if wait is None else min(wait, end_time - now)
+                self._idle_cond.wait(wait)
+        return False
 
     def _to_target(self, target_id, owner):
         self._target_id = target_id
@@ -267,7 +343,30 @@ class Listener(BaseListener):
             self.stop()
             self.start()
 
+    def _enable_fetch(self):
+        """用Fetch域拦截目标请求，只有命中规则的请求会从浏览器发过来"""
+        patterns = self._fetch_patterns()
+        proxy = bool(getattr(self._owner, '_proxy_usr', None))
+        if proxy:  # 代理认证也使用Fetch，保留其请求阶段的拦截
+            patterns.append({'urlPattern': '*'})
+        self._owner._enable_domain('Fetch', patterns=patterns, handleAuthRequests=proxy)
+        if self._owner._enabled.get('Fetch', 0) > 1:  # Fetch已启用时规则不会更新，重新启用一次
+            self._owner._run_cdp('Fetch.enable', patterns=patterns, handleAuthRequests=proxy)
+        self._fetch_on = True
+
+    def _disable_fetch(self):
+        """停止拦截，Fetch仍被其它功能使用时恢复其原来的设置"""
+        self._fetch_on = False
+        self._owner._disable_domain('Fetch')
+        if self._owner._enabled.get('Fetch'):
+            self._owner._run_cdp('Fetch.enable', handleAuthRequests=True, _ignore=True)
+
     def _init_callback(self):
+        if self._intercept:
+            # 须在代理认证的回调放行响应之前获取body，所以排在最前
+            self._owner._remove_callback('Fetch.requestPaused', self._request_paused)
+            self._owner._event_handlers.setdefault('Fetch.requestPaused', []).insert(0, self._request_paused)
+            return
         if self._res_type is True or self._res_type - {'WebSocket'}:
             self._owner._set_callback('Network.requestWillBeSent', self._requestWillBeSent)
             self._owner._set_callback('Network.responseReceived', self._response_received)
@@ -279,18 +378,22 @@ class Listener(BaseListener):
             else:
                 self._owner._set_callback('Network.loadingFinished', self._loading_finished)
                 self._owner._set_callback('Network.loadingFailed', self._loading_failed)
-        if self._res_type is True or 'WebSocket' in self._res_type:
-            self._owner._set_callback('Network.webSocketFrameSent', self._webSocketFrameSent)
-            self._owner._set_callback('Network.webSocketFrameReceived', self._webSocketFrameReceived)
-            self._owner._set_callback('Network.webSocketCreated', self._webSocketCreated)
-            self._owner._set_callback('Network.webSocketHandshakeResponseReceived',
-                                      self._webSocketHandshakeResponseReceived)
-            self._owner._set_callback('Network.webSocketWillSendHandshakeRequest',
-                                      self._webSocketWillSendHandshakeRequest)
-            self._owner._set_callback('Network.webSocketClosed', self._webSocketClosed)
+        if self._res_type is True or 'WebSocket' in self._res_type or self._ws_channel is not None:
+            self._init_ws_callback()
         if self._res_type is True or 'EventSource' in self._res_type:
             self._owner._set_callback('Network.eventSourceMessageReceived', self._eventSourceMessageReceived)
 
+    def _init_ws_callback(self):
+        """设置处理websocket事件的方法"""
+        self._owner._set_callback('Network.webSocketFrameSent', self._webSocketFrameSent)
+        self._owner._set_callback('Network.webSocketFrameReceived', self._webSocketFrameReceived)
+        self._owner._set_callback('Network.webSocketCreated', self._webSocketCreated)
+        self._owner._set_callback('Network.webSocketHandshakeResponseReceived',
+                                  self._webSocketHandshakeResponseReceived)
+        self._owner._set_callback('Network.webSocketWillSendHandshakeRequest',
+                                  self._webSocketWillSendHandshakeRequest)
+        self._owner._set_callback('Network.webSocketClosed', self._webSocketClosed)
+
     def _eventSourceMessageReceived(self, **kwargs):
         i = self._request_ids.get(kwargs['requestId'])
         if self._urls is True or i:
@@ -300,17 +403,21 @@ class Listener(BaseListener):
             self._caught.put(p)
 
     def _webSocketFrameSent(self, **kwargs):
-        i = self._ws_info.get(kwargs['requestId'])
-        if self._urls is True or i:
-            p = WebSocketPacket(self._owner, i.target if i else None, kwargs, True)
-            if i:
-                p._connect_info = i
-            self._caught.put(p)
+        self._ws_frame(kwargs, True)
 
     def _webSocketFrameReceived(self, **kwargs):
+        self._ws_frame(kwargs, False)
+
+    def _ws_frame(self, kwargs, is_sent):
+        """websocket帧优先交给专用通道，否则放入结果队列"""
         i = self._ws_info.get(kwargs['requestId'])
-        if self._urls is True or i:
-            p = WebSocketPacket(self._owner, i.target if i else None, kwargs, False)
+        channel = self._ws_channel
+        if channel is not None and kwargs['requestId'] in channel._connections:
+            p = WebSocketPacket(self._owner, i.target if i else None, kwargs, is_sent)
+            p._connect_info = i or channel._connections[kwargs['requestId']]
+            channel._put(p)
+        elif (self._urls is True or i) and (self._res_type is True or 'WebSocket' in self._res_type):
+            p = WebSocketPacket(self._owner, i.target if i else None, kwargs, is_sent)
             if i:
                 p._connect_info = i
             self._caught.put(p)
@@ -320,9 +427,15 @@ class Listener(BaseListener):
         if target:
             self._ws_info[kwargs['requestId']] = WebSocketConnectInfo(self._owner, target, kwargs['requestId'],
                                                                       kwargs['url'], kwargs.get('initiator'))
+        self._ws_urls[kwargs['requestId']] = (kwargs['url'], kwargs.get('initiator'))
+        if self._ws_channel is not None:
+            self._ws_channel._add(kwargs['requestId'], kwargs['url'], kwargs.get('initiator'))
 
     def _webSocketClosed(self, **kwargs):
         self._ws_info.pop(kwargs['requestId'], None)
+        self._ws_urls.pop(kwargs['requestId'], None)
+        if self._ws_channel is not None:
+            self._ws_channel._connections.pop(kwargs['requestId'], None)
 
     def _webSocketHandshakeResponseReceived(self, **kwargs):
         i = self._ws_info.get(kwargs['requestId'])
@@ -335,21 +448,22 @@ class Listener(BaseListener):
             i.request = kwargs
 
     def _requestWillBeSent(self, **kwargs):
-        self._running_requests += 1
         p = False
         target = in_targets(self, kwargs['request']['url'], kwargs['request']['method'], kwargs.get('type', ''))
+        self._request_started(kwargs['requestId'], target)
         if target:
-            self._running_targets += 1
             rid = kwargs['requestId']
             p = self._request_ids.setdefault(rid, DataPacket(self._owner, target))
             p._raw_request = kwargs
             if kwargs['request'].get('hasPostData') and not kwargs['request'].get('postDataEntries'):
-                p._raw_post_data = self._owner._run_cdp('Network.getRequestPostData',
-                                                        requestId=rid, _ignore=True).get('postData')
+                if self._body_mode == 'eager':
+                    p._raw_post_data = self._owner._run_cdp('Network.getRequestPostData',
+                                                            requestId=rid, _ignore=True).get('postData')
+                elif self._body_mode == 'lazy':
+                    p._lazy_post_data = True
         self._extra_info_ids.setdefault(kwargs['requestId'], {})['obj'] = p
 
     def _requestWillBeSentExtraInfo(self, **kwargs):
-        self._running_requests += 1
         self._extra_info_ids.setdefault(kwargs['requestId'], {})['request'] = kwargs
 
     def _response_received(self, **kwargs):
@@ -360,7 +474,6 @@ class Listener(BaseListener):
             request.timestamp = kwargs['timestamp']
 
     def _responseReceivedExtraInfo(self, **kwargs):
-        self._running_requests -= 1
         r = self._extra_info_ids.get(kwargs['requestId'])
         if r:
             obj = r.get('obj')
@@ -374,22 +487,25 @@ class Listener(BaseListener):
                 r['response'] = kwargs
 
     def _loading_finished_sse(self, **kwargs):
-        self._running_requests -= 1
         rid = kwargs['requestId']
+        self._request_ended(rid)
         packet = self._request_ids.get(rid)
         if packet:
-            r = self._owner._run_cdp('Network.getResponseBody', requestId=rid, _ignore=True)
-            if 'body' in r:
-                packet._raw_body = r['body']
-                packet._base64_body = r['base64Encoded']
-            else:
+            packet._body_size = kwargs.get('encodedDataLength')
+            packet._finished_time = kwargs.get('timestamp')
+            if self._body_mode == 'never' or (self._max_body_size and packet._body_size
+                                              and packet._body_size > self._max_body_size):
                 packet._raw_body = ''
                 packet._base64_body = False
-
-            if (packet._raw_request['request'].get('hasPostData')
-                    and not packet._raw_request['request'].get('postDataEntries')):
-                r = self._owner._run_cdp('Network.getRequestPostData', requestId=rid, _timeout=1, _ignore=True)
-                packet._raw_post_data = r.get('postData')
+                packet._body_skipped = True
+            elif self._body_mode == 'lazy':
+                packet._lazy_body = True
+            else:
+                packet._fetch_body()
+                if (packet._raw_request['request'].get('hasPostData')
+                        and not packet._raw_request['request'].get('postDataEntries')):
+                    r = self._owner._run_cdp('Network.getRequestPostData', requestId=rid, _timeout=1, _ignore=True)
+                    packet._raw_post_data = r.get('postData')
 
         r = self._extra_info_ids.get(kwargs['requestId'])
         if r:
@@ -408,16 +524,17 @@ class Listener(BaseListener):
     def _loading_finished(self, **kwargs):
         packet = self._loading_finished_sse(**kwargs)
         if packet:
+            self._record_stats(packet)
             self._caught.put(packet)
-            self._running_targets -= 1
 
     def _loading_failed_sse(self, **kwargs):
-        self._running_requests -= 1
         r_id = kwargs['requestId']
+        self._request_ended(r_id)
         packet = self._request_ids.get(r_id)
         if packet:
             packet._raw_fail_info = kwargs
             packet._resource_type = kwargs['type']
+            packet._finished_time = kwargs.get('timestamp')
             packet.is_failed = True
 
         r = self._extra_info_ids.get(kwargs['requestId'])
@@ -437,9 +554,108 @@ class Listener(BaseListener):
 
     def _loading_failed(self, **kwargs):
         packet = self._loading_failed_sse(**kwargs)
+        if packet:
+            self._record_stats(packet)
+            self._caught.put(packet)
+
+    def _request_started(self, request_id, is_target):
+        """记录开始的请求，重定向时id不变，不会重复计数"""
+        with self._idle_cond:
+            now = perf_counter()
+            if request_id not in self._inflight:
+                self._inflight.add(request_id)
+                self._inflight_changed[0] = now
+            if is_target and request_id not in self._inflight_targets:
+                self._inflight_targets.add(request_id)
+                self._inflight_changed[1] = now
+            self._idle_cond.notify_all()
+
+    def _request_ended(self, request_id):
+        """移除结束的请求并通知等待者"""
+        with self._idle_cond:
+            now = perf_counter()
+            if request_id in self._inflight:
+                self._inflight.discard(request_id)
+                self._inflight_changed[0] = now
+            if request_id in self._inflight_targets:
+                self._inflight_targets.discard(request_id)
+                self._inflight_changed[1] = now
+            self._idle_cond.notify_all()
+
+    def _record_stats(self, packet):
+        """把数据包计入所属host和资源类型的累计统计，不保留数据包本身"""
+        key = (packet.timing.host or '', packet._resource_type)
+        bucket = self._stats.get(key)
+        if bucket is None:
+            bucket = self._stats[key] = _StatsBucket()
+        bucket.add(packet.timing.total, packet._body_size)
+
+    def _request_paused(self, **kwargs):
+        if 'responseStatusCode' not in kwargs and 'responseErrorReason' not in kwargs:
+            return  # 请求阶段的拦截属于代理认证
+        rid = kwargs['requestId']
+        request = kwargs['request']
+        target = in_targets(self, request['url'], request['method'], kwargs['resourceType'])
+        packet = None
+        if target:
+            packet = DataPacket(self._owner, target)
+            packet._raw_request = {'requestId': kwargs.get('networkId', rid), 'request': request,
+                                   'frameId': kwargs.get('frameId'), 'type': kwargs['resourceType']}
+            packet._raw_post_data = request.get('postData')
+            packet._resource_type = kwargs['resourceType']
+            packet._intercepted = True
+            if 'responseErrorReason' in kwargs:
+                packet.is_failed = True
+                packet._raw_fail_info = {'requestId': rid, 'type': kwargs['resourceType'],
+                                         'errorText': kwargs['responseErrorReason']}
+            else:
+                headers = {h['name']: h['value'] for h in kwargs.get('responseHeaders', ())}
+                packet._raw_response = {'url': request['url'], 'status': kwargs['responseStatusCode'],
+                                        'statusText': kwargs.get('responseStatusText', ''), 'headers': headers}
+                size = CaseInsensitiveDict(headers).get('content-length')
+                packet._body_size = int(size) if size and size.isdigit() else None
+                if self._body_mode == 'never' or (self._max_body_size and packet._body_size
+                                                  and packet._body_size > self._max_body_size):
+                    packet._raw_body = ''
+                    packet._body_skipped = True
+                else:  # 响应放行后无法再从Fetch获取，lazy模式也在此时获取
+                    stream = None
+                    if packet._body_size is None or packet._body_size > _SPOOL_SIZE:
+                        stream = self._owner._run_cdp('Fetch.takeResponseBodyAsStream', requestId=rid,
+                                                      _ignore=True).get('stream')
+                    if stream:
+                        self._spool_body(packet, rid, stream, kwargs)
+                        self._caught.put(packet)
+                        return
+                    r = self._owner._run_cdp('Fetch.getResponseBody', requestId=rid, _ignore=True)
+                    packet._raw_body = r.get('body', '')
+                    packet._base64_body = r.get('base64Encoded', False)
+
+        self._owner._run_cdp('Fetch.continueResponse', requestId=rid, _ignore=True, _timeout=0)
         if packet:
             self._caught.put(packet)
-            self._running_targets -= 1
+
+
+    def _spool_body(self, packet, rid, stream, kwargs):
+        """把较大或长度未知的body分块读入临时文件，读取后响应无法原样放行，用读到的body完成请求"""
+        f, is_base64 = _spool_stream(self._owner, stream)
+        packet._body_size = f.tell()
+        if self._max_body_size and packet._body_size > self._max_body_size:
+            packet._raw_body = ''
+            packet._body_skipped = True
+        else:
+            packet._body_file = f
+            packet._base64_body = is_base64
+
+        # 流中的body已解压，去掉描述原始编码和长度的响应头
+        headers = [h for h in kwargs.get('responseHeaders', ())
+                   if h['name'].lower() not in ('content-encoding', 'content-length')]
+        args = {'responsePhrase': kwargs['responseStatusText']} if kwargs.get('responseStatusText') else {}
+        self._owner._run_cdp('Fetch.fulfillRequest', requestId=rid, responseCode=kwargs['responseStatusCode'],
+                             responseHeaders=headers, body=_read_body_file(f, True), _ignore=True, _timeout=0,
+                             **args)
+        if packet._body_skipped:
+            f.close()
 
 
 class BrowserListener(BaseListener):
@@ -447,8 +663,20 @@ class BrowserListener(BaseListener):
         super().__init__(owner)
         self._caught = {}
         self._request_ids = {}
-
-    def start(self, urls=None, is_regex=None):
+        self._body_mode = 'eager'
+        self._network_on = False
+        self._network_tabs = {}  # {session_id: 标签页对象}，尚未创建对象的为None
+        self._paused = Queue()
+        self._paused_lock = Lock()
+        self._paused_count = 0  # 已交给工作线程但未放入队列的数据包数
+        self._worker = None
+
+    def start(self, urls=None, is_regex=None, body_mode=None):
+        if body_mode is not None:
+            if body_mode not in ('eager', 'lazy', 'never'):
+                raise ValueError(_S._lang.joinn(_S._lang.INCORRECT_VAL_, 'body_mode',
+                                                ALLOW_VAL="'eager', 'lazy', 'never'", CURR_VAL=body_mode))
+            self._body_mode = body_mode
         if urls is not None and is_regex is None:
             is_regex = False
         if urls or is_regex is not None:
@@ -456,36 +684,21 @@ class BrowserListener(BaseListener):
         self.clear()
         if not self.listening:
             self.resume()
-            if self._urls is True or self._is_regex:
-                if self._res_type is True:
-                    patterns = [{'requestStage': 'Response'}]
-                else:
-                    patterns = []
-                    for m in self._res_type:
-                        patterns.append({'resourceType': m, 'requestStage': 'Response'})
-            else:
-                patterns = []
-                if self._res_type is True:
-                    for t in self._urls:
-                        patterns.append({'urlPattern': f'*{t}*', 'requestStage': 'Response'})
-                else:
-                    for t in self._urls:
-                        p = {'urlPattern': f'*{t}*', 'requestStage': 'Response'}
-                        for m in self._res_type:
-                            p['resourceType'] = m
-                            patterns.append(p)
-
-            self._owner._enable_domain('Fetch', patterns=patterns)
+            self._owner._enable_domain('Fetch', patterns=self._fetch_patterns())
+        self._set_network_tabs(self._body_mode == 'lazy')
 
     def stop(self):
         if self.listening:
             self.pause()
+        self._set_network_tabs(False)
         self._owner._disable_domain('Fetch')
 
     def pause(self, clear=True):
         if self.listening:
             self._owner._set_callback('Fetch.requestPaused', None)
             self.listening = False
+            for q in list(self._caught.values()):
+                _notify_caught(q)
         if clear:
             self.clear()
 
@@ -496,39 +709,459 @@ class BrowserListener(BaseListener):
     def _init_callback(self):
         self._owner._set_callback('Fetch.requestPaused', self._onRequestPaused)
 
+    def _set_network_tabs(self, on):
+        """lazy模式下在已连接的标签页启用Network，以便响应放行后还能获取body，监听期间新连接的标签页也会启用"""
+        if on and not self._network_on:
+            self._network_on = True
+            for sid in list(self._owner._tabs.session_ids):
+                self._tab_attached(sid)
+        elif not on and self._network_on:
+            self._network_on = False
+            tabs, self._network_tabs = self._network_tabs, {}
+            for sid, tab in tabs.items():
+                try:
+                    if tab is None:
+                        self._owner._driver.run('Network.disable', _session_id=sid, _timeout=0)
+                    else:
+                        tab._disable_domain('Network')
+                except PageDisconnectedError:
+                    pass
+
+    def _tab_attached(self, session_id):
+        """有标签页连接或创建对象时调用，lazy模式监听期间在其上启用Network"""
+        if not self._network_on:
+            return
+        tab = self._owner._tabs.get_object(session_id)
+        if tab is not None and not hasattr(tab, '_enable_domain'):
+            return
+        old = self._network_tabs.get(session_id, False)
+        if tab is None and old is False:  # 新标签页还没有对象，直接在其会话上启用
+            self._owner._driver.run('Network.enable', _session_id=session_id)
+        elif tab is not None and old is None:  # 对象接管了已启用的会话，计入其引用计数
+            tab._enabled['Network'] = tab._enabled.get('Network', 0) + 1
+        elif tab is not None and old is False:
+            tab._enable_domain('Network')
+        else:
+            return
+        self._network_tabs[session_id] = tab
+
     def _onRequestPaused(self, **kwargs):
         target = in_targets(self, kwargs['request']['url'], kwargs['request']['method'], kwargs['resourceType'])
-        if not target:
+        if not target or self._body_mode != 'eager':  # 不需在暂停时读取body的立即放行
             self._owner._run_cdp('Fetch.continueResponse', requestId=kwargs['requestId'], _ignore=True, _timeout=0)
+        if not target:
             return
 
         tab_id = self._owner._tabs._frames.get(kwargs['frameId'])
-        while not tab_id:
-            tab_id = self._owner._tabs._frames.get(kwargs['frameId'])
-            print('等待')
-            sleep(.001)
+        with self._paused_lock:
+            if tab_id and self._body_mode != 'eager' and not self._paused_count:
+                self._put_packet(tab_id, target, kwargs)
+                return
+            # 等待frame归属和读取body都在工作线程中按顺序进行，不阻塞事件处理
+            self._paused_count += 1
+            self._paused.put((tab_id, target, kwargs))
+            if self._worker is None:
+                self._worker = Thread(target=self._paused_worker, daemon=True)
+                self._worker.start()
+
+    def _paused_worker(self):
+        """按到达顺序处理暂停的响应，空闲一段时间后退出"""
+        while True:
+            try:
+                job = self._paused.get(timeout=3)
+            except Empty:
+                with self._paused_lock:
+                    if self._paused.empty():
+                        self._worker = None
+                        return
+                continue
+
+            try:
+                self._handle_paused(*job)
+            except Exception:
+                print_exc()
+            finally:
+                with self._paused_lock:
+                    self._paused_count -= 1
+
+    def _handle_paused(self, tab_id, target, kwargs):
+        """确定数据包所属标签页，eager模式下读取body后放行响应"""
+        if self._body_mode == 'eager':
+            body = self._owner._run_cdp('Fetch.getResponseBody', requestId=kwargs['requestId'], _ignore=True)
+            kwargs['body'] = None if 'error' in body else body
+            self._owner._run_cdp('Fetch.continueResponse', requestId=kwargs['requestId'], _ignore=True, _timeout=0)
+        if not tab_id:  # 主frame的id就是标签页id，等不到时以此为准
+            tab_id = self._owner._tabs.wait_frame(kwargs['frameId'], self._owner.timeout) or kwargs['frameId']
+        self._put_packet(tab_id, target, kwargs)
+
+    def _put_packet(self, tab_id, target, kwargs):
+        """生成数据包并放入所属标签页的队列"""
+        packet = BrowserDataPacket(tab_id, target, kwargs)
+        if self._body_mode == 'lazy' and 'responseErrorReason' not in kwargs:
+            packet._lazy_body = lambda: _fetch_tab_body(self._owner, tab_id, kwargs.get('networkId'))
+        self._caught.setdefault(tab_id, Queue(maxsize=0)).put(packet)
 
-        body = self._owner._run_cdp('Fetch.getResponseBody', requestId=kwargs['requestId'], _ignore=True)
-        kwargs['body'] = None if 'error' in body else body
-        self._owner._run_cdp('Fetch.continueResponse', requestId=kwargs['requestId'], _ignore=True, _timeout=0)
-        self._caught.setdefault(tab_id, Queue(maxsize=0)).put(BrowserDataPacket(tab_id, target, kwargs))
+
+class AsyncListener(BaseListener):
+    def __init__(self, owner):
+        super().__init__(owner)
+        self._caught = None
+        self._caught_event = None
+        self._request_ids = None
+
+    async def start(self, urls=None, is_regex=None):
+        if urls is not None and is_regex is None:
+            is_regex = False
+        if urls or is_regex is not None:
+            self.set_urls(urls, is_regex)
+        self.clear()
+        if not self.listening:
+            self.resume()
+            await self._owner._enable_domain('Network')
+
+    async def wait(self, count=1, timeout=None, fit_count=True, raise_err=None):
+        if not self.listening:
+            await self.start()
+        end = perf_counter() + timeout if timeout else None
+        while self.listening and len(self._caught) < count:
+            self._caught_event.clear()
+            wait = None if end is None else end - perf_counter()
+            if wait is not None and wait <= 0:
+                break
+            try:
+                await async_wait_for(self._caught_event.wait(), wait)
+            except AsyncTimeoutError:
+                break
+
+        if len(self._caught) >= count:
+            if count == 1:
+                return self._caught.popleft()
+            return [self._caught.popleft() for _ in range(count)]
+
+        if fit_count or not self._caught:
+            if raise_err is True or (_S.raise_when_wait_failed is True and raise_err is None):
+                raise WaitTimeoutError(_S._lang.WAITING_FAILED_, _S._lang.DATA_PACKET, timeout)
+            else:
+                return False
+        else:
+            return [self._caught.popleft() for _ in range(len(self._caught))]
+
+    async def stop(self):
+        if self.listening:
+            self.pause(clear=True)
+        await self._owner._disable_domain('Network')
+
+    def pause(self, clear=True):
+        if self.listening:
+            self._owner._set_callback('Network.requestWillBeSent', None)
+            self._owner._set_callback('Network.responseReceived', None)
+            self._owner._set_callback('Network.loadingFinished', None)
+            self._owner._set_callback('Network.loadingFailed', None)
+            self.listening = False
+            if self._caught_event is not None:
+                self._caught_event.set()
+        if clear:
+            self.clear()
+
+    def clear(self):
+        self._request_ids = {}
+        self._caught = deque()
+        if self._caught_event is None:
+            self._caught_event = AsyncEvent()
+
+    def _init_callback(self):
+        self._owner._set_callback('Network.requestWillBeSent', self._requestWillBeSent)
+        self._owner._set_callback('Network.responseReceived', self._response_received)
+        self._owner._set_callback('Network.loadingFinished', self._loading_finished)
+        self._owner._set_callback('Network.loadingFailed', self._loading_failed)
+
+    def _requestWillBeSent(self, **kwargs):
+        target = in_targets(self, kwargs['request']['url'], kwargs['request']['method'], kwargs.get('type', ''))
+        if target:
+            p = self._request_ids.setdefault(kwargs['requestId'], DataPacket(self._owner, target))
+            p._raw_request = kwargs
+
+    def _response_received(self, **kwargs):
+        request = self._request_ids.get(kwargs['requestId'])
+        if request:
+            request._raw_response = kwargs['response']
+            request._resource_type = kwargs['type']
+            request.timestamp = kwargs['timestamp']
+
+    async def _loading_finished(self, **kwargs):
+        rid = kwargs['requestId']
+        packet = self._request_ids.pop(rid, None)
+        if not packet:
+            return
+        packet._body_size = kwargs.get('encodedDataLength')
+        packet._finished_time = kwargs.get('timestamp')
+        r = await self._owner._run_cdp('Network.getResponseBody', requestId=rid, _ignore=True)
+        if 'body' in r:
+            packet._raw_body = r['body']
+            packet._base64_body = r['base64Encoded']
+        else:
+            packet._raw_body = ''
+            packet._base64_body = False
+
+        if (packet._raw_request['request'].get('hasPostData')
+                and not packet._raw_request['request'].get('postDataEntries')):
+            r = await self._owner._run_cdp('Network.getRequestPostData', requestId=rid, _timeout=1, _ignore=True)
+            packet._raw_post_data = r.get('postData')
+        self._put(packet)
+
+    def _loading_failed(self, **kwargs):
+        packet = self._request_ids.pop(kwargs['requestId'], None)
+        if packet:
+            packet._raw_fail_info = kwargs
+            packet._resource_type = kwargs['type']
+            packet._finished_time = kwargs.get('timestamp')
+            packet.is_failed = True
+            self._put(packet)
+
+    def _put(self, packet):
+        """把数据包放入结果队列并唤醒等待者
+        :param packet: 数据包对象
+        :return: None
+        """
+        if self.listening:
+            self._caught.append(packet)
+            self._caught_event.set()
+
+
+def _wait_caught(get_queue, count, end, alive):
+    """等待队列中数据包数量达到count，有数据入队时被唤醒
+    :param get_queue: 返回当前队列的方法，队列可能被替换，每次唤醒重新获取
+    :param count: 需要的数量
+    :param end: 结束时间，为None时不限时
+    :param alive: 返回是否继续等待的方法
+    :return: 成功返回队列，否则返回None
+    """
+    while alive():
+        q = get_queue()
+        with q.not_empty:
+            if q._qsize() >= count:
+                return q
+            if end is None:
+                wait = .5
+            else:
+                wait = end - perf_counter()
+                if wait <= 0:
+                    return None
+            q.not_empty.wait(min(wait, .5))  # 定时醒来检查alive()
+    return None
+
+
+def _steps(get_queue, count, timeout, gap, alive):
+    caught = 0
+    end = perf_counter() + timeout if timeout is not None else None
+    while True:
+        q = _wait_caught(get_queue, gap, end, alive)
+        if q is None:
+            return None if timeout is None else False
+        yield q.get_nowait() if gap == 1 else [q.get_nowait() for _ in range(gap)]
+        if timeout is not None:
+            end = perf_counter() + timeout
+        if count:
+            caught += gap
+            if caught >= count:
+                return None
+
+
+def _notify_caught(q):
+    with q.not_empty:
+        q.not_empty.notify_all()
+
+
+class CaptureQueue(Queue):
+    OVERFLOW = ('block', 'drop_oldest', 'drop_newest', 'spill')
+
+    def __init__(self, tab, maxsize=0, overflow='block', block_timeout=1):
+        super().__init__()
+        self.capacity = maxsize
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._tab = tab
+        self._closed = False
+        self._spill_file = None
+        self._spilled = 0
+        self._read_pos = 0
+
+    @property
+    def spilled(self):
+        return self._spilled
+
+    def put(self, item, block=True, timeout=None):
+        with self.not_full:
+            if self.capacity > 0 and self.overflow == 'block':
+                # 在标签页的事件处理中调用，不能无限等待，否则该标签页的其它事件都会停滞
+                end = perf_counter() + self.block_timeout
+                while self._qsize() >= self.capacity and not self._closed:
+                    wait = end - perf_counter()
+                    if wait <= 0:
+                        self.dropped += 1
+                        return
+                    self.not_full.wait(wait)
+            if self._closed:
+                self.dropped += 1
+                return
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def close(self):
+        with self.mutex:
+            self._closed = True
+            self._spilled = 0
+            if self._spill_file:
+                self._spill_file.close()
+                self._spill_file = None
+            self.not_full.notify_all()
+            self.not_empty.notify_all()
+
+    def _qsize(self):
+        return len(self.queue) + self._spilled
+
+    def _put(self, item):
+        if self.capacity <= 0 or (len(self.queue) < self.capacity and not self._spilled):
+            self.queue.append(item)
+        elif self.overflow == 'drop_oldest':
+            self.queue.popleft()
+            self.queue.append(item)
+            self.dropped += 1
+        elif self.overflow == 'spill':
+            self._spill(item)
+        elif self.overflow == 'drop_newest':
+            self.dropped += 1
+        else:
+            self.queue.append(item)
+
+    def _get(self):
+        item = self.queue.popleft()
+        if self._spilled:
+            self._unspill()
+        return item
+
+    def _spill(self, item):
+        """把数据包写入磁盘文件末尾"""
+        if self._spill_file is None:
+            self._spill_file = TemporaryFile()
+        data = _dumps(_dump_packet(item))
+        self._spill_file.seek(0, 2)
+        self._spill_file.write((data if isinstance(data, bytes) else data.encode('utf-8')) + b'\n')
+        self._spilled += 1
+
+    def _unspill(self):
+        """从磁盘文件读回数据包直到内存队列填满，读完后清空文件"""
+        self._spill_file.seek(self._read_pos)
+        while self._spilled and len(self.queue) < self.capacity:
+            self.queue.append(_load_packet(_loads(self._spill_file.readline()), self._tab))
+            self._spilled -= 1
+        self._read_pos = self._spill_file.tell()
+        if not self._spilled:
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._read_pos = 0
 
 
 def in_targets(listener, url, method, res_type):
+    if ((listener._method is not True and method not in listener._method)
+            or (listener._res_type is not True and res_type not in listener._res_type)):
+        return False
     if listener._urls is True:
-        if ((listener._method is True or method in listener._method)
-                and (listener._res_type is True or res_type in listener._res_type)):
-            return True, method, res_type
-    else:
-        for u in listener._urls:
-            if (((listener._is_regex and search(u, url)) or (not listener._is_regex and u in url))
-                    and (listener._method is True or method in listener._method)
-                    and (listener._res_type is True or res_type in listener._res_type)):
-                return u, method, res_type
-    return False
+        return True, method, res_type
+    if listener._url_matcher is None:
+        listener._url_matcher = _compile_urls(listener._urls, listener._is_regex)
+    u = listener._url_matcher(url)
+    return False if u is None else (u, method, res_type)
+
+
+def _compile_urls(urls, is_regex):
+    """把监听目标合并编译为一个正则表达式
+    :param urls: 监听目标，为True时不需要匹配
+    :param is_regex: 目标是否正则表达式
+    :return: 参数为url的匹配方法，返回命中的目标，未命中返回None
+    """
+    if urls is True:
+        return None
+    if not urls:  # 空的目标集合不命中任何url
+        return _match_none
+
+    if not is_regex:  # 普通文本合并成前缀树，命中的文本就是目标本身
+        pattern = compile(_literal_trie(urls))
+
+        def match(url):
+            m = pattern.search(url)
+            return m.group() if m else None
+
+        return match
+
+    groups = {}
+    parts = []
+    num = 1
+    try:
+        for u in urls:
+            if search(r'\\[1-9]', u):  # 有按序号引用的分组，合并后序号会变
+                raise RegexError(u)
+            groups[num] = u
+            parts.append(f'({u})')
+            num += compile(u).groups + 1
+        pattern = compile('|'.join(parts))
+    except RegexError:  # 不能合并时逐个匹配
+        patterns = [(compile(u), u) for u in urls]
+
+        def match(url):
+            for r, u in patterns:
+                if r.search(url):
+                    return u
+            return None
+
+        return match
+
+    def match(url):
+        m = pattern.search(url)
+        return groups[m.lastindex] if m else None
+
+    return match
+
+
+def _match_none(url):
+    """不命中任何url的匹配方法"""
+    return None
+
+
+def _literal_trie(words):
+    """把多个文本合并成前缀树形式的正则表达式
+    :param words: 文本集合
+    :return: 正则表达式文本
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = None
+    return _trie_regex(trie)
+
+
+def _trie_regex(node):
+    """把前缀树的一个节点转换为正则表达式"""
+    alts = [escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ''
+    body = alts[0] if len(alts) == 1 else f'(?:{"|".join(alts)})'
+    return f'(?:{body})?' if '' in node else body
 
 
 class FrameListener(Listener):
+    def _request_paused(self, **kwargs):
+        if not self._owner._is_diff_domain and kwargs.get('frameId') != self._owner._frame_id:
+            if 'responseStatusCode' in kwargs or 'responseErrorReason' in kwargs:
+                self._owner._run_cdp('Fetch.continueResponse', requestId=kwargs['requestId'],
+                                     _ignore=True, _timeout=0)
+            return
+        super()._request_paused(**kwargs)
+
     def _requestWillBeSent(self, **kwargs):
         if not self._owner._is_diff_domain and kwargs.get('frameId') != self._owner._frame_id:
             return
@@ -564,6 +1197,15 @@ class DataPacket(object):
         self._requestExtraInfo = None
         self._responseExtraInfo = None
         self._resource_type = None
+        self._intercepted = False
+        self._body_file = None
+
+        self._body_size = None
+        self._body_skipped = False
+        self._lazy_body = False
+        self._lazy_post_data = False
+        self._finished_time = None
+        self._timing = None
 
     def __repr__(self):
         t = f'"{self.target}"' if self.target is not True else True
@@ -609,13 +1251,59 @@ class DataPacket(object):
     def data(self):
         return self.response.body
 
+    @property
+    def timing(self):
+        if self._timing is None:
+            self._timing = PacketTiming(self)
+        return self._timing
+
     @property
     def fail_info(self):
         if self._fail_info is None:
             self._fail_info = FailInfo(self, self._raw_fail_info)
         return self._fail_info
 
+    def _fetch_body(self):
+        """从浏览器获取响应体，获取不到时为空字符串"""
+        self._lazy_body = False
+        try:
+            r = self.tab._run_cdp('Network.getResponseBody', requestId=self._raw_request['requestId'], _ignore=True)
+        except PageDisconnectedError:
+            r = {}
+        if 'body' in r:
+            self._raw_body = r['body']
+            self._base64_body = r['base64Encoded']
+        else:
+            self._raw_body = ''
+            self._base64_body = False
+
+    def _open_body_stream(self):
+        """让浏览器以当前页面的身份重新加载该资源，返回可用IO.read读取的流句柄，不支持时返回None"""
+        if self.method != 'GET':
+            return None
+        try:
+            r = self.tab._run_cdp('Network.loadNetworkResource', frameId=self.frameId or self.tab._frame_id,
+                                  url=self.url, options={'disableCache': False, 'includeCredentials': True},
+                                  _ignore=True)
+        except PageDisconnectedError:
+            return None
+        resource = r.get('resource', {})
+        return resource.get('stream') if resource.get('success') else None
+
+    def _fetch_post_data(self):
+        """从浏览器获取post数据"""
+        self._lazy_post_data = False
+        try:
+            r = self.tab._run_cdp('Network.getRequestPostData', requestId=self._raw_request['requestId'],
+                                  _timeout=1, _ignore=True)
+            self._raw_post_data = r.get('postData')
+        except PageDisconnectedError:
+            pass
+
     def wait_extra_info(self, timeout=None):
+        if self._intercepted:  # Fetch拦截的数据包没有额外信息
+            raise RuntimeError(_S._lang.joinn(_S._lang.INTERCEPT_UNSUPPORTED_, 'wait_extra_info()'))
+
         def do():
             if not self.tab._messenger_running or not self.tab.listen.listening:
                 return False
@@ -656,6 +1344,9 @@ class Request(object):
     @property
     def postData(self):
         if self._postData is None:
+            if self._raw_post_data is None and self._data_packet._lazy_post_data:
+                self._data_packet._fetch_post_data()
+                self._raw_post_data = self._data_packet._raw_post_data
             if self._raw_post_data:
                 try:
                     self._postData = loads(self._raw_post_data)
@@ -709,11 +1400,18 @@ class Response(object):
 
     @property
     def raw_body(self):
+        if self._raw_body is None and self._data_packet._body_file is not None:
+            self._raw_body = _read_body_file(self._data_packet._body_file, self._data_packet._base64_body)
+            self._is_base64_body = self._data_packet._base64_body
+        elif self._raw_body is None and self._data_packet._lazy_body:
+            self._data_packet._fetch_body()
+            self._raw_body = self._data_packet._raw_body
+            self._is_base64_body = self._data_packet._base64_body
         return self._raw_body
 
     @property
     def body(self):
-        if self._body is None and self._raw_body:
+        if self._body is None and self.raw_body:
             if self._is_base64_body:
                 self._body = b64decode(self._raw_body)
             else:
@@ -730,11 +1428,79 @@ class Response(object):
     def extra_info(self):
         return ResponseExtraInfo(self._data_packet._response_extra_info or {})
 
+    def iter_body(self, chunk_size=65536, reload=False):
+        packet = self._data_packet
+        if not packet._body_skipped and packet._body_file is not None and self._raw_body is None:
+            f = packet._body_file  # intercept模式下较大的body暂存在临时文件中，直接分块读出
+            f.seek(0)
+            chunk = f.read(chunk_size)
+            while chunk:
+                yield chunk
+                chunk = f.read(chunk_size)
+            return
+
+        if not packet._body_skipped:
+            body = self.raw_body  # lazy模式在此时获取捕获到的body
+            if body:
+                yield from _iter_chunks(body, self._is_base64_body, chunk_size)
+                return
+
+        if reload:
+            handle = packet._open_body_stream()
+            if handle:
+                yield from _read_stream(packet.tab, handle, chunk_size)
+
+    def save_body(self, path=None, name=None, chunk_size=65536, rename=True, reload=False):
+        path = Path(path or '.') / make_valid_name(name or basename(self.url.split('?')[0]) or 'body')
+        if rename:
+            path = get_usable_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path = path.resolve()
+        with open(path, 'wb') as f:
+            for chunk in self.iter_body(chunk_size, reload=reload):
+                f.write(chunk)
+        return str(path)
+
     @property
     def timestamp(self):
         return self._timestamp
 
 
+class PacketTiming(object):
+    def __init__(self, data_packet):
+        raw_request = data_packet._raw_request or {}
+        t = (data_packet._raw_response or {}).get('timing') or {}
+        start = raw_request.get('timestamp')
+        end = data_packet._finished_time
+        base = t.get('requestTime')
+
+        self._data_packet = data_packet
+        self.host = urlparse(raw_request.get('request', {}).get('url', '')).hostname
+        self.encoded_size = data_packet._body_size
+        self.total = _ms(start, end)
+        self.dns = _span(t, 'dnsStart', 'dnsEnd')
+        self.connect = _span(t, 'connectStart', 'connectEnd')
+        self.ssl = _span(t, 'sslStart', 'sslEnd')
+        self.send = _span(t, 'sendStart', 'sendEnd')
+        self.wait = _span(t, 'sendEnd', 'receiveHeadersEnd')
+        headers_end = base + t['receiveHeadersEnd'] / 1000 if base and t.get('receiveHeadersEnd', -1) >= 0 else None
+        self.ttfb = _ms(start, headers_end)
+        self.download = _ms(headers_end, end)
+
+    def __repr__(self):
+        return f'<PacketTiming total={self.total} ttfb={self.ttfb} download={self.download}>'
+
+    @property
+    def decoded_size(self):
+        return _decoded_size(self._data_packet)
+
+    @property
+    def as_dict(self):
+        return {'host': self.host, 'encoded_size': self.encoded_size, 'decoded_size': self.decoded_size,
+                'total': self.total, 'dns': self.dns, 'connect': self.connect, 'ssl': self.ssl, 'send': self.send,
+                'wait': self.wait, 'ttfb': self.ttfb, 'download': self.download}
+
+
 class ExtraInfo(object):
     def __init__(self, extra_info):
         self._extra_info = extra_info
@@ -798,6 +1564,10 @@ class WebSocketPacket(object):
     def timestamp(self):
         return self._raw_data['timestamp']
 
+    @property
+    def is_binary(self):
+        return self._raw_data['response']['opcode'] == 2
+
     @property
     def data(self):
         if self._payload is None:
@@ -836,6 +1606,82 @@ class WebSocketPacket(object):
         return False
 
 
+class WebSocketChannel(object):
+    def __init__(self, listener, urls=True, is_regex=False, size=1000):
+        if isinstance(urls, str):
+            urls = {urls}
+        elif urls is not True:
+            urls = set(urls)
+        self.size = size
+        self.dropped = 0
+        self.closed = False
+        self._listener = listener
+        self._match = _compile_urls(urls, is_regex)
+        self._frames = deque(maxlen=size)
+        self._cond = Condition()
+        self._connections = {}  # {request_id: WebSocketConnectInfo}
+        for rid, (url, initiator) in listener._ws_urls.items():  # 已建立的连接
+            self._add(rid, url, initiator)
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __repr__(self):
+        return f'<WebSocketChannel connections={len(self._connections)} frames={len(self._frames)}>'
+
+    @property
+    def connections(self):
+        return [i.url for i in self._connections.values()]
+
+    def get(self, timeout=None):
+        batch = self._take(1, timeout)
+        return batch[0] if batch else None
+
+    def batches(self, size=100, timeout=None):
+        while True:
+            batch = self._take(size, timeout)
+            if not batch:
+                return
+            yield batch
+
+    def drain(self):
+        with self._cond:
+            frames = list(self._frames)
+            self._frames.clear()
+        return frames
+
+    def close(self):
+        self.closed = True
+        if self._listener._ws_channel is self:
+            self._listener._ws_channel = None
+        self._notify()
+
+    def _add(self, request_id, url, initiator=None):
+        """记录url符合条件的连接"""
+        if self._match is None or self._match(url) is not None:
+            self._connections[request_id] = WebSocketConnectInfo(self._listener._owner, True, request_id, url,
+                                                                 initiator)
+
+    def _put(self, packet):
+        """放入一帧，缓冲区满时丢弃最早的帧"""
+        with self._cond:
+            if len(self._frames) == self.size:
+                self.dropped += 1
+            self._frames.append(packet)
+            self._cond.notify_all()
+
+    def _take(self, count, timeout):
+        """等待有帧可取，最多取出count帧，超时、通道关闭或停止监听时返回空列表"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self.closed or not self._listener.listening, timeout)
+            return [self._frames.popleft() for _ in range(min(count, len(self._frames)))]
+
+    def _notify(self):
+        """唤醒等待中的线程"""
+        with self._cond:
+            self._cond.notify_all()
+
+
 class SSEPacket(object):
     type = 'SSEPacket'
     resourceType = 'EventSource'
@@ -958,6 +1804,7 @@ class BrowserDataPacket(object):
         self._request = None
         self._response = None
         self._data = None
+        self._lazy_body = None
 
     def __repr__(self):
         return f'<BrowserDataRacket url={self.url} target={self.target}>'
@@ -983,6 +1830,9 @@ class BrowserDataPacket(object):
     @property
     def response(self):
         if self._response is None:
+            if self._lazy_body:
+                self._raw_data['body'] = self._lazy_body()
+                self._lazy_body = None
             self._response = BrowserResponse(self._raw_data)
         return self._response
 
@@ -1061,6 +1911,141 @@ class BrowserResponse(object):
         return self._body
 
 
+def _iter_chunks(body, is_base64, chunk_size):
+    """分段解码内存中的body并按chunk_size分块返回，不生成完整的bytes副本"""
+    seg = max(chunk_size // 3, 1) * 4 if is_base64 else chunk_size
+    buf = b''
+    for i in range(0, len(body), seg):
+        part = body[i:i + seg]
+        buf += b64decode(part) if is_base64 else part.encode('utf-8')
+        while len(buf) >= chunk_size:
+            yield buf[:chunk_size]
+            buf = buf[chunk_size:]
+    if buf:
+        yield buf
+
+
+def _read_stream(tab, handle, chunk_size):
+    """用IO.read分块读取流，读完或中断时关闭流"""
+    for data, _ in _read_stream_parts(tab, handle, chunk_size):
+        yield data
+
+
+def _read_stream_parts(tab, handle, chunk_size):
+    """用IO.read分块读取流，每块返回(bytes, 是否base64传输)，读完或中断时关闭流"""
+    try:
+        while True:
+            r = tab._run_cdp('IO.read', handle=handle, size=chunk_size, _ignore=True)
+            if 'error' in r:
+                break
+            if r.get('data'):
+                is_base64 = r.get('base64Encoded', False)
+                yield b64decode(r['data']) if is_base64 else r['data'].encode('utf-8'), is_base64
+            if r.get('eof', True):
+                break
+    finally:
+        try:
+            tab._run_cdp('IO.close', handle=handle, _ignore=True)
+        except PageDisconnectedError:
+            pass
+
+
+def _spool_stream(tab, handle):
+    """把流读入临时文件，不超过_SPOOL_SIZE时留在内存中，返回(文件对象, 是否二进制内容)"""
+    f = SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+    binary = False
+    for data, is_base64 in _read_stream_parts(tab, handle, _SPOOL_SIZE):
+        f.write(data)
+        binary = binary or is_base64
+    return f, binary
+
+
+def _read_body_file(f, is_base64):
+    """读出临时文件中的body，按浏览器返回body的格式转为文本或base64文本"""
+    f.seek(0)
+    data = f.read()
+    return b64encode(data).decode('ascii') if is_base64 else data.decode('utf-8')
+
+
+def _ms(start, end):
+    """两个以秒为单位的时间戳之差，转为毫秒，有一个未知时返回None"""
+    return None if start is None or end is None else round((end - start) * 1000, 3)
+
+
+def _span(timing, start, end):
+    """ResourceTiming中两个阶段的间隔毫秒数，未经历该阶段时返回None"""
+    s, e = timing.get(start, -1), timing.get(end, -1)
+    return round(e - s, 3) if s >= 0 and e >= 0 else None
+
+
+def _decoded_size(packet):
+    """已获取的响应体解码后的字节数，未获取时返回None"""
+    body = packet._raw_body
+    if body is None or packet._body_skipped:
+        return None
+    if packet._base64_body:
+        return len(body) * 3 // 4 - body[-2:].count('=')
+    return len(body.encode('utf-8'))
+
+
+class _StatsBucket(object):
+    """一组请求的累计统计，耗时只保留固定数量的随机样本用于估算百分位数"""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.timed = 0  # 有耗时数据的请求数
+        self.time_sum = 0
+        self.time_min = None
+        self.time_max = None
+        self.samples = []
+
+    def add(self, total, size):
+        """计入一个请求，样本满后用蓄水池抽样替换"""
+        self.count += 1
+        self.bytes += size or 0
+        if total is None:
+            return
+        self.timed += 1
+        self.time_sum += total
+        self.time_min = total if self.time_min is None else min(self.time_min, total)
+        self.time_max = total if self.time_max is None else max(self.time_max, total)
+        if len(self.samples) < _STATS_SAMPLES:
+            self.samples.append(total)
+        else:
+            i = randrange(self.timed)
+            if i < _STATS_SAMPLES:
+                self.samples[i] = total
+
+
+def _percentile(samples, p):
+    """用最近秩法计算已排序的(值, 权重)样本的百分位数，权重都为1时与逐个计算的结果相同"""
+    if not samples:
+        return None
+    rank = sum(w for _, w in samples) * p / 100
+    acc = 0
+    for value, weight in samples:
+        acc += weight
+        if acc >= rank:
+            return value
+    return samples[-1][0]
+
+
+def _fetch_tab_body(browser, tab_id, network_id):
+    """从数据包所属标签页获取已放行响应的body，标签页未启用Network或已断开时返回None"""
+    for sid in list(browser._tabs.get_session_ids(tab_id)):
+        tab = browser._tabs.get_object(sid)
+        if tab is None or not network_id:
+            continue
+        try:
+            r = tab._run_cdp('Network.getResponseBody', requestId=network_id, _ignore=True)
+        except PageDisconnectedError:
+            continue
+        if 'error' not in r:
+            return r
+    return None
+
+
 def sse2list(raw):
     body = []
     for data in raw.split('\n\n'):
@@ -1075,3 +2060,42 @@ def sse2list(raw):
                 row[name] = value.strip()
         body.append(row)
     return body
+
+
+_STATS_SAMPLES = 1024  # 每个host和资源类型保留的耗时样本数
+_SPOOL_SIZE = 1048576  # intercept模式下超过此大小或长度未知的body用流读取，暂存在内存中的上限
+_SPILL_SKIP = ('tab', '_request', '_response', '_fail_info', '_connect_info', '_payload', '_timing')
+_SPILL_TYPES = {c.__name__: c for c in (DataPacket, WebSocketPacket, SSEPacket, WebSocketConnectInfo)}
+
+
+def _dump_packet(packet):
+    """把数据包转换为可序列化的dict，缓存的对象不保存
+    :param packet: 数据包对象
+    :return: dict
+    """
+    data = {k: None if k in _SPILL_SKIP else v for k, v in vars(packet).items()}
+    data['__class__'] = type(packet).__name__
+    if data.get('_body_file') is not None:  # 临时文件无法序列化，body随数据包一起写入
+        data['_raw_body'] = _read_body_file(data['_body_file'], packet._base64_body)
+        data['_body_file'] = None
+    info = getattr(packet, '_connect_info', None)
+    if info is not None:
+        data['_connect_info'] = _dump_packet(info)
+    return data
+
+
+def _load_packet(data, tab):
+    """从dict还原数据包对象
+    :param data: _dump_packet()生成的dict
+    :param tab: 数据包所属页面对象
+    :return: 数据包对象
+    """
+    cls = _SPILL_TYPES[data.pop('__class__')]
+    packet = cls.__new__(cls)
+    packet.__dict__.update(data)
+    packet.tab = tab
+    if isinstance(packet.target, list):
+        packet.target = tuple(packet.target)
+    if isinstance(data.get('_connect_info'), dict):
+        packet._connect_info = _load_packet(data['_connect_info'], tab)
+    return packet
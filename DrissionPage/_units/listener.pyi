@@ -5,15 +5,21 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
+from asyncio import Event as AsyncEvent
+from collections import deque
+from pathlib import Path
+from threading import Condition, Lock, Thread
 from queue import Queue
-from typing import Union, List, Iterable, Optional, Literal, Any, Dict, Tuple
+from typing import Union, List, Iterable, Iterator, Optional, Literal, Any, Dict, Tuple, IO, Callable, Set
 
 from requests.structures import CaseInsensitiveDict
 
 from .._browsers.chromium import Chromium
+from .._pages.async_tab import AsyncChromiumTab
 from .._pages.chromium_base import ChromiumBase
 from .._pages.chromium_frame import ChromiumFrame
 
+__OVERFLOW__ = Literal['block', 'drop_oldest', 'drop_newest', 'spill']
 __RES_TYPE__ = Literal['Document', 'Stylesheet', 'Image', 'Media', 'Font', 'Script', 'TextTrack', 'XHR', 'Fetch',
 'Prefetch', 'EventSource', 'WebSocket', 'Manifest', 'SignedExchange', 'Ping', 'CSPViolationReport', 'Preflight', 'Other']
 
@@ -22,6 +28,7 @@ class BaseListener(object):
     listening: bool = ...
     _urls: Union[str, dict, True, None] = ...
     _is_regex: bool = ...
+    _url_matcher: Optional[Callable[[str], Optional[str]]] = ...
     _method: Union[set, True] = ...
     _res_type: Union[set, True] = ...
     _method_setter: Optional[MethodSetter] = ...
@@ -72,6 +79,10 @@ class BaseListener(object):
         """设置处理动作的方法"""
         ...
 
+    def _fetch_patterns(self) -> List[dict]:
+        """根据监听目标生成Fetch.enable使用的拦截规则"""
+        ...
+
     def stop(self) -> None:
         """停止监听，清空已监听到的列表，释放资源"""
         ...
@@ -90,12 +101,23 @@ class BaseListener(object):
 
 class Listener(BaseListener):
     _owner: ChromiumBase = ...
-    _caught: Optional[Queue] = ...
+    _caught: Optional[CaptureQueue] = ...
     _extra_info_ids: Optional[dict] = ...
-    _running_requests: int = ...
-    _running_targets: int = ...
+    _inflight: Set[str] = ...
+    _inflight_targets: Set[str] = ...
+    _inflight_changed: List[float] = ...
+    _idle_cond: Condition = ...
     _request_ids: Optional[Dict[str, DataPacket]] = ...
     _ws_info: Dict[str, WebSocketConnectInfo] = ...
+    _body_mode: Literal['eager', 'lazy', 'never'] = ...
+    _max_body_size: int = ...
+    _queue_size: int = ...
+    _overflow: __OVERFLOW__ = ...
+    _intercept: bool = ...
+    _fetch_on: bool = ...
+    _stats: Dict[Tuple[str, Optional[str]], _StatsBucket] = ...
+    _ws_channel: Optional[WebSocketChannel] = ...
+    _ws_urls: Dict[str, Tuple[str, Optional[dict]]] = ...
 
     def __init__(self, owner: ChromiumBase):
         """
@@ -103,6 +125,36 @@ class Listener(BaseListener):
         """
         ...
 
+    def start(self,
+              urls: Union[str, list, tuple, set, bool, None] = None,
+              is_regex: Optional[bool] = None,
+              body_mode: Optional[Literal['eager', 'lazy', 'never']] = None,
+              max_body_size: Optional[int] = None,
+              queue_size: Optional[int] = None,
+              overflow: Optional[__OVERFLOW__] = None,
+              intercept: Optional[bool] = None) -> None:
+        """拦截目标请求，每次拦截前清空结果
+        :param urls: 要匹配的数据包url特征，可用list等传入多个，为True时获取所有
+        :param is_regex: 设置的target是否正则表达式，为None时保持原来设置
+        :param body_mode: 获取响应体和post数据的方式，'eager'：收到时立即获取；'lazy'：首次读取时才获取；
+                          'never'：不获取；为None时保持原来设置，默认'eager'
+        :param max_body_size: 超过此字节数的响应体不获取，0表示不限制，为None时保持原来设置
+        :param queue_size: 结果队列在内存中保存的最大数据包数，0表示不限制，为None时保持原来设置
+        :param overflow: 队列满时的处理方式，'block'：等待取出，期间该标签页的其它事件停滞，最多等待1秒后丢弃新到的；
+                         'drop_oldest'：丢弃最早的；'drop_newest'：丢弃新到的；
+                         'spill'：写入临时文件，取出时按顺序读回；为None时保持原来设置，默认'block'
+        :param intercept: 是否用Fetch拦截代替Network监听，浏览器只发送命中规则的请求，适合流量大的页面；
+                          此模式下'lazy'按'eager'处理，超过1MB或长度未知的body用流读入临时文件，不支持websocket和sse，
+                          调用wait_silent()和数据包的wait_extra_info()会报错；为None时保持原来设置
+        :return: None
+        """
+        ...
+
+    @property
+    def dropped(self) -> int:
+        """返回本次监听因队列已满而丢弃的数据包数"""
+        ...
+
     def wait(self,
              count: int = 1,
              timeout: float = None,
@@ -145,6 +197,22 @@ class Listener(BaseListener):
         """
         ...
 
+    def export(self,
+               path: Union[str, Path],
+               count: Optional[int] = None,
+               timeout: Optional[float] = None,
+               fmt: Optional[Literal['har', 'jsonl', 'parquet']] = None,
+               columns: Optional[Iterable[str]] = None) -> str:
+        """把收到的数据包逐个写入文件，不在内存中保留
+        :param path: 文件路径
+        :param count: 需导出的数据包总数，为None表示无限
+        :param timeout: 每个数据包等待时间（秒），为None表示无限
+        :param fmt: 文件格式，'har'、'jsonl'或'parquet'（需安装pyarrow），为None时根据后缀判断
+        :param columns: 要保存的列，详见PacketExporter，为None时使用默认列
+        :return: 文件绝对路径
+        """
+        ...
+
     def browser_steps(self,
                       count: int = None,
                       timeout: float = None,
@@ -157,15 +225,39 @@ class Listener(BaseListener):
         """
         ...
 
+    def ws_channel(self,
+                   urls: Union[str, list, tuple, set, bool] = True,
+                   is_regex: bool = False,
+                   size: int = 1000) -> WebSocketChannel:
+        """创建websocket专用通道，url符合条件的连接的帧存入固定大小的环形缓冲区，不再进入结果队列，
+        已有通道会被关闭
+        :param urls: 要接收的连接的url特征，可用list等传入多个，为True时接收所有连接
+        :param is_regex: urls是否正则表达式
+        :param size: 缓冲区最多保存的帧数，满时丢弃最早的
+        :return: WebSocketChannel对象
+        """
+        ...
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总本次监听已完成的目标请求，按host统计耗时（毫秒）和字节数，按资源类型统计字节数，
+        清空结果时重新统计；intercept模式下不统计；只保存累计值，p50、p95请求多时由固定数量的随机样本估算
+        :return: {'requests': 请求数, 'hosts': {host: {'count', 'bytes', 'min', 'max', 'avg', 'p50', 'p95'}},
+                  'types': {资源类型: {'count', 'bytes'}}}
+        """
+        ...
+
     def wait_silent(self,
                     timeout: float = None,
                     targets_only: bool = False,
-                    limit: int = 0) -> bool:
-        """等待所有请求结束
+                    limit: int = 0,
+                    idle: float = 0) -> bool:
+        """等待所有请求结束，如limit=0、idle=.5相当于networkidle0，limit=2、idle=.5相当于networkidle2；
+        intercept模式下不记录请求，调用时抛出RuntimeError
         :param timeout: 超时时间（秒），为None时无限等待
         :param targets_only: 是否只等待targets指定的请求结束
         :param limit: 剩下多少个连接时视为结束
-        :return: 返回是否等待成功
+        :param idle: 连接数不超过limit的状态需持续多少秒，期间连接数有变化则重新计时
+        :return: 返回是否等待成功，停止监听时返回False
         """
         ...
 
@@ -179,6 +271,50 @@ class Listener(BaseListener):
 
     def _init_callback(self) -> None: ...
 
+    def _enable_fetch(self) -> None:
+        """用Fetch域拦截目标请求，只有命中规则的请求会从浏览器发过来"""
+        ...
+
+    def _disable_fetch(self) -> None:
+        """停止拦截，Fetch仍被其它功能使用时恢复其原来的设置"""
+        ...
+
+    def _request_paused(self, **kwargs) -> None: ...
+
+    def _spool_body(self, packet: DataPacket, rid: str, stream: str, kwargs: dict) -> None:
+        """把较大或长度未知的body分块读入临时文件，读取后响应无法原样放行，用读到的body完成请求
+        :param packet: 数据包对象
+        :param rid: Fetch的请求id
+        :param stream: Fetch.takeResponseBodyAsStream返回的流句柄
+        :param kwargs: Fetch.requestPaused事件的参数
+        :return: None
+        """
+        ...
+
+    def _init_ws_callback(self) -> None:
+        """设置处理websocket事件的方法"""
+        ...
+
+    def _ws_frame(self, kwargs: dict, is_sent: bool) -> None:
+        """websocket帧优先交给专用通道，否则放入结果队列
+        :param kwargs: 帧事件参数
+        :param is_sent: 是否发出的帧
+        :return: None
+        """
+        ...
+
+    def _request_started(self, request_id: str, is_target: Union[bool, tuple]) -> None:
+        """记录开始的请求，重定向时id不变，不会重复计数"""
+        ...
+
+    def _request_ended(self, request_id: str) -> None:
+        """移除结束的请求并通知等待者"""
+        ...
+
+    def _record_stats(self, packet: DataPacket) -> None:
+        """把数据包计入所属host和资源类型的累计统计，不保留数据包本身"""
+        ...
+
     def _eventSourceMessageReceived(self, **kwargs) -> None: ...
 
     def _webSocketFrameSent(self, **kwargs) -> None: ...
@@ -214,13 +350,173 @@ class BrowserListener(BaseListener):
     _owner: Chromium = ...
     _caught: Dict[str, Queue] = ...
     _request_ids: Dict[str, BrowserDataPacket] = ...
+    _body_mode: Literal['eager', 'lazy', 'never'] = ...
+    _network_on: bool = ...
+    _network_tabs: Dict[str, Optional[ChromiumBase]] = ...
+    _paused: Queue = ...
+    _paused_lock: Lock = ...
+    _paused_count: int = ...
+    _worker: Optional[Thread] = ...
 
     def __init__(self, owner: Chromium): ...
 
+    def start(self,
+              urls: Union[str, list, tuple, set, bool, None] = None,
+              is_regex: Optional[bool] = None,
+              body_mode: Optional[Literal['eager', 'lazy', 'never']] = None) -> None:
+        """拦截目标请求，每次拦截前清空结果
+        :param urls: 要匹配的数据包url特征，可用list等传入多个，为True时获取所有
+        :param is_regex: 设置的target是否正则表达式，为None时保持原来设置
+        :param body_mode: 获取响应体的方式，'eager'：响应暂停时获取后再放行；'lazy'：立即放行，首次读取时从标签页获取，
+                          监听期间新打开的标签页也有效；'never'：立即放行，不获取；为None时保持原来设置，默认'eager'
+        :return: None
+        """
+        ...
+
     def _init_callback(self) -> None: ...
 
+    def _set_network_tabs(self, on: bool) -> None:
+        """lazy模式下在已连接的标签页启用Network，以便响应放行后还能获取body，监听期间新连接的标签页也会启用
+        :param on: 启用还是停用
+        :return: None
+        """
+        ...
+
+    def _tab_attached(self, session_id: str) -> None:
+        """有标签页连接或创建对象时调用，lazy模式监听期间在其上启用Network
+        :param session_id: 标签页连接的session id
+        :return: None
+        """
+        ...
+
     def _onRequestPaused(self, **kwargs) -> None: ...
 
+    def _paused_worker(self) -> None:
+        """按到达顺序处理暂停的响应，空闲一段时间后退出
+        :return: None
+        """
+        ...
+
+    def _handle_paused(self, tab_id: Optional[str], target: tuple, kwargs: dict) -> None:
+        """确定数据包所属标签页，eager模式下读取body后放行响应
+        :param tab_id: 已知的标签页id，未知时为None
+        :param target: 命中的监听目标
+        :param kwargs: Fetch.requestPaused事件参数
+        :return: None
+        """
+        ...
+
+    def _put_packet(self, tab_id: str, target: tuple, kwargs: dict) -> None:
+        """生成数据包并放入所属标签页的队列
+        :param tab_id: 标签页id
+        :param target: 命中的监听目标
+        :param kwargs: Fetch.requestPaused事件参数
+        :return: None
+        """
+        ...
+
+
+class AsyncListener(BaseListener):
+    """供AsyncChromiumTab使用的异步监听器，只捕获普通数据包，不等待ExtraInfo"""
+    _owner: AsyncChromiumTab = ...
+    _caught: Optional[deque] = ...
+    _caught_event: Optional[AsyncEvent] = ...
+    _request_ids: Optional[Dict[str, DataPacket]] = ...
+
+    def __init__(self, owner: AsyncChromiumTab):
+        """
+        :param owner: 异步标签页对象
+        """
+        ...
+
+    async def start(self,
+                    urls: Union[str, list, tuple, set, bool, None] = None,
+                    is_regex: Optional[bool] = None) -> None:
+        """开始监听，每次开始前清空结果
+        :param urls: 要匹配的数据包url特征，可用list等传入多个，为True时获取所有
+        :param is_regex: 设置的target是否正则表达式，为None时保持原来设置
+        :return: None
+        """
+        ...
+
+    async def wait(self,
+                   count: int = 1,
+                   timeout: float = None,
+                   fit_count: bool = True,
+                   raise_err: bool = None) -> Union[List[DataPacket], DataPacket, False]:
+        """等待符合要求的数据包到达指定数量，等待期间不占用线程
+        :param count: 需要捕捉的数据包数量
+        :param timeout: 超时时间（秒），为None无限等待
+        :param fit_count: 是否必须满足总数要求，发生超时，为True返回False，为False返回已捕捉到的数据包
+        :param raise_err: 超时时是否抛出错误，为None时根据Settings设置
+        :return: count为1时返回数据包对象，大于1时返回列表，超时且fit_count为True时返回False
+        """
+        ...
+
+    async def stop(self) -> None:
+        """停止监听，清空已监听到的列表，释放资源"""
+        ...
+
+    def _init_callback(self) -> None: ...
+
+    def _requestWillBeSent(self, **kwargs) -> None: ...
+
+    def _response_received(self, **kwargs) -> None: ...
+
+    async def _loading_finished(self, **kwargs) -> None: ...
+
+    def _loading_failed(self, **kwargs) -> None: ...
+
+    def _put(self, packet: DataPacket) -> None: ...
+
+
+class CaptureQueue(Queue):
+    OVERFLOW: Tuple[str, ...] = ...
+    capacity: int = ...
+    overflow: __OVERFLOW__ = ...
+    block_timeout: float = ...
+    dropped: int = ...
+    _tab: ChromiumBase = ...
+    _closed: bool = ...
+    _spill_file: Optional[IO[bytes]] = ...
+    _spilled: int = ...
+    _read_pos: int = ...
+
+    def __init__(self, tab: ChromiumBase, maxsize: int = 0, overflow: __OVERFLOW__ = 'block',
+                 block_timeout: float = 1):
+        """有容量限制的数据包队列
+        :param tab: 数据包所属页面对象，从磁盘读回数据包时使用
+        :param maxsize: 内存中保存的最大数据包数，0表示不限制
+        :param overflow: 队列满时的处理方式
+        :param block_timeout: 'block'方式最多等待的秒数，超时则丢弃新数据包并计入dropped
+        """
+        ...
+
+    @property
+    def spilled(self) -> int:
+        """返回暂存在磁盘上的数据包数"""
+        ...
+
+    def put(self, item: Union[DataPacket, WebSocketPacket, SSEPacket],
+            block: bool = True, timeout: float = None) -> None:
+        """放入数据包，队列满时按overflow设置处理；
+        此方法在标签页的事件线程中调用，'block'方式等待期间该标签页的其它事件（如加载完成）都会停滞，
+        因此最多等待block_timeout秒，之后丢弃新数据包
+        :param item: 数据包对象
+        :param block: 无效，为兼容Queue保留
+        :param timeout: 无效，为兼容Queue保留
+        :return: None
+        """
+        ...
+
+    def close(self) -> None:
+        """关闭队列，唤醒等待中的线程并删除临时文件"""
+        ...
+
+    def _spill(self, item: Union[DataPacket, WebSocketPacket, SSEPacket]) -> None: ...
+
+    def _unspill(self) -> None: ...
+
 
 def in_targets(listener: BaseListener,
                url: str, method: Union[True, str],
@@ -235,6 +531,18 @@ def in_targets(listener: BaseListener,
     ...
 
 
+def _compile_urls(urls: Union[Set[str], bool], is_regex: bool) -> Optional[Callable[[str], Optional[str]]]: ...
+
+
+def _match_none(url: str) -> None: ...
+
+
+def _literal_trie(words: Iterable[str]) -> str: ...
+
+
+def _trie_regex(node: dict) -> str: ...
+
+
 class FrameListener(Listener):
     _owner: ChromiumFrame = ...
     _is_diff: bool = ...
@@ -264,8 +572,16 @@ class DataPacket(object):
     _response: Optional[Response] = ...
     _fail_info: Optional[FailInfo] = ...
     _resource_type: Optional[str] = ...
+    _intercepted: bool = ...
+    _body_file: Optional[IO[bytes]] = ...
     _requestExtraInfo: Optional[dict] = ...
     _responseExtraInfo: Optional[dict] = ...
+    _body_size: Optional[int] = ...
+    _body_skipped: bool = ...
+    _lazy_body: bool = ...
+    _lazy_post_data: bool = ...
+    _finished_time: Optional[float] = ...
+    _timing: Optional[PacketTiming] = ...
 
     def __init__(self, tab: ChromiumBase, target: Union[str, bool]):
         """
@@ -304,13 +620,30 @@ class DataPacket(object):
         """Response数据"""
         ...
 
+    @property
+    def timing(self) -> PacketTiming:
+        """各阶段耗时和传输大小"""
+        ...
+
     @property
     def fail_info(self) -> Optional[FailInfo]:
         """请求失败数据"""
         ...
 
+    def _fetch_body(self) -> None:
+        """从浏览器获取响应体，获取不到时为空字符串"""
+        ...
+
+    def _open_body_stream(self) -> Optional[str]:
+        """让浏览器以当前页面的身份重新加载该资源，返回可用IO.read读取的流句柄，不支持时返回None"""
+        ...
+
+    def _fetch_post_data(self) -> None:
+        """从浏览器获取post数据"""
+        ...
+
     def wait_extra_info(self, timeout: float = None) -> bool:
-        """等待额外的信息加载完成
+        """等待额外的信息加载完成，intercept模式获取的数据包没有额外信息，调用时抛出RuntimeError
         :param timeout: 超时时间（秒），为None使用页面超时设置
         :return: 是否等待成功
         """
@@ -443,7 +776,7 @@ class Response(object):
 
     @property
     def raw_body(self) -> str:
-        """返回未被处理的body文本"""
+        """返回未被处理的body文本，lazy模式下首次读取时从浏览器获取"""
         ...
 
     @property
@@ -461,6 +794,67 @@ class Response(object):
         """时间戳"""
         ...
 
+    def iter_body(self, chunk_size: int = 65536, reload: bool = False) -> Iterator[bytes]:
+        """分块返回捕获到的body的bytes，lazy模式下此时才从浏览器获取，已在内存中的body分段解码；
+        intercept模式下超过1MB或长度未知的body已用流读入临时文件，从文件分块读出；
+        其它情况下整个body仍会先读入内存，占用内存随body大小增长，只有reload为True且未捕获body时不受限；
+        body被跳过或获取不到时，reload为True则GET请求通过浏览器重新加载并用IO.read分块读取，
+        重新加载的是新的请求，内容可能与捕获的不同
+        :param chunk_size: 每块字节数
+        :param reload: body被跳过或获取不到时是否重新加载该资源
+        :return: 生成器
+        """
+        ...
+
+    def save_body(self,
+                  path: Union[str, Path, None] = None,
+                  name: Optional[str] = None,
+                  chunk_size: int = 65536,
+                  rename: bool = True,
+                  reload: bool = False) -> str:
+        """把body分块写入文件，内存占用与iter_body()相同
+        :param path: 保存的文件夹，为None时保存到当前文件夹
+        :param name: 文件名，为None时从url获取
+        :param chunk_size: 每次写入的字节数
+        :param rename: 遇到重名文件时是否自动重命名
+        :param reload: body被跳过或获取不到时是否重新加载该资源
+        :return: 文件绝对路径
+        """
+        ...
+
+
+class PacketTiming(object):
+    _data_packet: DataPacket = ...
+    host: Optional[str] = ...
+    encoded_size: Optional[int] = ...
+    total: Optional[float] = ...
+    dns: Optional[float] = ...
+    connect: Optional[float] = ...
+    ssl: Optional[float] = ...
+    send: Optional[float] = ...
+    wait: Optional[float] = ...
+    ttfb: Optional[float] = ...
+    download: Optional[float] = ...
+
+    def __init__(self, data_packet: DataPacket):
+        """数据包的耗时数据，单位毫秒，未经历或未知的阶段为None
+        total：发出请求到加载结束；dns、connect、ssl、send：各阶段耗时；wait：发送完到收到响应头；
+        ttfb：发出请求到收到响应头；download：收到响应头到加载结束；
+        encoded_size：传输的字节数；decoded_size：解码后响应体字节数
+        :param data_packet: DataPacket对象
+        """
+        ...
+
+    @property
+    def decoded_size(self) -> Optional[int]:
+        """解码后响应体字节数，body未获取时为None"""
+        ...
+
+    @property
+    def as_dict(self) -> Dict[str, Union[str, int, float, None]]:
+        """以dict形式返回所有数据"""
+        ...
+
 
 class ExtraInfo(object):
     _extra_info: dict = ...
@@ -557,6 +951,11 @@ class WebSocketPacket(object):
         """时间戳"""
         ...
 
+    @property
+    def is_binary(self) -> bool:
+        """是否二进制帧"""
+        ...
+
     @property
     def data(self) -> Union[dict, bytes, str]:
         ...
@@ -592,6 +991,78 @@ class WebSocketPacket(object):
         ...
 
 
+class WebSocketChannel(object):
+    size: int = ...
+    dropped: int = ...
+    closed: bool = ...
+    _listener: Listener = ...
+    _match: Optional[Callable[[str], Optional[str]]] = ...
+    _frames: deque = ...
+    _cond: Condition = ...
+    _connections: Dict[str, WebSocketConnectInfo] = ...
+
+    def __init__(self,
+                 listener: Listener,
+                 urls: Union[str, list, tuple, set, bool] = True,
+                 is_regex: bool = False,
+                 size: int = 1000):
+        """websocket专用通道，帧在取出时才解码
+        :param listener: 所属Listener对象
+        :param urls: 要接收的连接的url特征，为True时接收所有连接
+        :param is_regex: urls是否正则表达式
+        :param size: 缓冲区最多保存的帧数
+        """
+        ...
+
+    def __len__(self) -> int:
+        """返回缓冲区中的帧数"""
+        ...
+
+    @property
+    def connections(self) -> List[str]:
+        """返回正在接收的连接的url"""
+        ...
+
+    def get(self, timeout: Optional[float] = None) -> Optional[WebSocketPacket]:
+        """取出一帧
+        :param timeout: 超时时间（秒），为None时一直等待到通道关闭或停止监听
+        :return: 帧对象，没有时返回None
+        """
+        ...
+
+    def batches(self, size: int = 100, timeout: Optional[float] = None) -> Iterable[List[WebSocketPacket]]:
+        """逐批取出帧，每批为已到达的帧，最多size个，超时、通道关闭或停止监听时结束
+        :param size: 每批最多的帧数
+        :param timeout: 每批等待时间（秒），为None时一直等待
+        :return: 生成器
+        """
+        ...
+
+    def drain(self) -> List[WebSocketPacket]:
+        """取出缓冲区中所有帧"""
+        ...
+
+    def close(self) -> None:
+        """关闭通道，之后的帧回到结果队列"""
+        ...
+
+    def _add(self, request_id: str, url: str, initiator: Optional[dict] = None) -> None:
+        """记录url符合条件的连接"""
+        ...
+
+    def _put(self, packet: WebSocketPacket) -> None:
+        """放入一帧，缓冲区满时丢弃最早的帧"""
+        ...
+
+    def _take(self, count: int, timeout: Optional[float]) -> List[WebSocketPacket]:
+        """等待有帧可取，最多取出count帧，超时、通道关闭或停止监听时返回空列表"""
+        ...
+
+    def _notify(self) -> None:
+        """唤醒等待中的线程"""
+        ...
+
+
 class SSEPacket(object):
     type: str = ...
     tab: ChromiumBase = ...
@@ -804,6 +1275,7 @@ class BrowserDataPacket(object):
     _request: Optional[BrowserRequest] = ...
     _response: Optional[BrowserResponse] = ...
     _data: Union[None, str, list, dict] = ...
+    _lazy_body: Optional[Callable[[], Optional[dict]]] = ...
 
     def __init__(self,
                  tab_id: str,
@@ -903,3 +1375,108 @@ class BrowserResponse(object):
     @property
     def body(self) -> Union[str, bytes, list, None, dict]:
         ...
+
+
+def _ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    """两个以秒为单位的时间戳之差，转为毫秒，有一个未知时返回None"""
+    ...
+
+
+def _span(timing: dict, start: str, end: str) -> Optional[float]:
+    """ResourceTiming中两个阶段的间隔毫秒数，未经历该阶段时返回None"""
+    ...
+
+
+def _decoded_size(packet: DataPacket) -> Optional[int]:
+    """已获取的响应体解码后的字节数，未获取时返回None"""
+    ...
+
+
+class _StatsBucket(object):
+    count: int = ...
+    bytes: int = ...
+    timed: int = ...
+    time_sum: float = ...
+    time_min: Optional[float] = ...
+    time_max: Optional[float] = ...
+    samples: List[float] = ...
+
+    def __init__(self): ...
+
+    def add(self, total: Optional[float], size: Optional[int]) -> None:
+        """计入一个请求，样本满后用蓄水池抽样替换
+        :param total: 耗时（毫秒），未知时为None
+        :param size: 字节数，未知时为None
+        :return: None
+        """
+        ...
+
+
+def _percentile(samples: List[Tuple[float, float]], p: int) -> Optional[float]:
+    """用最近秩法计算已排序的(值, 权重)样本的百分位数，权重都为1时与逐个计算的结果相同"""
+    ...
+
+
+def _iter_chunks(body: str, is_base64: bool, chunk_size: int) -> Iterator[bytes]:
+    """分段解码内存中的body并按chunk_size分块返回，不生成完整的bytes副本
+    :param body: 原始body文本
+    :param is_base64: 是否base64编码
+    :param chunk_size: 每块字节数
+    :return: 生成器
+    """
+    ...
+
+
+def _read_stream(tab: ChromiumBase, handle: str, chunk_size: int) -> Iterator[bytes]:
+    """用IO.read分块读取流，读完或中断时关闭流
+    :param tab: 流所在的页面对象
+    :param handle: 流句柄
+    :param chunk_size: 每次读取的字节数
+    :return: 生成器
+    """
+    ...
+
+
+def _read_stream_parts(tab: ChromiumBase, handle: str, chunk_size: int) -> Iterator[Tuple[bytes, bool]]:
+    """用IO.read分块读取流，读完或中断时关闭流
+    :param tab: 流所在的页面对象
+    :param handle: 流句柄
+    :param chunk_size: 每次读取的字节数
+    :return: 生成器，每块返回(bytes, 是否base64传输)
+    """
+    ...
+
+
+def _spool_stream(tab: ChromiumBase, handle: str) -> Tuple[IO[bytes], bool]:
+    """把流读入临时文件，不超过_SPOOL_SIZE时留在内存中
+    :param tab: 流所在的页面对象
+    :param handle: 流句柄
+    :return: (文件对象, 是否二进制内容)
+    """
+    ...
+
+
+def _read_body_file(f: IO[bytes], is_base64: bool) -> str:
+    """读出临时文件中的body，按浏览器返回body的格式转为文本或base64文本
+    :param f: 文件对象
+    :param is_base64: 是否转为base64文本
+    :return: body文本
+    """
+    ...
+
+
+def _fetch_tab_body(browser: Chromium, tab_id: str, network_id: Optional[str]) -> Optional[dict]:
+    """从数据包所属标签页获取已放行响应的body
+    :param browser: 浏览器对象
+    :param tab_id: 标签页id
+    :param network_id: 请求的Network id
+    :return: Network.getResponseBody的结果，标签页未启用Network或已断开时返回None
+    """
+    ...
+
+
+def _dump_packet(packet: Union[DataPacket, WebSocketPacket, SSEPacket, WebSocketConnectInfo]) -> dict: ...
+
+
+def _load_packet(data: dict,
+                 tab: ChromiumBase) -> Union[DataPacket, WebSocketPacket, SSEPacket, WebSocketConnectInfo]: ...
@@ -62,6 +62,7 @@ class SessionPageSetter(BaseSetter):
             self._owner._encoding = encoding if encoding else None
         if self._owner.response:
             self._owner.response.encoding = encoding
+        self._owner._tree = None
 
     def headers(self, headers):
         self._owner._headers = CaseInsensitiveDict(format_headers(headers))
@@ -163,6 +164,9 @@ class BrowserSetter(BrowserContextSetter, BrowserBaseSetter):
                                             ALLOW_VAL="', '".join(types.keys()), CURR_VAL=mode))
         self._owner._dl_mgr.set_file_exists('browser', mode)
 
+    def event_workers(self, num):
+        self._owner._dispatcher.set_workers(num)
+
 
 class ChromiumBaseSetter(BrowserBaseSetter):
     def __init__(self, owner):
@@ -294,6 +294,13 @@ class BrowserSetter(BrowserContextSetter, BrowserBaseSetter):
         """
         ...
 
+    def event_workers(self, num: int) -> None:
+        """设置处理事件回调的最大线程数，浏览器及其所有标签页、iframe共用这些线程
+        :param num: 线程数，不小于1
+        :return: None
+        """
+        ...
+
 
 class ChromiumBaseSetter(BrowserBaseSetter):
     _owner: ChromiumBase = ...
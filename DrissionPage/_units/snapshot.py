@@ -0,0 +1,157 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from itertools import count
+from re import compile
+
+from lxml.etree import Comment, SubElement
+from lxml.html import html_parser
+
+_BINDING = '__dpSnapshotMutated'
+_INVALID_CHARS = compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+_tokens = count(1)
+_OBSERVE_JS = '''const w = this.defaultView;
+if (w.__dpSnapshotObserver) w.__dpSnapshotObserver.disconnect();
+const o = new MutationObserver(() => {o.disconnect(); o.dirty = true; w.%s('%s');});
+o.token = '%s';
+o.observe(this, {subtree: true, childList: true, attributes: true, characterData: true});
+w.__dpSnapshotObserver = o;'''
+_CHECK_JS = '''const o = this.defaultView.__dpSnapshotObserver;
+if (!o || o.token !== '%s' || o.dirty) return false;
+if (o.takeRecords().length) {o.disconnect(); o.dirty = true; return false;}
+return true;'''
+
+
+class PageSnapshot(object):
+    def __init__(self, owner, data=None):
+        self._owner = owner
+        self._token = str(next(_tokens))
+        self._valid = True
+        self._watching = False
+        self._roots = {}
+        self._nodes = {}
+        if data is None:
+            data = self._capture()
+        self._build(data)
+
+    def __repr__(self):
+        return f'<PageSnapshot valid={self._valid} nodes={len(self._nodes)}>'
+
+    @property
+    def valid(self):
+        return self._valid
+
+    @property
+    def root(self):
+        return self._roots.get(self._owner._frame_id) if self._valid else None
+
+    @property
+    def nodes_count(self):
+        return len(self._nodes)
+
+    def node(self, backend_id):
+        return self._nodes.get(backend_id) if self._valid else None
+
+    def check(self):
+        """向页面确认快照获取后文档没有变化，已变化则使快照失效"""
+        if self._valid and self._watching:
+            try:
+                ok = self._owner._run_js(_CHECK_JS % self._token)
+            except Exception:
+                ok = False
+            if ok is not True:
+                self.discard()
+        return self._valid
+
+    def discard(self):
+        self._valid = False
+        self._roots = {}
+        self._nodes = {}
+        if self._watching:
+            self._watching = False
+            self._owner._remove_callback('Runtime.bindingCalled', self._onBindingCalled)
+            self._owner._disable_domain('Runtime', _ignore=True)
+
+    def _capture(self):
+        """先监听页面变化再获取快照，获取期间发生的变化也会使快照失效"""
+        owner = self._owner
+        owner.wait.doc_loaded()
+        owner._enable_domain('Runtime')
+        owner._set_callback('Runtime.bindingCalled', self._onBindingCalled)
+        self._watching = True
+        try:
+            owner._run_cdp('Runtime.addBinding', name=_BINDING)
+            owner._run_js(_OBSERVE_JS % (_BINDING, self._token, self._token))
+            return owner._run_cdp('DOMSnapshot.captureSnapshot', computedStyles=[])
+        except Exception:
+            self.discard()
+            raise
+
+    def _build(self, data):
+        """把DOMSnapshot数据转换为lxml树，并记录backendNodeId和元素的对应关系"""
+        strings = data.get('strings', [])
+        for doc in data.get('documents', []):
+            nodes = doc['nodes']
+            types = nodes.get('nodeType', [])
+            names = nodes.get('nodeName', [])
+            values = nodes.get('nodeValue', [])
+            ids = nodes.get('backendNodeId', [])
+            attrs = nodes.get('attributes', [])
+            pseudo = set(nodes.get('pseudoType', {}).get('index', ()))
+            made = {}
+            root = None
+            for i, parent in enumerate(nodes.get('parentIndex', [])):
+                if parent < 0 or i in pseudo:
+                    continue
+                p = made.get(parent)
+                node_type = types[i]
+                if node_type == 1:
+                    try:
+                        if p is not None:
+                            e = SubElement(p, strings[names[i]].lower())
+                        elif root is None and types[parent] == 9:
+                            e = root = html_parser.makeelement(strings[names[i]].lower())
+                        else:  # shadow root、template等不在outerHTML中的节点
+                            continue
+                    except ValueError:
+                        continue
+                    a = attrs[i] if i < len(attrs) else ()
+                    for k in range(0, len(a) - 1, 2):
+                        try:
+                            e.set(strings[a[k]], _clean(strings[a[k + 1]]))
+                        except ValueError:
+                            pass
+                    made[i] = e
+                    self._nodes[ids[i]] = e
+
+                elif p is None or values[i] < 0:
+                    continue
+
+                elif node_type == 3:
+                    text = _clean(strings[values[i]])
+                    if len(p):
+                        p[-1].tail = (p[-1].tail or '') + text
+                    else:
+                        p.text = (p.text or '') + text
+
+                elif node_type == 8:
+                    try:
+                        p.append(Comment(_clean(strings[values[i]])))
+                    except ValueError:
+                        pass
+
+            if root is not None:
+                self._roots[strings[doc['frameId']] if doc.get('frameId', -1) >= 0 else None] = root
+
+    def _onBindingCalled(self, **kwargs):
+        if kwargs.get('name') == _BINDING and kwargs.get('payload') == self._token:
+            self.discard()
+
+
+def _clean(text):
+    """去掉lxml不接受的字符"""
+    return _INVALID_CHARS.sub('', text)
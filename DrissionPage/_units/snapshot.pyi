@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+"""
+@Author   : g1879
+@Contact  : g1879@qq.com
+@Website  : https://DrissionPage.cn
+@Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
+"""
+from itertools import count
+from re import Pattern
+from typing import Optional, Dict
+
+from lxml.html import HtmlElement
+
+from .._pages.chromium_base import ChromiumBase
+
+_BINDING: str = ...
+_INVALID_CHARS: Pattern = ...
+_tokens: count = ...
+_OBSERVE_JS: str = ...
+_CHECK_JS: str = ...
+
+
+class PageSnapshot(object):
+    """页面快照，用一次DOMSnapshot获取的数据生成lxml树，在页面发生变化前供s_ele()和s_eles()重复使用"""
+    _owner: ChromiumBase = ...
+    _token: str = ...
+    _valid: bool = ...
+    _watching: bool = ...
+    _roots: Dict[Optional[str], HtmlElement] = ...
+    _nodes: Dict[int, HtmlElement] = ...
+
+    def __init__(self, owner: ChromiumBase, data: dict = None):
+        """
+        :param owner: 页面对象
+        :param data: DOMSnapshot.captureSnapshot返回的数据，为None时从页面获取
+        """
+        ...
+
+    @property
+    def valid(self) -> bool:
+        """返回快照是否有效，页面发生变化或跳转后失效"""
+        ...
+
+    @property
+    def root(self) -> Optional[HtmlElement]:
+        """返回所属页面文档的根元素，快照失效时返回None"""
+        ...
+
+    @property
+    def nodes_count(self) -> int:
+        """返回快照中元素节点的数量"""
+        ...
+
+    def node(self, backend_id: int) -> Optional[HtmlElement]:
+        """获取backendNodeId对应的lxml元素，快照失效或不包含该元素时返回None
+        :param backend_id: 元素的backendNodeId
+        :return: lxml元素
+        """
+        ...
+
+    def check(self) -> bool:
+        """向页面确认快照获取后文档没有变化，已变化则使快照失效，
+        用于弥补变化通知经事件线程送达前的空档，如click()后立即查找
+        :return: 快照是否仍有效
+        """
+        ...
+
+    def discard(self) -> None:
+        """使快照失效并停止监听页面变化"""
+        ...
+
+    def _capture(self) -> dict:
+        """先监听页面变化再获取快照，获取期间发生的变化也会使快照失效
+        :return: DOMSnapshot.captureSnapshot返回的数据
+        """
+        ...
+
+    def _build(self, data: dict) -> None:
+        """把DOMSnapshot数据转换为lxml树，并记录backendNodeId和元素的对应关系
+        :param data: DOMSnapshot.captureSnapshot返回的数据
+        :return: None
+        """
+        ...
+
+    def _onBindingCalled(self, **kwargs) -> None: ...
+
+
+def _clean(text: str) -> str:
+    """去掉lxml不接受的字符
+    :param text: 文本
+    :return: 处理后的文本
+    """
+    ...
@@ -113,6 +113,14 @@ class BrowserStates(object):
     def is_guest(self):
         return self._browser._guest
 
+    @property
+    def event_backlog(self):
+        return self._browser._dispatcher.backlog()
+
+    @property
+    def dropped_events(self):
+        return dict(self._browser._dropped_events)
+
 
 class PageStates(object):
     """Page对象、Tab对象使用"""
@@ -152,6 +160,10 @@ class PageStates(object):
     def is_incognito(self):
         return self._owner.browser.states.is_incognito
 
+    @property
+    def dropped_events(self):
+        return dict(self._owner._dropped_events)
+
 
 class FrameStates(object):
     def __init__(self, frame):
@@ -183,3 +195,7 @@ class FrameStates(object):
     @property
     def has_alert(self):
         return self._frame._has_alert
+
+    @property
+    def dropped_events(self):
+        return dict(self._frame._dropped_events)
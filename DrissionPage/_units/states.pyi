@@ -5,7 +5,7 @@
 @Website  : https://DrissionPage.cn
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
-from typing import Union, Tuple, List, Optional, Literal
+from typing import Union, Tuple, List, Optional, Literal, Dict
 
 from .._browsers.chromium import Chromium
 from .._elements.chromium_element import ShadowRoot, ChromiumElement
@@ -127,6 +127,16 @@ class BrowserStates(object):
         """返回浏览器是否访客模式"""
         ...
 
+    @property
+    def event_backlog(self) -> Dict[Optional[str], int]:
+        """返回各session待处理的事件数，格式：{session id: 数量}，浏览器自身的session id为None"""
+        ...
+
+    @property
+    def dropped_events(self) -> Dict[str, int]:
+        """返回因无人订阅而丢弃的事件数，格式：{事件名: 数量}"""
+        ...
+
 
 class PageStates(object):
     _owner: ChromiumBase = ...
@@ -172,6 +182,11 @@ class PageStates(object):
         """返回浏览器是否无痕模式"""
         ...
 
+    @property
+    def dropped_events(self) -> Dict[str, int]:
+        """返回因无人订阅而丢弃的事件数，格式：{事件名: 数量}"""
+        ...
+
 
 class FrameStates(object):
     _frame: ChromiumFrame = ...
@@ -206,3 +221,8 @@ class FrameStates(object):
     def has_alert(self) -> bool:
         """返回当前页面是否存在弹窗"""
         ...
+
+    @property
+    def dropped_events(self) -> Dict[str, int]:
+        """返回因无人订阅而丢弃的事件数，格式：{事件名: 数量}"""
+        ...
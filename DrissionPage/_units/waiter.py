@@ -353,7 +353,7 @@ def wait_mission(browser, tid, timeout):
             return v if not isinstance(v, bool) else None
         return False
 
-    r = wait_until(do, timeout, gap=.005)
+    r = wait_until(do, timeout, gap=.1, _cond=browser._dl_mgr._flag_cond)
     browser._dl_mgr.set_flag(tid, None)
     return r if r is not None else False
 
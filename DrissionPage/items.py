@@ -6,14 +6,17 @@
 @Copyright: (c) 2020 by g1879, Inc. All Rights Reserved.
 """
 from ._browsers.chromium_context import ChromiumContext
+from ._elements.async_element import AsyncChromiumElement
 from ._elements.chromium_element import ChromiumElement, ShadowRoot
 from ._elements.none_element import NoneElement
 from ._elements.session_element import SessionElement
 from ._functions.web import NavResult
+from ._pages.async_tab import AsyncChromiumTab
 from ._pages.chromium_frame import ChromiumFrame
 from ._pages.chromium_tab import ChromiumTab
 from ._units.listener import DataPacket, SSEPacket
 from ._units.listener import WebSocketPacket
 
 __all__ = ['ChromiumElement', 'ShadowRoot', 'NoneElement', 'SessionElement', 'NavResult',
-           'ChromiumFrame', 'ChromiumTab', 'ChromiumContext', 'DataPacket', 'WebSocketPacket', 'SSEPacket']
+           'ChromiumFrame', 'ChromiumTab', 'ChromiumContext', 'DataPacket', 'WebSocketPacket', 'SSEPacket',
+           'AsyncChromiumTab', 'AsyncChromiumElement']
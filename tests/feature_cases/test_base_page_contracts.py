@@ -235,9 +235,16 @@ def _check_messenger_contracts():
     assert_equal(seen, [{"value": 1}], "immediate events should invoke callbacks synchronously")
     assert_true(messenger._event_queue.empty(), "immediate events should not enter the queued-event path")
     messenger._remove_callback("Network.event", callback)
+    messenger._set_callback("Page.event", callback)
     messenger._recv_event({"method": "Page.event", "params": {"value": 2}})
     assert_equal(messenger._event_queue.get_nowait()["method"], "Page.event",
                  "ordinary events should enter the event queue")
+    messenger._recv_event({"method": "Network.event", "params": {"value": 3}})
+    messenger._recv_event({"method": "Network.event", "params": {"value": 4}})
+    messenger._recv_event({"method": "DOM.event", "params": {}})
+    assert_true(messenger._event_queue.empty(), "events without handlers should be dropped before queueing")
+    assert_equal(messenger._dropped_events, {"Network.event": 2, "DOM.event": 1},
+                 "dropped events should be counted per method")
 
     domain_calls = []
     messenger._run_func = lambda command, **kwargs: domain_calls.append((command, kwargs))
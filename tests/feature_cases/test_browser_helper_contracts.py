@@ -4,7 +4,7 @@ from __future__ import annotations
 import random
 import socket
 from contextlib import contextmanager
-from json import dump, load
+from json import dump, load, loads
 from pathlib import Path
 from queue import Queue
 from tempfile import TemporaryDirectory
@@ -578,7 +578,7 @@ def test_driver_contracts():
     sender.method_results = ThreadSafeDict()
     assert_equal(sender._send({'id': 1, 'method': 'Page.enable'}, timeout=0, ws_id=1),
                  {'id': 1, 'result': {}}, 'zero-timeout send should acknowledge immediately')
-    assert_equal(websocket.messages, ['{"id": 1, "method": "Page.enable"}'],
+    assert_equal([loads(m) for m in websocket.messages], [{'id': 1, 'method': 'Page.enable'}],
                  'zero-timeout send should serialize the exact command')
 
     owner = SimpleNamespace(disconnects=0)
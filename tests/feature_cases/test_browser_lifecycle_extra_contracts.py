@@ -7,11 +7,17 @@ from pathlib import Path
 from queue import Empty
 from shutil import Error as ShutilError
 from tempfile import TemporaryDirectory
+from threading import Event, Timer
+from time import perf_counter, sleep
 from types import SimpleNamespace
 
+import DrissionPage._base.dispatcher as dispatcher_module
+import DrissionPage._base.codec as codec_module
 import DrissionPage._base.driver as driver_module
 import DrissionPage._browsers.chromium as chromium_module
 import DrissionPage._functions.browser as browser_helpers
+from DrissionPage._base.base import Messenger
+from DrissionPage._base.dispatcher import EventDispatcher
 from DrissionPage._base.driver import Driver, ThreadSafeDict
 from DrissionPage._browsers.chromium import Chromium, Tabs
 from DrissionPage.errors import BrowserConnectError
@@ -29,6 +35,11 @@ def run(ctx):
     test_browser_lazy_units_and_delegation_contracts()
     test_browser_lifecycle_bookkeeping_contracts()
     test_driver_send_and_event_contracts()
+    test_driver_batch_contracts()
+    test_json_codec_contracts()
+    test_driver_signal_contracts()
+    test_async_driver_and_tab_contracts()
+    test_event_dispatcher_contracts()
     test_driver_start_stop_and_owner_contracts()
 
 
@@ -787,6 +798,7 @@ def test_browser_lifecycle_bookkeeping_contracts():
 
     session_driver = SessionDriver()
     browser._driver = session_driver
+    browser._listener = None
     browser._tabs = Tabs()
     browser._tabs._tab_first_session['tab-cached'] = 'session-cached'
     owner = object()
@@ -832,7 +844,10 @@ def test_browser_lifecycle_bookkeeping_contracts():
     browser._dl_mgr = SimpleNamespace(
         clear_tab_info=lambda tab_id: event_calls.append(('clear_download', tab_id))
     )
-    browser._listener = SimpleNamespace(_caught={'tab-event': 'packet'})
+    browser._listener = SimpleNamespace(
+        _caught={'tab-event': 'packet'},
+        _tab_attached=lambda session_id: event_calls.append(('tab_attached', session_id)),
+    )
     browser._driver = session_driver
     browser._onTargetCreated(targetInfo={
         'type': 'page',
@@ -843,6 +858,8 @@ def test_browser_lifecycle_bookkeeping_contracts():
     })
     assert_equal(browser._tabs._tab_first_session['tab-event'], 'session-event',
                  'target creation should retain its first attached session')
+    assert_in(('tab_attached', 'session-event'), event_calls,
+              'target creation should let the browser listener prepare the new tab')
     browser._onTargetDestroyed(targetId='tab-event')
     assert_false('tab-event' in browser._listener._caught,
                  'target destruction should clear listener packet storage')
@@ -863,6 +880,7 @@ def test_browser_lifecycle_bookkeeping_contracts():
         user_data_path='/tmp/auto-profile',
     )
     browser._disconnect_flag = False
+    browser._dispatcher = EventDispatcher()
     browser._stop_messenger = lambda: cleanup_calls.append('stop-messenger')
     with _preserved_dict(Chromium._BROWSERS), _patched(
         chromium_module,
@@ -877,6 +895,7 @@ def test_browser_lifecycle_bookkeeping_contracts():
         'stop-messenger',
     ], 'unexpected disconnect should clean auto profile before stopping messenger')
     assert_false(listener.listening, 'unexpected disconnect should stop browser listener state')
+    assert_false(browser._dispatcher.is_running, 'unexpected disconnect should stop the event dispatcher')
 
     cleanup_calls.clear()
     browser._disconnect_flag = True
@@ -1024,14 +1043,423 @@ def test_driver_send_and_event_contracts():
         'Page.javascriptDialogOpening',
         'Page.javascriptDialogClosed',
     ], 'driver event loop should route dialog events to the session owner')
-    assert_equal(response_queue.items, [{'id': 11, 'result': {'ok': True}}],
+    assert_equal([i for i in response_queue.items if isinstance(i, dict)], [{'id': 11, 'result': {'ok': True}}],
                  'driver response routing should use the exact websocket id')
+    assert_equal([i for i in response_queue.items if not isinstance(i, dict)],
+                 [driver_module._ALERT, driver_module._DISCONNECTED],
+                 'dialog opening and disconnection should be pushed to pending commands')
     assert_equal(receiver.alert_flag, set(),
                  'dialog close event should clear session alert bookkeeping')
     assert_equal(disconnected, [True],
                  'terminal websocket error should notify the driver owner once')
 
 
+def test_driver_signal_contracts():
+    waiter = object.__new__(Driver)
+    waiter.is_running = True
+    waiter.alert_flag = set()
+    waiter.method_results = ThreadSafeDict()
+    waiter._ws = SimpleNamespace(send=lambda message: None)
+
+    def open_dialog():
+        waiter.alert_flag.add('session-1')
+        waiter._notify(driver_module._ALERT)
+
+    Timer(.05, open_dialog).start()
+    start = perf_counter()
+    result = waiter._send({'id': 1, 'method': 'Runtime.evaluate', 'sessionId': 'session-1'}, timeout=5, ws_id=1)
+    assert_equal(result, {'error': {'message': 'alert exists.'}}, 'a dialog signal should end a blocked command')
+    assert_true(perf_counter() - start < 1, 'a dialog signal should not wait for the command timeout')
+
+    waiter.alert_flag.clear()
+    Timer(.05, lambda: waiter._notify(driver_module._ALERT)).start()
+    Timer(.1, lambda: waiter.method_results[2].put({'id': 2, 'result': {'ok': True}})).start()
+    assert_equal(waiter._send({'id': 2, 'method': 'Page.enable', 'sessionId': 'session-1'}, timeout=5, ws_id=2),
+                 {'id': 2, 'result': {'ok': True}}, 'unrelated dialog signals should keep the command waiting')
+
+    Timer(.05, lambda: waiter._notify(driver_module._DISCONNECTED)).start()
+    start = perf_counter()
+    assert_equal(waiter._send({'id': 3, 'method': 'Page.enable'}, timeout=30, ws_id=3),
+                 {'error': {'message': 'connection disconnected'}},
+                 'a disconnect signal should release commands before their timeout')
+    assert_true(perf_counter() - start < .15, 'a disconnect signal should be delivered without polling delay')
+
+
+def test_async_driver_and_tab_contracts():
+    from asyncio import gather, run as run_loop, start_server
+    from base64 import b64encode
+    from hashlib import sha1
+    from struct import pack, unpack
+    from DrissionPage._base.async_driver import AsyncDriver
+    from DrissionPage._elements.async_element import AsyncChromiumElement
+    from DrissionPage._pages.async_tab import AsyncChromiumTab
+    from DrissionPage._pages.chromium_base import Timeout
+    from websocket import ABNF
+
+    calls = []
+
+    def frame(data):
+        data = dumps(data).encode()
+        head = bytes([0x81, len(data)]) if len(data) < 126 else bytes([0x81, 126]) + pack('!H', len(data))
+        return head + data
+
+    async def read_frame(reader):
+        b1, b2 = await reader.readexactly(2)
+        length = b2 & 0x7f
+        if length == 126:
+            length = unpack('!H', await reader.readexactly(2))[0]
+        mask = await reader.readexactly(4)
+        return loads(ABNF.mask(mask, await reader.readexactly(length)))
+
+    def reply(msg):
+        method, params, sid = msg['method'], msg['params'], msg.get('sessionId')
+        events = []
+        if method == 'Target.createTarget':
+            result = {'targetId': 'T1'}
+        elif method == 'Target.attachToTarget':
+            result = {'sessionId': f"S-{params['targetId']}"}
+        elif method == 'Page.getFrameTree':
+            result = {'frameTree': {'frame': {'id': f'F-{sid}'}}}
+        elif method == 'Page.navigate':
+            result = {'loaderId': 'L1'}
+            events = [
+                {'method': 'Network.requestWillBeSent', 'params': {
+                    'requestId': 'doc', 'frameId': f'F-{sid}', 'type': 'Document',
+                    'request': {'url': params['url'], 'method': 'GET'}}},
+                {'method': 'Network.responseReceived', 'params': {
+                    'requestId': 'doc', 'frameId': f'F-{sid}', 'type': 'Document', 'timestamp': 1,
+                    'response': {'status': 200, 'url': params['url'], 'headers': {}}}},
+                {'method': 'Network.requestWillBeSent', 'params': {
+                    'requestId': 'api', 'frameId': f'F-{sid}', 'type': 'XHR',
+                    'request': {'url': 'https://example.test/api/data', 'method': 'GET', 'headers': {}}}},
+                {'method': 'Network.responseReceived', 'params': {
+                    'requestId': 'api', 'type': 'XHR', 'timestamp': 2,
+                    'response': {'status': 200, 'url': 'https://example.test/api/data', 'headers': {}}}},
+                {'method': 'Network.loadingFinished', 'params': {'requestId': 'api'}},
+                {'method': 'Page.loadEventFired', 'params': {'timestamp': 3}},
+            ]
+        elif method == 'Runtime.evaluate' and params['expression'] == 'document':
+            result = {'result': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDocument',
+                                 'objectId': f'doc-{sid}'}}
+        elif method == 'Runtime.callFunctionOn':
+            js = params['functionDeclaration']
+            if 'querySelectorAll' in js:
+                result = {'result': {'type': 'object', 'subtype': 'array', 'objectId': 'arr'}}
+            elif 'querySelector' in js:
+                result = {'result': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDivElement',
+                                     'objectId': 'n1'}}
+            elif 'document.evaluate' in js:
+                result = {'result': {'type': 'object', 'subtype': 'null'}}
+            elif 'outerHTML' in js:
+                result = {'result': {'type': 'string', 'value': '<div> hi <b>there</b></div>'}}
+            elif 'arguments[0]' in js:
+                result = {'result': {'type': 'number', 'value': params['arguments'][0]['value'] * 2}}
+            else:
+                result = {'result': {'type': 'undefined'}}
+        elif method == 'Runtime.getProperties':
+            result = {'result': [
+                {'name': '0', 'value': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDivElement',
+                                        'objectId': 'n1'}},
+                {'name': '1', 'value': {'type': 'object', 'subtype': 'node', 'className': 'HTMLDivElement',
+                                        'objectId': 'n2'}},
+                {'name': 'length', 'value': {'type': 'number', 'value': 2}}]}
+        elif method == 'DOM.getContentQuads':
+            result = {'quads': [[0, 0, 10, 0, 10, 20, 0, 20]]}
+        elif method == 'Network.getResponseBody':
+            result = {'body': '{"ok": true}', 'base64Encoded': False}
+        elif method.endswith('.hang'):
+            return []
+        else:
+            result = {}
+        out = [{'id': msg['id'], 'result': result, 'sessionId': sid} if sid else {'id': msg['id'], 'result': result}]
+        out += [dict(e, sessionId=sid) for e in events]
+        return out
+
+    async def serve(reader, writer):
+        head = (await reader.readuntil(b'\r\n\r\n')).decode()
+        assert 'Origin' not in head
+        key = [i.split(': ')[1] for i in head.split('\r\n') if i.startswith('Sec-WebSocket-Key')][0]
+        accept = b64encode(sha1(f'{key}258EAFA5-E914-47DA-95CA-C5AB0DC85B11'.encode()).digest()).decode()
+        writer.write(f'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                     f'Sec-WebSocket-Accept: {accept}\r\n\r\n'.encode())
+        try:
+            while True:
+                msg = await read_frame(reader)
+                calls.append(msg)
+                if msg['method'] == 'Close.socket':
+                    writer.write(bytes([0x88, 0]))
+                    await writer.drain()
+                    writer.close()
+                    return
+                for r in reply(msg):
+                    writer.write(frame(r))
+                await writer.drain()
+        except Exception:
+            writer.close()
+
+    async def scenario():
+        server = await start_server(serve, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        browser = SimpleNamespace(id='B', version='1', timeouts=Timeout(base=.2, page_load=2, script=2),
+                                  _driver=SimpleNamespace(address=f'ws://127.0.0.1:{port}/devtools/browser/B'))
+        driver = AsyncDriver(browser._driver.address)
+        await driver.start()
+        tab1 = AsyncChromiumTab(browser, driver=driver)
+        tab2 = AsyncChromiumTab(browser, 'T2', driver=driver)
+        await gather(tab1.connect(), tab2.connect())
+        assert_equal((tab1.tab_id, tab1._session_id, tab2._session_id), ('T1', 'S-T1', 'S-T2'),
+                     'async tabs should create or attach targets through one shared connection')
+
+        await tab1.listen.start('api/')
+        nav1, nav2 = await gather(tab1.get('https://example.test/'), tab2.get('https://example.test/b'))
+        assert_equal((nav1.status, nav2.url), (200, 'https://example.test/b'),
+                     'concurrent navigations should resolve from session-routed events')
+        packet = await tab1.listen.wait(timeout=1)
+        assert_equal((packet.url, packet.response.body), ('https://example.test/api/data', {'ok': True}),
+                     'async listener should deliver packets with their body fetched asynchronously')
+        assert_false(await tab2.listen.wait(timeout=.05), 'tabs should not see packets from other sessions')
+
+        assert_equal(await tab1.run_js('return arguments[0];', 21), 42,
+                     'page scripts should decode results with the shared parser')
+        ele = await tab1.ele('css:div')
+        assert_true(isinstance(ele, AsyncChromiumElement) and ele._obj_id == 'n1',
+                    'css lookup should return an element bound to its object id')
+        eles = await tab1.eles('css:div')
+        assert_equal([e._obj_id for e in eles], ['n1', 'n2'],
+                     'array results should become element lists without per-node round trips')
+        assert_equal(await ele.text(), 'hi there', 'element text should reuse the session text formatter')
+        assert_false(await tab1.ele('xpath://none', timeout=.1), 'missing elements should return NoneElement')
+        await ele.click()
+        mouse = [c['params'] for c in calls if c['method'] == 'Input.dispatchMouseEvent']
+        assert_equal([(m['type'], m['x'], m['y']) for m in mouse],
+                     [('mousePressed', 5, 10), ('mouseReleased', 5, 10)],
+                     'element click should dispatch mouse events at the content quad centre')
+        doc_lookups = [c for c in calls if c['method'] == 'Runtime.evaluate' and c.get('sessionId') == 'S-T1']
+        assert_equal(len(doc_lookups), 1, 'the document object id should be cached between page calls')
+
+        driver.alert_flag.add('S-T1')
+        start = perf_counter()
+        r = await driver.run('Runtime.hang', _timeout=5, _session_id='S-T1')
+        assert_equal(r['error'], 'alert exists.', 'runtime commands should fail fast while a dialog is open')
+        assert_true(perf_counter() - start < 1, 'a dialog should not make runtime commands wait for their timeout')
+        r = await driver.run('Page.hang', _session_id='S-T1')
+        assert_equal(r['error'], 'timeout', 'non-input commands should not be failed by dialogs')
+        driver.alert_flag.clear()
+
+        pending = driver.run('Page.hang', _timeout=30)
+        closing = driver.run('Close.socket', _timeout=0)
+        start = perf_counter()
+        results = await gather(pending, closing)
+        assert_equal(results[0]['error'], 'connection disconnected',
+                     'closing the socket should release pending commands')
+        assert_true(perf_counter() - start < 2, 'pending commands should not wait for their timeout')
+        assert_true(tab1._session_id is None and not driver.is_running,
+                    'session owners should be told when the connection drops')
+        server.close()
+
+    with _patched(driver_module._S, cdp_timeout=.3):
+        run_loop(scenario())
+
+def test_driver_batch_contracts():
+    class BatchSocket:
+        def __init__(self, driver, expected):
+            self.driver = driver
+            self.expected = expected
+            self.messages = []
+
+        def send(self, message):
+            self.messages.append(loads(message))
+            if len(self.messages) < self.expected:
+                return
+            for msg in reversed(self.messages):
+                if msg['method'] == 'DOM.describeNode':
+                    reply = {'id': msg['id'], 'error': {'message': 'No node with given id found', 'data': 'x'}}
+                else:
+                    reply = {'id': msg['id'], 'result': {'method': msg['method']}}
+                self.driver.method_results[msg['id']].put(reply)
+
+    batch = object.__new__(Driver)
+    batch.is_running = True
+    batch._cur_id = 20
+    batch.alert_flag = set()
+    batch.method_results = ThreadSafeDict()
+    batch._ws = BatchSocket(batch, 3)
+    result = batch.run_many([
+        ('DOM.resolveNode', {'nodeId': 1}),
+        'DOM.enable',
+        ('DOM.describeNode', {'nodeId': 2}),
+    ], _timeout=1, _session_id='session-batch')
+    assert_equal([m['id'] for m in batch._ws.messages], [21, 22, 23],
+                 'batched commands should be written back to back with consecutive ids')
+    assert_equal({m['sessionId'] for m in batch._ws.messages}, {'session-batch'},
+                 'batched commands should share the session id')
+    assert_equal(result[:2], [{'method': 'DOM.resolveNode'}, {'method': 'DOM.enable'}],
+                 'batched results should follow command order regardless of reply order')
+    assert_equal(result[2], {'error': 'No node with given id found', 'method': 'DOM.describeNode',
+                             'args': {'nodeId': 2}, 'data': 'x', 'timeout': 1},
+                 'batched errors should use the same envelope as run()')
+    assert_equal(batch.method_results.get(21), None, 'completed batch should release its pending ids')
+
+    batch._ws = SimpleNamespace(send=lambda message: None)
+    with _patched(driver_module, Queue=_ImmediateEmptyQueue, perf_counter=iter((0.0, 2.0)).__next__):
+        result = batch.run_many([('Page.enable', None), ('DOM.enable', None)], _timeout=1)
+    assert_equal([r['error'] for r in result], ['timeout', 'timeout'],
+                 'unanswered batched commands should time out together')
+    assert_equal(batch.method_results.get(24), None, 'timed-out batch should release its pending ids')
+
+    batch.is_running = False
+    assert_equal(batch.run_many(['Page.enable']), [{'error': 'connection disconnected'}],
+                 'stopped driver should reject batched commands without sending')
+
+
+def test_json_codec_contracts():
+    peek = codec_module.peek_event
+    assert_equal(peek('{"method":"Network.dataReceived","params":{"requestId":"1"},"sessionId":"S1"}'),
+                 ('Network.dataReceived', 'S1'), 'peek should read method and trailing session id')
+    assert_equal(peek('{"method":"Target.targetCreated","params":{"targetInfo":{"targetId":"T"}}}'),
+                 ('Target.targetCreated', None), 'browser level events should have no session id')
+    assert_equal(peek('{"method":"Target.attachedToTarget","params":{"sessionId":"S2","waitingForDebugger":false}}'),
+                 None, 'a session id inside params should not be mistaken for the event owner')
+    assert_equal(peek('{"method":"Target.attachedToTarget","params":{"sessionId":"S2"},"sessionId":"S1"}'),
+                 ('Target.attachedToTarget', 'S1'), 'the trailing session id should win over nested ones')
+    assert_equal(peek('{"id":3,"result":{}}'), None, 'command replies should not be peeked')
+    assert_equal(peek('{"method": "Page.loadEventFired"}'), None, 'unknown layouts should fall back to parsing')
+
+    current = codec_module.current_codec()
+    try:
+        codec_module.set_codec('json')
+        assert_equal(codec_module.current_codec(), 'json', 'codec should be switchable to the standard library')
+        assert_equal(codec_module.dumps({'a': 1}), '{"a": 1}', 'standard codec should produce text')
+        for name in codec_module.available_codecs():
+            codec_module.set_codec(name)
+            big = {'n': 2 ** 70, 'text': '中文'}
+            assert_equal(loads(codec_module.dumps(big)), big, f'{name} codec should round trip any payload')
+            assert_equal(codec_module.loads(b'{"x":[1,2]}'), {'x': [1, 2]}, f'{name} codec should accept bytes')
+            assert_equal(codec_module.loads('{"v":"a\\ud800b"}'), {'v': 'a\ud800b'},
+                         f'{name} codec should accept lone surrogate escapes sent by the browser')
+        _assert_raises(ValueError, codec_module.set_codec, 'pickle')
+        codec_module.set_codec('auto')
+        expect = next(n for n in ('orjson', 'ujson', 'json') if n in codec_module.available_codecs())
+        assert_equal(codec_module.current_codec(), expect, 'auto should prefer an installed fast codec')
+    finally:
+        codec_module.set_codec(current)
+
+    class Owner(Messenger):
+        def __init__(self, handlers):
+            super().__init__()
+            self._event_handlers = handlers
+            self.events = []
+
+        def _recv_event(self, msg):
+            self.events.append(msg['method'])
+
+    class Socket:
+        def __init__(self, messages):
+            self.messages = iter(messages)
+
+        def recv(self):
+            value = next(self.messages)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        def close(self):
+            pass
+
+    page = Owner({'Network.responseReceived': [lambda **kw: None], 'Network.dataReceived': []})
+    parsed = []
+    receiver = object.__new__(Driver)
+    receiver.is_running = True
+    receiver._ws = Socket((
+        '{"method":"Network.dataReceived","params":{"dataLength":1},"sessionId":"S1"}',
+        '{"method":"Network.responseReceived","params":{"requestId":"1"},"sessionId":"S1"}',
+        '{"method":"Network.responseReceived","params":{"requestId":"2"},"sessionId":"gone"}',
+        '{"method":"Network.responseReceived","params":{"requestId":"3"},"sessionId":"S1"',
+        '{"method":"Page.javascriptDialogOpening","params":{},"sessionId":"S1"}',
+        driver_module.WebSocketException('closed'),
+    ))
+    receiver.alert_flag = set()
+    receiver.method_results = ThreadSafeDict()
+    receiver._session_owner = {'S1': page}
+    receiver.owner = SimpleNamespace(_on_disconnect=lambda: None)
+    with _patched(driver_module, loads=lambda raw: parsed.append(raw) or loads(raw)):
+        receiver._recv_loop()
+    assert_equal(page.events, ['Network.responseReceived', 'Page.javascriptDialogOpening'],
+                 'subscribed events and dialogs should still reach the owner, undecodable ones are dropped')
+    assert_equal(len(parsed), 3, 'events nobody subscribes to should not be decoded')
+    assert_equal(page._dropped_events, {'Network.dataReceived': 1},
+                 'events skipped before decoding should be counted by their owner')
+
+
+def test_event_dispatcher_contracts():
+    dispatcher = EventDispatcher(workers=2, batch=3)
+    browser = SimpleNamespace(_dispatcher=dispatcher, _detach=lambda sid: None,
+                              _get_session_id=lambda tid, obj=None: tid)
+    seen = {}
+    done = Event()
+
+    def make(sid, count):
+        m = Messenger()
+        m._browser = browser
+        m._target_id = sid
+        seen[sid] = []
+
+        def handler(n):
+            if n == 2:
+                raise ValueError('broken handler')
+            seen[sid].append(n)
+            if all(len(v) == count - 1 for v in seen.values()):
+                done.set()
+
+        m._event_handlers['Test.event'] = [handler]
+        m._start_messenger()
+        return m
+
+    errors = []
+    messengers = [make(sid, 20) for sid in (None, 's1', 's2', 's3')]
+    with _patched(dispatcher_module, print_exc=lambda: errors.append(True)):
+        for n in range(20):
+            for m in messengers:
+                m._recv_event({'method': 'Test.event', 'params': {'n': n}})
+        assert_true(done.wait(5), 'dispatcher should drain every session queue')
+    assert_equal(len(errors), 4, 'handler errors should be reported without killing workers')
+    expect = [n for n in range(20) if n != 2]
+    for sid, got in seen.items():
+        assert_equal(got, expect, f'events of session {sid} should keep their order')
+    assert_true(dispatcher.alive_workers <= 2, 'dispatcher should not start more workers than allowed')
+    assert_equal(dispatcher.backlog(), {None: 0, 's1': 0, 's2': 0, 's3': 0}, 'backlog should report empty queues')
+
+    dispatcher.set_workers(1)
+    end = perf_counter() + 2
+    while dispatcher.alive_workers > 1 and perf_counter() < end:
+        sleep(.01)
+    assert_equal(dispatcher.alive_workers, 1, 'surplus workers should exit after shrinking the pool')
+
+    messengers[1]._stop_messenger()
+    assert_false('s1' in dispatcher.backlog(), 'stopped messenger should leave the dispatcher')
+    dispatcher.stop()
+    end = perf_counter() + 2
+    while dispatcher.alive_workers and perf_counter() < end:
+        sleep(.01)
+    assert_equal(dispatcher.alive_workers, 0, 'stop should end every worker')
+    messengers[2]._recv_event({'method': 'Test.event', 'params': {'n': 99}})
+    assert_equal(dispatcher.backlog()['s2'], 1, 'events queued after stop should stay unhandled')
+
+    # a relaunch stops the dispatcher through the old connection; later messengers must get a new one
+    relaunched = Event()
+    m = Messenger()
+    m._browser = browser
+    m._target_id = 'relaunched'
+    m._event_handlers['Test.event'] = [lambda n: relaunched.set()]
+    m._start_messenger()
+    assert_true(browser._dispatcher is not dispatcher and browser._dispatcher.is_running,
+                'starting a messenger after the dispatcher stopped should create a new one')
+    assert_equal(browser._dispatcher.workers, 1, 'the new dispatcher should keep the configured worker count')
+    m._recv_event({'method': 'Test.event', 'params': {'n': 1}})
+    assert_true(relaunched.wait(5), 'events should be delivered again after a relaunch')
+    browser._dispatcher.stop()
+
+
 def test_driver_start_stop_and_owner_contracts():
     threads = []
     sockets = []
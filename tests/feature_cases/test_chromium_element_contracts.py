@@ -12,6 +12,7 @@ from DrissionPage._units.rect import ElementRect
 from DrissionPage._units.scroller import ElementScroller
 from DrissionPage._units.selector import SelectElement
 from DrissionPage._units.setter import ChromiumElementSetter
+from DrissionPage._units.snapshot import PageSnapshot
 from DrissionPage._units.states import ElementStates
 from DrissionPage._units.waiter import ElementWaiter
 from DrissionPage.errors import AlertExistsError, ElementLostError
@@ -27,6 +28,7 @@ def run(ctx):
     _check_construction_and_identity()
     _check_content_and_attribute_contracts()
     _check_session_snapshot_contracts()
+    _check_page_snapshot_contracts()
     _check_accessor_and_setter_wiring()
     _check_traversal_delegation()
     _check_element_actions_and_resources()
@@ -328,6 +330,131 @@ def _check_session_snapshot_contracts():
     assert_equal(len(owner_document_calls), 1, "session snapshots should reuse the resolved owner document")
 
 
+def _snapshot_data():
+    strings = []
+    nodes = {"parentIndex": [], "nodeType": [], "nodeName": [], "nodeValue": [], "backendNodeId": [],
+             "attributes": [], "pseudoType": {"index": [], "value": []}}
+
+    def index(text):
+        if text not in strings:
+            strings.append(text)
+        return strings.index(text)
+
+    def add(parent, node_type, name, value=None, backend_id=0, attrs=(), pseudo=False):
+        if pseudo:
+            nodes["pseudoType"]["index"].append(len(nodes["parentIndex"]))
+            nodes["pseudoType"]["value"].append(index("before"))
+        nodes["parentIndex"].append(parent)
+        nodes["nodeType"].append(node_type)
+        nodes["nodeName"].append(index(name))
+        nodes["nodeValue"].append(-1 if value is None else index(value))
+        nodes["backendNodeId"].append(backend_id)
+        nodes["attributes"].append([index(i) for pair in attrs for i in pair])
+        return len(nodes["parentIndex"]) - 1
+
+    document = add(-1, 9, "#document")
+    html = add(document, 1, "HTML", backend_id=1)
+    body = add(html, 1, "BODY", backend_id=2)
+    main = add(body, 1, "DIV", backend_id=101, attrs=(("id", "main"), ("class", "box")))
+    add(main, 1, "::before", backend_id=102, pseudo=True)
+    add(main, 3, "#text", "Hello ")
+    add(add(main, 1, "SPAN", backend_id=103, attrs=(("id", "child"),)), 3, "#text", "world")
+    add(main, 8, "#comment", " note ")
+    add(main, 1, "BR", backend_id=104)
+    add(main, 3, "#text", "line\x00")
+    shadow = add(main, 11, "#document-fragment", backend_id=105)
+    add(shadow, 1, "SPAN", backend_id=106, attrs=(("id", "hidden"),))
+    return {"documents": [{"frameId": index("frame-1"), "nodes": nodes}], "strings": strings}
+
+
+class FakeSnapshotOwner:
+    def __init__(self):
+        self._frame_id = "frame-1"
+        self.wait = SimpleNamespace(doc_loaded=lambda: True)
+        self.calls = []
+        self.handlers = {}
+        self.unchanged = True
+
+    def _enable_domain(self, domain, **kwargs):
+        self.calls.append(("enable", domain))
+
+    def _disable_domain(self, domain, **kwargs):
+        self.calls.append(("disable", domain))
+
+    def _set_callback(self, event, callback):
+        self.handlers.setdefault(event, []).append(callback)
+
+    def _remove_callback(self, event, callback):
+        self.handlers[event].remove(callback)
+
+    def _run_js(self, script, *args, **kwargs):
+        self.calls.append(("js", script))
+        return self.unchanged if "takeRecords" in script else None
+
+    def _run_cdp(self, method, **kwargs):
+        self.calls.append((method, kwargs))
+        return _snapshot_data() if method == "DOMSnapshot.captureSnapshot" else {}
+
+
+def _check_page_snapshot_contracts():
+    snapshot = PageSnapshot(FakeSnapshotOwner(), _snapshot_data())
+    assert_equal(snapshot.nodes_count, 5, "pseudo elements and shadow trees should stay out of the snapshot")
+    assert_equal(snapshot.root.tag, "html", "root should be the document element of the owner frame")
+    assert_equal(snapshot.node(101).text, "Hello ", "text nodes should become lxml text")
+    assert_equal(snapshot.node(104).tail, "line", "trailing text should become lxml tails without invalid characters")
+    assert_true(snapshot.node(106) is None, "nodes inside shadow roots should not be mapped")
+
+    owner = FakeOwner()
+    owner._frame_id = "frame-1"
+    owner._snapshot = snapshot
+    element = _element(owner)
+    element.ele = lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("live lookup should be skipped"))
+    calls = len(owner.calls)
+    child = element.s_ele("tag:span")
+    assert_equal((child.tag, child.attr("id"), child.text), ("span", "child", "world"),
+                 "s_ele(locator) should be served from the page snapshot")
+    assert_equal([e.attr("id") for e in element.s_eles("tag:span")], ["child"],
+                 "s_eles(locator) should be served from the page snapshot")
+    assert_equal(element.s_ele().attr("class"), "box", "s_ele() should wrap the snapshot node")
+    assert_equal(element.s_ele("xpath:..").tag, "body", "snapshot lookups should reach ancestors")
+    assert_equal(len(owner.calls), calls, "snapshot lookups should not touch the browser")
+
+    snapshot._onBindingCalled(name="__dpSnapshotMutated", payload="other")
+    assert_true(snapshot.valid, "mutations reported for another snapshot should be ignored")
+    snapshot._onBindingCalled(name="__dpSnapshotMutated", payload=snapshot._token)
+    assert_false(snapshot.valid, "a reported mutation should invalidate the snapshot")
+    assert_true(snapshot.node(101) is None and snapshot.root is None, "an invalid snapshot should not serve nodes")
+    element.ele = lambda locator, index=1, timeout=None: True
+    assert_equal(element.s_ele("tag:span").attr("id"), "child", "an invalid snapshot should fall back to the page html")
+    assert_true(len(owner.calls) > calls, "the fallback should read the document from the browser")
+
+    watcher = FakeSnapshotOwner()
+    live = PageSnapshot(watcher)
+    assert_equal([c[0] for c in watcher.calls],
+                 ["enable", "Runtime.addBinding", "js", "DOMSnapshot.captureSnapshot"],
+                 "capturing should start watching mutations before taking the snapshot")
+    assert_in(live._token, watcher.calls[2][1], "the mutation observer should report the snapshot token")
+    watcher.handlers["Runtime.bindingCalled"][0](name="__dpSnapshotMutated", payload=live._token)
+    assert_false(live.valid, "the registered binding callback should invalidate the snapshot")
+    assert_equal((watcher.calls[-1], watcher.handlers["Runtime.bindingCalled"]), (("disable", "Runtime"), []),
+                 "discarding should stop watching mutations")
+
+    watcher = FakeSnapshotOwner()
+    live = PageSnapshot(watcher)
+    owner = FakeOwner()
+    owner._frame_id = "frame-1"
+    owner._snapshot = live
+    element = _element(owner)
+    element.ele = lambda locator, index=1, timeout=None: True
+    assert_equal(element.s_ele("tag:span").attr("id"), "child", "an unchanged page should be served from the snapshot")
+    assert_in(live._token, watcher.calls[-1][1], "lookups should confirm with the page that the snapshot is current")
+    watcher.unchanged = False  # the page changed but the notification has not arrived yet
+    calls = len(owner.calls)
+    assert_equal(element.s_ele("tag:span").attr("id"), "child", "a stale snapshot should fall back to the page html")
+    assert_false(live.valid, "a change found by the lookup check should invalidate the snapshot")
+    assert_true(len(owner.calls) > calls, "the fallback should read the current document from the browser")
+
+
 def _check_accessor_and_setter_wiring():
     owner = FakeOwner()
     element = _element(owner)
@@ -36,6 +36,7 @@ from DrissionPage._elements.chromium_element import (
 )
 from DrissionPage._elements.none_element import NoneElement
 from DrissionPage._functions.keys import Keys
+from DrissionPage._functions.settings import Settings
 from DrissionPage._units.states import ShadowRootStates
 from DrissionPage.errors import AlertExistsError, CDPError, ContextLostError, LocatorError, NoRectError, NoResourceError
 
@@ -148,6 +149,10 @@ class FakeOwner:
             return _cdp_value(self.js_value)
         raise AssertionError(f"unexpected CDP call: {method} {kwargs!r}")
 
+    def _run_cdp_many(self, cmds, _ignore=None, **kwargs):
+        self.calls.append(("batch", len(cmds)))
+        return [self._run_cdp(method, **(args or {})) for method, args in cmds]
+
 
 class FakeRect:
     def __init__(self, *, location=(10, 20), midpoint=(30, 40), size=(40, 20)):
@@ -169,10 +174,13 @@ class FakeNodePage(FakeOwner):
     def __init__(self):
         super().__init__()
         self.node_map = {}
+        self.lost = set()
 
     def _run_cdp(self, method, **kwargs):
         if method == "DOM.describeNode":
             key = next((kwargs[k] for k in ("backendNodeId", "nodeId", "objectId") if k in kwargs), None)
+            if key in self.lost:
+                return {"error": "Could not find node with given id"}
             node = self.node_map.get(key)
             if node is not None:
                 return {"node": dict(node)}
@@ -524,6 +532,50 @@ def _check_node_factory_contracts():
     assert_true(isinstance(_make_ele(page, "obj", {"node": page.node_map[1]}), ChromiumElement),
                 "_make_ele should preserve ordinary element types")
 
+    page.calls.clear()
+    batch = make_chromium_eles(page, [1, 2, 3], index=None, id_type="node_id")
+    assert_equal([c for c in page.calls if c[0] == "batch"], [("batch", 6)],
+                 "bulk materialisation should pipeline every describeNode/resolveNode in one batch")
+    calls = len(page.calls)
+    assert_equal([e if isinstance(e, str) else e.tag for e in batch], ["div", "text", "span"],
+                 "bulk materialisation should keep order and seed tags from describeNode")
+    assert_equal((batch[2]._node_id, batch[2]._backend_id, batch[2]._obj_id), (3, 103, "object-3"),
+                 "bulk materialisation should seed all ids from the batched replies")
+    assert_equal(len(page.calls), calls, "seeded tags should not trigger extra describeNode calls")
+    page.calls.clear()
+    assert_equal(len(make_chromium_eles(page, ["obj", "obj"], index=None, id_type="obj_id")), 2,
+                 "object ids should only need batched describeNode calls")
+    assert_true(all(c[0] in ("batch", "DOM.describeNode") for c in page.calls),
+                "object ids should not be resolved again")
+    page.lost.add(4)
+    assert_equal(make_chromium_eles(page, [1, 4], index=None, id_type="node_id"), False,
+                 "a lost node in the batch should fail the whole lookup")
+
+    page = FakeNodePage()
+    with _replace(Settings, lazy_ele_ids=True):
+        lazy = ChromiumElement(page, node_id=5)
+        assert_equal(page.calls, [], "lazy handles should not resolve ids on creation")
+        assert_equal(lazy._obj_id, "object-5", "lazy handles should resolve object ids on first use")
+        assert_equal(lazy._backend_id, 55, "lazy handles should resolve backend ids on first use")
+        assert_equal(lazy.tag, "div", "lazy backend id lookups should seed the tag")
+        calls = len(page.calls)
+        assert_equal((lazy._node_id, lazy._obj_id, lazy._backend_id), (5, "object-5", 55),
+                     "lazy ids should be cached after the first lookup")
+        assert_equal(len(page.calls), calls, "cached lazy ids should not trigger CDP calls")
+
+        page.calls.clear()
+        run_cdp = page._run_cdp
+        page._run_cdp = lambda method, **kwargs: ({"nodeIds": [78]} if kwargs.get("selector") == "iframe,frame,object"
+                                                  else run_cdp(method, **kwargs))
+        eles = do_find_css(page, "DOM.querySelectorAll", "div", "nodeIds", 1, None)
+        assert_equal([e._nid for e in eles], [77, 78], "lazy CSS lookups should keep node ids in order")
+        assert_equal(eles[0]._oid, None, "lazy CSS results should not resolve ids until touched")
+        assert_equal(eles[1]._oid, "object-78", "frame candidates should still be built eagerly")
+        assert_equal([c[0] for c in page.calls], ["DOM.querySelectorAll", "DOM.describeNode", "DOM.resolveNode"],
+                     "lazy CSS lookups should only materialise frame candidates")
+        assert_equal(eles[0]._obj_id, "object-77", "lazy CSS results should resolve ids when touched")
+    assert_true(ChromiumElement(page, node_id=5)._oid is not None, "eager mode should resolve ids on creation")
+
     for type_txt in ("9", "7", "2", "1", "3"):
         script = make_js_for_find_ele_by_xpath("//div[@id='a']", type_txt, "this")
         assert_in("document.evaluate", script, "XPath helper should emit an evaluate call")
@@ -1,6 +1,7 @@
 """Feature: deterministic collection filtering and action dispatch contracts."""
 from __future__ import annotations
 
+from copy import deepcopy
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
@@ -94,6 +95,9 @@ def test_element_collections():
     assert_equal(sliced, ["raw text", second], "slicing should preserve values")
     _expect_raises(ValueError, lambda: items["bad"], "non-integer collection indexes should fail")
 
+    assert_equal(items.get.columns(text=True, attrs="role"), {"text": ["Alpha", "Beta", "Gamma"],
+                                                              "role": ["item", "note", "item"]},
+                 "columns() should read plain element lists one element at a time")
     element_items = SessionElementsList(owner, [first, second, third])
     assert_equal(element_items.texts, ["Alpha", "Beta", "Gamma"], "texts should expose element text")
     assert_equal(items.get.links(), [first.link, second.link, third.link], "links() should ignore string nodes")
@@ -137,6 +141,96 @@ def test_element_collections():
     assert_false(chromium.search_one(tag="missing"), "missing search_one result should be NoneElement-compatible")
 
 
+def test_batched_state_predicates():
+    class BatchOwner:
+        _none_ele_value = None
+        _none_ele_return_value = False
+
+        def __init__(self, bits):
+            self.bits = bits
+            self.calls = []
+
+        def _run_cdp(self, method, **kwargs):
+            self.calls.append((method, kwargs))
+            return {"result": {"type": "object", "value": deepcopy(self.bits)}}
+
+        def _run_cdp_many(self, cmds, **kwargs):
+            self.calls.append(("batch", cmds))
+            return [{"object": {"objectId": f"object-{args['nodeId']}"}} for _, args in cmds]
+
+    class BatchElement:
+        _type = "ChromiumElement"
+
+        def __init__(self, owner, oid=None, nid=None):
+            self.owner = owner
+            self._oid = oid
+            self._nid = nid
+            self._bid = None
+            self.states = None
+
+        @property
+        def _obj_id(self):
+            return self._oid
+
+        @_obj_id.setter
+        def _obj_id(self, value):
+            self._oid = value
+
+    # bit 0: displayed, bit 1: enabled
+    owner = BatchOwner([0b11, 0b00, 0b01])
+    first, second, third = BatchElement(owner, "o1"), BatchElement(owner, "o2"), BatchElement(owner, nid=3)
+    items = ChromiumElementsList(owner, [first, "text", second, third])
+    assert_equal(list(items.search(displayed=True)), [first, third], "search() should use the batched bitmap")
+    assert_equal(len([c for c in owner.calls if c[0] == "Runtime.callFunctionOn"]), 1,
+                 "search() should evaluate all elements in one callFunctionOn")
+    call = [c for c in owner.calls if c[0] == "Runtime.callFunctionOn"][0][1]
+    assert_equal(call["arguments"], [{"objectId": "o1"}, {"objectId": "o2"}, {"objectId": "object-3"}],
+                 "the batched call should pass every element once, skipping text nodes")
+    assert_true(call["returnByValue"], "the bitmap should be returned by value")
+    assert_equal(owner.calls[0][0], "batch", "lazy object ids should be resolved in one pipelined batch")
+
+    owner.calls.clear()
+    assert_equal(items.search_one(index=2, displayed=False, enabled=True), second,
+                 "search_one() should OR the requested predicates over the bitmap")
+    items.search(tag="DIV")
+    assert_in('e.localName==="div"', owner.calls[-1][1]["functionDeclaration"],
+              "tag predicates should be evaluated in the page")
+    owner.bits = [1, 0, 1]
+    assert_equal(list(items.filter.displayed(False)), [second], "filter states should use the batched bitmap")
+    assert_equal(items.filter_one(2).displayed(), third, "filter_one states should use the batched bitmap")
+
+    owner.calls.clear()
+    owner.bits = [["<p>A<br>1</p>", "/a", "7", "x"], ["<p>B</p>", "javascript:;", None, "y"],
+                  ["<p>C</p>", None, "9", "&lt;z&gt;"]]
+    owner.bits = [r + ["https://example.test/base/"] for r in owner.bits]
+    columns = items.get.columns(text=True, attrs=["href", "data-id"], props="value")
+    assert_equal(columns, {"text": ["A\n1", "B", "C"],
+                           "href": ["https://example.test/a", "javascript:;", None],
+                           "data-id": ["7", None, "9"], "value": ["x", "y", "<z>"]},
+                 "columns() should build text, absolute links, attributes and properties from one call")
+    assert_equal([c[0] for c in owner.calls], ["Runtime.callFunctionOn"], "columns() should need one in-page call")
+    assert_equal(items.get.columns(text=True, attrs=["href", "data-id"], props="value", as_rows=True)[1],
+                 ("B", "javascript:;", None, "y"), "columns(as_rows=True) should return one tuple per element")
+
+    owner.calls.clear()
+    owner.bits = [["a&amp;\xa0b", "<p>A<br>1</p>", "x\xa0y", "<i>z</i>"]] * 3
+    columns = items.get.columns(raw_text=True, attrs=["text", "innerText", "innerHTML"])
+    assert_equal((columns["raw_text"][0], columns["text"][0], columns["innerText"][0], columns["innerHTML"][0]),
+                 ("a& b", "A\n1", "x y", "<i>z</i>"), "bulk columns should format text like raw_text and attr()")
+    js = owner.calls[-1][1]["functionDeclaration"]
+    assert_in("e.innerHTML", js, "special attribute names should read the same values as attr()")
+    assert_false("getAttribute(\"text\")" in js, "special attribute names should not be read as attributes")
+    _expect_raises(ValueError, lambda: items.get.columns(attrs="value", props="value"),
+                   "columns() should reject clashing attribute and property names")
+
+    failing = BatchOwner(None)
+    failing._run_cdp = lambda method, **kwargs: {"error": "Cannot find context with specified id"}
+    fallback = BatchElement(failing, "o9")
+    fallback.states = type("States", (), {"is_displayed": True})()
+    assert_equal(list(ChromiumElementsList(failing, [fallback]).search(displayed=True)), [fallback],
+                 "a failed batched call should fall back to per-element states")
+
+
 def test_element_lookup_helpers():
     class LookupOwner:
         def __init__(self):
@@ -314,5 +408,6 @@ def test_actions_dispatch():
 
 def run(ctx):
     test_element_collections()
+    test_batched_state_predicates()
     test_element_lookup_helpers()
     test_actions_dispatch()
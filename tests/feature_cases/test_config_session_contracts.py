@@ -2,15 +2,19 @@
 from __future__ import annotations
 
 from configparser import NoSectionError
+from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from threading import Lock
+from time import sleep
 
-from requests import Session
+from requests import Response, Session
+from requests.structures import CaseInsensitiveDict
 
-from DrissionPage import ChromiumOptions, SessionOptions
+from DrissionPage import ChromiumOptions, SessionOptions, SessionPage
 from DrissionPage._configs.options_manage import OptionsManager
 from DrissionPage._elements.none_element import NoneElement
-from DrissionPage._elements.session_element import SessionElement, make_session_ele
+from DrissionPage._elements.session_element import SessionElement, iter_stream_eles, make_session_ele
 from DrissionPage._functions.elements import SessionElementsList
 from DrissionPage.errors import ElementNotFoundError, LocatorError
 
@@ -46,7 +50,11 @@ def run(ctx):
         root = Path(tmp)
         _check_chromium_options(root)
         _check_session_options(root)
+        _check_session_pool_options(root)
         _check_options_manager(root)
+        _check_session_page_tree_cache(root)
+    _check_session_page_fetch_many()
+    _check_session_page_iter_eles()
     _check_session_elements()
     _check_none_element()
 
@@ -176,6 +184,50 @@ def _check_session_options(root: Path) -> None:
     assert_equal(options.download_path, ".", "a missing session download path should fall back to the current directory")
 
 
+def _check_session_pool_options(root: Path) -> None:
+    plain, _ = SessionOptions(read_file=False).make_session()
+    assert_equal(plain.get_adapter("https://example.test/")._pool_maxsize, 10,
+                 "sessions without pool settings should keep the default adapters")
+
+    options = SessionOptions(read_file=False)
+    assert_true(options.set_pool(connections=4, maxsize=32, block=True) is options, "set_pool() should be chainable")
+    assert_true(options.set_host_limit("slow.test", 2) is options, "set_host_limit() should be chainable")
+    options.set_host_limit("gone.test", 3).set_host_limit("gone.test", None)
+    assert_true(options.set_http_retry(3, 0.5, [502, 503], ["get", "post"]) is options,
+                "set_http_retry() should be chainable")
+    assert_equal((options.pool_connections, options.pool_maxsize, options.pool_block), (4, 32, True),
+                 "pool settings should be stored")
+    assert_equal(options.host_limits, {"slow.test": 2}, "set_host_limit(host, None) should remove the host")
+    assert_equal(options.http_retry, {"total": 3, "backoff_factor": 0.5, "status_forcelist": [502, 503],
+                                      "allowed_methods": ["GET", "POST"]}, "retry policy should be stored")
+
+    session, _ = options.make_session()
+    adapter = session.get_adapter("https://fast.test/page")
+    assert_equal((adapter._pool_connections, adapter._pool_maxsize, adapter._pool_block), (4, 32, True),
+                 "make_session() should mount adapters with the pool settings")
+    retry = adapter.max_retries
+    assert_equal((retry.total, retry.backoff_factor, tuple(retry.status_forcelist)), (3, 0.5, (502, 503)),
+                 "make_session() should install the retry policy")
+    assert_false(retry.raise_on_status, "exhausted status retries should return the last response")
+    limited = session.get_adapter("http://slow.test/list")
+    assert_equal((limited._pool_maxsize, limited._pool_block), (2, True),
+                 "per-host limits should mount a blocking pool for that host")
+    assert_true(session.get_adapter("https://slow.test.example/") is adapter,
+                "per-host limits should not match longer host names")
+
+    ini_path = root / "session-pool.ini"
+    loaded = SessionOptions(ini_path=options.save(ini_path))
+    assert_equal((loaded.pool_connections, loaded.pool_maxsize, loaded.pool_block), (4, 32, True),
+                 "pool settings should round-trip through ini")
+    assert_equal((loaded.host_limits, loaded.http_retry), (options.host_limits, options.http_retry),
+                 "host limits and retry policy should round-trip through ini")
+
+    loaded.set_http_retry(None).set_host_limit("slow.test", None)
+    reloaded = SessionOptions(ini_path=loaded.save(ini_path))
+    assert_equal((reloaded.http_retry, reloaded.host_limits), (None, {}),
+                 "removed retry policies and host limits should be deleted from the ini")
+
+
 def _check_options_manager(root: Path) -> None:
     manager = OptionsManager(False)
     assert_false(manager.file_exists, "OptionsManager(False) should start without a backing file")
@@ -203,6 +255,149 @@ def _check_options_manager(root: Path) -> None:
     assert_equal(reloaded.others["contract"], {"items": [1, 2]}, "section attribute access should return parsed values")
 
 
+def _check_session_page_tree_cache(root: Path) -> None:
+    page = SessionPage(SessionOptions(read_file=False))
+    response = Response()
+    response._content = DOCUMENT.replace("<html>", "<html><head><title>Cached</title></head>", 1).encode("utf-8")
+    response.status_code = 200
+    response.encoding = "utf-8"
+    page._response = response
+
+    tree = page.s_ele().inner_ele
+    assert_equal(page.title, "Cached", "title should read from the parsed response")
+    assert_equal([e.attr("id") for e in page.eles("css:article.item")], ["first", "second"],
+                 "eles() should search the cached tree")
+    assert_true(page.ele("#first").inner_ele.getroottree().getroot() is tree,
+                "repeated lookups on one response should share one parsed tree")
+    assert_true(page.s_ele().inner_ele is tree, "s_ele() should reuse the cached tree")
+
+    page.set.encoding("latin-1")
+    assert_false(page.s_ele().inner_ele is tree, "set.encoding() should invalidate the cached tree")
+    tree = page.s_ele().inner_ele
+    response.encoding = "utf-8"
+    assert_false(page.s_ele().inner_ele is tree, "changing the response encoding should invalidate the cached tree")
+
+    html_file = root / "cached.html"
+    html_file.write_text("<html><body><p id='file'>file</p></body></html>", encoding="utf-8")
+    page.get(str(html_file))
+    assert_equal(page.ele("#file").text, "file", "a new get() should replace the cached tree")
+    assert_false(page.ele("#first"), "elements of the previous response should not be found after get()")
+
+
+def _check_session_page_fetch_many() -> None:
+    page = SessionPage(SessionOptions(read_file=False))
+    state = {"active": 0, "peak": 0, "started": []}
+    lock = Lock()
+
+    def fake_response(url, mode="get", retry=None, interval=None, raise_err=False, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["started"].append(url)
+        sleep(0.05 if url.endswith("/0") else 0.01)
+        with lock:
+            state["active"] -= 1
+        if url.endswith("/missing"):
+            raise ConnectionError("refused")
+        response = Response()
+        response._content = f"<html><head><title>{url[-1]}</title></head></html>".encode("utf-8")
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        return response
+
+    page._make_response = fake_response
+    urls = [f"https://example.test/page/{i}" for i in range(6)] + ["https://example.test/missing"]
+    results = page.get_many(urls, concurrency=3)
+    assert_equal([r[0] for r in results], urls, "get_many() should return results in input order")
+    assert_true(all(nav.ok for _, nav, _ in results[:-1]), "successful fetches should produce ok NavResults")
+    assert_equal([p.title for _, _, p in results[:-1]], [str(i) for i in range(6)],
+                 "each result should carry a parsed page for its own response")
+    assert_true(results[0][2].session is page.session, "result pages should share the pooled session")
+    assert_false(results[-1][1].ok, "failed fetches should be reported in their NavResult")
+    assert_equal((type(results[-1][1].error), str(results[-1][1].error)), (ConnectionError, "refused"),
+                 "the error of a failed fetch should be attached to its NavResult")
+    assert_equal(results[0][1].error, None, "successful fetches should carry no error")
+    assert_equal(state["peak"], 3, "get_many() should run up to concurrency requests at once")
+
+    page = SessionPage(SessionOptions(read_file=False).set_pool(maxsize=2).set_http_retry(3))
+    page._make_response = fake_response
+    adapter = page.session.get_adapter("https://")
+    state["peak"] = 0
+    page.get_many(urls[:6], concurrency=4)
+    assert_equal(state["peak"], 2, "concurrency should be capped at the configured pool size")
+    assert_true(page.session.get_adapter("https://") is adapter and adapter.max_retries.total == 3,
+                "get_many() should leave the session adapters and their settings untouched")
+
+    state["started"].clear()
+    produced = (f"https://example.test/lazy/{i}" for i in range(100))
+    stream = page.fetch_iter(produced, concurrency=2, buffer=1)
+    first = next(stream)
+    assert_in("/lazy/", first[0], "fetch_iter() should yield results as they complete")
+    sleep(0.1)
+    assert_true(len(state["started"]) <= 6, "a slow consumer should hold back new requests")
+    stream.close()
+    sleep(0.05)
+    stopped = len(state["started"])
+    sleep(0.05)
+    assert_equal(len(state["started"]), stopped, "closing the iterator should stop sending requests")
+    _expect_error(ValueError, lambda: page.get_many(urls, concurrency=0), "concurrency must be positive")
+
+
+def _check_session_page_iter_eles() -> None:
+    sitemap = (b'<?xml version="1.0" encoding="UTF-8"?>'
+               b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+               + b"".join(b"<url><loc>https://example.test/%d</loc><lastmod>2024</lastmod></url>" % i
+                          for i in range(300))
+               + b"</urlset>")
+    chunks = [sitemap[i:i + 97] for i in range(0, len(sitemap), 97)]
+    seen = []
+    peak = 0
+    for ele in iter_stream_eles(iter(chunks), "tag:loc", xml=True):
+        seen.append(ele.text)
+        peak = max(peak, len(ele.inner_ele.getparent().getparent()))
+    assert_equal(seen, [f"https://example.test/{i}" for i in range(300)],
+                 "namespaced xml should match unprefixed locators in document order")
+    assert_true(peak < 10, "elements before a yielded match should be released while streaming")
+    rare = sitemap.replace(b"</urlset>", b"<url><loc>needle</loc></url></urlset>")
+    found = [(e.text, len(e.inner_ele.getroottree().getroot()))
+             for e in iter_stream_eles([rare[i:i + 512] for i in range(0, len(rare), 512)],
+                                       'xpath://loc[text()="needle"]', xml=True)]
+    assert_equal(found[0][0], "needle", "rare matches should still be found")
+    assert_true(found[0][1] < 10, "finished elements that do not match should be released while streaming")
+    assert_equal([e.tag for e in iter_stream_eles([rare], 'xpath://url[loc="needle"]', xml=True)], ["url"],
+                 "elements inside an open candidate should be kept for its predicates")
+
+    html = b"<html><body>" + b"".join(b'<div class="item"><a href="/x%d">t%d</a></div>' % (i, i)
+                                      for i in range(20)) + b"</body></html>"
+    links = list(iter_stream_eles((html[i:i + 13] for i in range(0, len(html), 13)), "css:div.item > a"))
+    assert_equal(len(links), 20, "css selectors should match streamed html")
+    assert_equal(links[0].text, "", "a yielded element should be cleared once the next one is produced")
+    assert_equal([e.tag for e in iter_stream_eles([html], 'xpath://div[a="t3"]')], ["div"],
+                 "predicates on an element's own subtree should be evaluated when it ends")
+    _expect_error(LocatorError, lambda: list(iter_stream_eles([html], "xpath://div[")), "invalid xpath")
+
+    page = SessionPage(SessionOptions(read_file=False))
+    calls = []
+
+    def fake_stream(url, retry=None, interval=None, raise_err=False, **kwargs):
+        calls.append(kwargs)
+        response = Response()
+        response.raw = BytesIO(sitemap)
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/xml"})
+        return response
+
+    page._stream_response = fake_stream
+    eles = page.iter_eles("https://example.test/sitemap", "tag:loc", chunk_size=256)
+    first = next(eles)
+    assert_equal(first.text, "https://example.test/0", "iter_eles() should yield elements from the stream")
+    assert_equal(first.owner.url, "https://example.test/sitemap", "yielded elements should belong to a result page")
+    assert_equal(sum(1 for _ in eles) + 1, 300, "iter_eles() should yield every match")
+    assert_equal(calls[0]["timeout"], page.timeout, "iter_eles() should apply the page timeout")
+
+
 def _check_session_elements() -> None:
     root = make_session_ele(DOCUMENT)
     assert_true(isinstance(root, SessionElement), "inline HTML should produce a SessionElement")
@@ -2,16 +2,27 @@
 from __future__ import annotations
 
 from base64 import b64encode
+from json import loads
+from pathlib import Path
 from queue import Queue
+from tempfile import TemporaryDirectory
+from threading import Timer, enumerate as enumerate_threads
+from time import perf_counter
 from types import SimpleNamespace
 
+from DrissionPage._browsers.chromium import Tabs
+from DrissionPage._units.exporter import PacketExporter
 from DrissionPage._units.listener import (
     BrowserDataPacket,
+    BrowserListener,
+    CaptureQueue,
     DataPacket,
     Listener,
     SSEPacket,
     WebSocketConnectInfo,
     WebSocketPacket,
+    _compile_urls,
+    _dump_packet,
     in_targets,
     sse2list,
 )
@@ -64,8 +75,16 @@ def run(ctx):
     _check_filter_setters_and_target_matching()
     _check_listener_lifecycle_and_queues()
     _check_http_event_correlation()
+    _check_body_fetch_modes()
+    _check_streamed_body()
+    _check_packet_exporter()
+    _check_packet_timing_and_summary()
+    _check_capture_queue_overflow()
+    _check_fetch_intercept_mode()
     _check_websocket_and_sse_callbacks()
+    _check_websocket_channel()
     _check_browser_data_packet_contracts()
+    _check_browser_listener_paused_responses()
 
 
 def _make_packet(*, raw_post_data=None, post_data_entries=None, body='{"ok": true}', base64_body=False):
@@ -339,6 +358,26 @@ def _check_filter_setters_and_target_matching():
     assert_equal(in_targets(listener, "https://host.test/anything", "OPTIONS", "Other"),
                  (True, "OPTIONS", "Other"), "all filters should retain request metadata in the target tuple")
 
+    listener.set_urls([f"/static/{n}.js" for n in range(300)] + ["/api", "/api/v2", "a.b"])
+    assert_equal(in_targets(listener, "https://host.test/api/v2/list", "GET", "Fetch")[0], "/api/v2",
+                 "combined literal matching should report the longest filter at the match position")
+    assert_equal(in_targets(listener, "https://host.test/static/299.js", "GET", "Fetch")[0], "/static/299.js",
+                 "combined literal matching should find any of many filters")
+    assert_false(in_targets(listener, "https://host.test/axb", "GET", "Fetch"),
+                 "literal filters should not be treated as regular expressions")
+    listener.set_urls([r"/items/(\d+)", r"/(?P<kind>user|team)s/"], is_regex=True)
+    assert_equal(in_targets(listener, "https://host.test/teams/1", "GET", "Fetch")[0], r"/(?P<kind>user|team)s/",
+                 "combined regex matching should map the match back to the filter despite inner groups")
+    listener.set_urls([r"(ab)\1", "(?i)CASE"], is_regex=True)
+    assert_equal(in_targets(listener, "https://host.test/abab", "GET", "Fetch")[0], r"(ab)\1",
+                 "filters that cannot be merged should still match one by one")
+    assert_equal(in_targets(listener, "https://host.test/case", "GET", "Fetch")[0], "(?i)CASE",
+                 "inline flags should keep working")
+    for is_regex in (True, False):
+        assert_equal(_compile_urls(set(), is_regex)("https://host.test/a"), None,
+                     "an empty filter set should match no url")
+    listener.set_urls(True)
+
 
 def _check_listener_lifecycle_and_queues():
     owner = _Owner()
@@ -391,15 +430,37 @@ def _check_listener_lifecycle_and_queues():
     assert_equal(list(listener.steps(count=2, timeout=0.1, gap=2)), [["batch-1", "batch-2"]],
                  "steps should yield fixed-size batches when gap is greater than one")
 
-    listener._running_requests = 0
-    listener._running_targets = 0
     assert_true(listener.wait_silent(timeout=0.01),
                 "wait_silent should succeed immediately when no requests are active")
-    listener._running_requests = 1
+    listener._request_started("busy-1", False)
     assert_false(listener.wait_silent(timeout=0.001),
                  "wait_silent should time out while the active-request count exceeds the limit")
     assert_true(listener.wait_silent(timeout=0.01, limit=1),
                 "wait_silent limit should permit the configured number of active requests")
+    assert_true(listener.wait_silent(timeout=0.01, targets_only=True),
+                "non-target requests should not block targets_only waits")
+    listener._request_started("busy-1", False)
+    assert_equal(len(listener._inflight), 1, "redirects reuse the request id and should not be counted twice")
+    Timer(0.05, listener._request_ended, ("busy-1",)).start()
+    start = perf_counter()
+    assert_true(listener.wait_silent(timeout=2, idle=0.05), "wait_silent should be woken when requests end")
+    assert_true(0.09 <= perf_counter() - start < 1, "idle should count from the last in-flight change")
+    listener._request_started("poll-1", False)
+    Timer(0.03, listener._request_started, ("poll-2", False)).start()
+    assert_false(listener.wait_silent(timeout=0.2, limit=1, idle=0.5),
+                 "exceeding the limit during the idle window should keep waiting")
+    listener._request_ended("poll-1")
+    listener._request_ended("poll-2")
+
+    Timer(.05, lambda: listener._caught.put("late")).start()
+    start = perf_counter()
+    assert_equal(listener.wait(timeout=5), "late", "wait should be woken by a queued packet")
+    assert_true(perf_counter() - start < 1, "wait should return as soon as the packet is queued")
+    Timer(.05, lambda: listener.pause(clear=False)).start()
+    start = perf_counter()
+    assert_false(listener.wait(timeout=5), "pausing the listener should release a blocked wait")
+    assert_true(perf_counter() - start < .4, "pause should wake a blocked wait instead of letting it time out")
+    listener.listening = True
 
     browser_queue = Queue()
     browser_queue.put("browser-one")
@@ -459,14 +520,407 @@ def _check_http_event_correlation():
                  "request extra-info should correlate by request id")
     assert_equal(packet.response.headers["x-response-extra"], "yes",
                  "response extra-info should correlate by request id")
-    assert_equal(listener._running_requests, 0, "completed HTTP callbacks should balance running request counts")
-    assert_equal(listener._running_targets, 0, "completed target callbacks should balance running target counts")
+    assert_equal(listener._inflight, set(), "completed HTTP callbacks should leave no request in flight")
+    assert_equal(listener._inflight_targets, set(), "completed target callbacks should leave no target in flight")
     assert_false("http-1" in listener._request_ids, "completed requests should be removed from correlation state")
     assert_false("http-1" in listener._extra_info_ids,
                  "completed extra-info records should be removed from correlation state")
     assert_in(("Network.getResponseBody", {"requestId": "http-1", "_ignore": True}), owner.cdp_calls,
               "loading completion should retrieve the response body by request id")
 
+def _check_body_fetch_modes():
+    def fire(listener, rid, size, post=False):
+        listener._requestWillBeSent(requestId=rid, type="XHR", request={
+            "url": f"https://example.test/{rid}", "method": "POST" if post else "GET", "headers": {},
+            "hasPostData": post})
+        listener._response_received(requestId=rid, type="XHR", timestamp=1.0,
+                                    response={"url": f"https://example.test/{rid}", "status": 200, "headers": {}})
+        listener._loading_finished(requestId=rid, encodedDataLength=size)
+        return listener.wait(timeout=0.01)
+
+    owner = _Owner()
+    listener = Listener(owner)
+    owner.listen = listener
+    owner.response_bodies.update({"lazy": {"body": '{"n": 1}', "base64Encoded": False},
+                                  "big": {"body": "x" * 10, "base64Encoded": False}})
+    owner.post_data["lazy"] = '{"q": 2}'
+    listener.start(True, body_mode="lazy", max_body_size=5)
+    packet = fire(listener, "lazy", 4, post=True)
+    assert_equal(owner.cdp_calls, [], "lazy mode should not fetch bodies on the event thread")
+    assert_equal(packet.request.postData, {"q": 2}, "lazy post data should be fetched on first read")
+    assert_equal(packet.response.body, {"n": 1}, "lazy body should be fetched on first read")
+    packet.response.raw_body
+    assert_equal([c[0] for c in owner.cdp_calls], ["Network.getRequestPostData", "Network.getResponseBody"],
+                 "lazy data should only be fetched once")
+
+    owner.cdp_calls.clear()
+    packet = fire(listener, "big", 10)
+    assert_equal(packet.response.body, None, "bodies over the size cap should be skipped")
+    assert_true(packet._body_skipped, "skipped bodies should be marked on the packet")
+    assert_equal(owner.cdp_calls, [], "capped bodies should never be requested")
+
+    listener.start(body_mode="never", max_body_size=0)
+    packet = fire(listener, "lazy", 4, post=True)
+    assert_equal((packet.response.body, packet.request.postData), (None, False),
+                 "never mode should skip body and post data")
+    assert_equal(owner.cdp_calls, [], "never mode should not call the browser")
+    listener.start()
+    assert_equal(listener._body_mode, "never", "restarting without a mode should keep the previous one")
+    _expect_error(ValueError, lambda: listener.start(body_mode="sometimes"), "unknown body modes should be rejected")
+
+
+def _check_streamed_body():
+    class StreamOwner(_Owner):
+        def __init__(self):
+            super().__init__()
+            self.chunks = [{"data": b64encode(b"abc").decode(), "base64Encoded": True, "eof": False},
+                           {"data": "de", "base64Encoded": False, "eof": True}]
+
+        def _run_cdp(self, method, **kwargs):
+            self.cdp_calls.append((method, kwargs))
+            if method == "Network.loadNetworkResource":
+                return {"resource": {"success": True, "stream": "io-1"}}
+            if method == "IO.read":
+                return self.chunks.pop(0)
+            if method == "IO.close":
+                return {}
+            return super()._run_cdp(method, **kwargs)
+
+    owner = StreamOwner()
+    packet = _make_packet(body=None)
+    packet.tab = owner
+    packet._raw_request["request"]["method"] = "GET"
+    packet._body_skipped = True
+    assert_equal(list(packet.response.iter_body(3)), [], "skipped bodies should not be downloaded again by default")
+    assert_equal(owner.cdp_calls, [], "iter_body() should not request the resource again unless asked to")
+    assert_equal(list(packet.response.iter_body(3, reload=True)), [b"abc", b"de"],
+                 "reloaded bodies should be streamed in chunks")
+    assert_equal([(c[0], c[1].get("size")) for c in owner.cdp_calls],
+                 [("Network.loadNetworkResource", None), ("IO.read", 3), ("IO.read", 3), ("IO.close", None)],
+                 "streams should be read with the requested chunk size and closed")
+
+    owner = StreamOwner()
+    packet = _make_packet(body=None)
+    packet.tab = owner
+    packet._raw_request["requestId"] = "lazy-1"
+    packet._raw_request["request"]["method"] = "GET"
+    packet._lazy_body = True
+    owner.response_bodies["lazy-1"] = {"body": "captured", "base64Encoded": False}
+    assert_equal(list(packet.response.iter_body(5, reload=True)), [b"captu", b"red"],
+                 "lazy bodies should be read from the captured response before any reload")
+    assert_equal({c[0] for c in owner.cdp_calls}, {"Network.getResponseBody"},
+                 "a captured body should not trigger a new download")
+
+    packet = _make_packet(body=b64encode(b"0123456789").decode(), base64_body=True)
+    assert_equal(list(packet.response.iter_body(4)), [b"0123", b"4567", b"89"],
+                 "bodies already in memory should be chunked without calling the browser")
+    assert_equal(list(packet.response.iter_body(5)), [b"01234", b"56789"],
+                 "base64 bodies should be decoded piece by piece into exact chunks")
+    assert_equal(list(_make_packet(body="中文abc").response.iter_body(4)), [b"\xe4\xb8\xad\xe6", b"\x96\x87ab", b"c"],
+                 "text bodies should be encoded piece by piece into exact chunks")
+    with TemporaryDirectory() as tmp:
+        path = packet.response.save_body(tmp, "body.bin", chunk_size=3)
+        with open(path, "rb") as f:
+            assert_equal(f.read(), b"0123456789", "save_body should write every chunk")
+        assert_true(packet.response.save_body(tmp, "body.bin").endswith("body_1.bin"),
+                    "save_body should not overwrite existing files by default")
+
+
+def _check_packet_exporter():
+    packet = _make_packet()
+    packet._raw_request["wallTime"] = 1700000000.5
+    packet._raw_response["timing"] = {"dnsStart": 1, "dnsEnd": 3, "connectStart": 3, "connectEnd": 8, "sslStart": 5,
+                                      "sslEnd": 8, "sendStart": 8, "sendEnd": 9, "receiveHeadersEnd": 20}
+    packet._body_size = 12
+    failed = _make_packet()
+    failed.is_failed = True
+    failed._raw_fail_info = {"errorText": "net::ERR_FAILED"}
+    ws = SimpleNamespace(type="WebSocketPacket")
+
+    with TemporaryDirectory() as tmp:
+        with PacketExporter(Path(tmp) / "out.jsonl", columns=("url", "status", "size", "error")) as exporter:
+            exporter.write(packet)
+            exporter.write([failed, ws])
+        assert_equal(exporter.count, 2, "only http packets should be exported")
+        rows = [loads(line) for line in (Path(tmp) / "out.jsonl").read_text().splitlines()]
+        assert_equal(rows, [{"url": packet.url, "status": 201, "size": 12, "error": None},
+                            {"url": packet.url, "status": 201, "size": None, "error": "net::ERR_FAILED"}],
+                     "jsonl rows should contain only the selected columns")
+
+        with PacketExporter(Path(tmp) / "out.har", columns=("url", "method", "started", "timing",
+                                                            "response_headers")) as exporter:
+            exporter.write(packet)
+            exporter.write(packet)
+        har = loads((Path(tmp) / "out.har").read_text())
+        entry = har["log"]["entries"][0]
+        assert_equal((len(har["log"]["entries"]), har["log"]["creator"]["name"]), (2, "DrissionPage"),
+                     "HAR output should be a complete log after closing")
+        assert_equal((entry["request"]["method"], entry["request"]["queryString"][1], entry["startedDateTime"]),
+                     ("POST", {"name": "blank", "value": ""}, "2023-11-14T22:13:20.500000+00:00"),
+                     "HAR entries should carry request fields")
+        assert_equal((entry["timings"]["dns"], entry["timings"]["connect"], entry["timings"]["wait"], entry["time"]),
+                     (2, 5, 11, 20), "HAR timings should be derived from the CDP resource timing")
+        assert_in({"name": "X-Base", "value": "response"}, entry["response"]["headers"],
+                  "selected headers should be written as HAR name/value lists")
+        assert_equal(entry["request"]["headers"], [], "unselected columns should fall back to HAR defaults")
+
+    _expect_error(ValueError, lambda: PacketExporter("x.jsonl", columns=("body",)), "unknown columns should fail")
+    _expect_error(ValueError, lambda: PacketExporter("x.csv", fmt="csv"), "unknown formats should fail")
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        _expect_error(EnvironmentError, lambda: PacketExporter("x.parquet"), "parquet should require pyarrow")
+
+
+def _check_packet_timing_and_summary():
+    def fire(rid, url, start, finish, size, res_type="XHR", timing=None, failed=False):
+        listener._requestWillBeSent(requestId=rid, type=res_type, timestamp=start,
+                                    request={"url": url, "method": "GET", "headers": {}})
+        listener._response_received(requestId=rid, type=res_type, timestamp=finish,
+                                    response={"url": url, "status": 200, "headers": {}, "timing": timing})
+        if failed:
+            listener._loading_failed(requestId=rid, type=res_type, timestamp=finish, errorText="net::ERR_FAILED")
+        else:
+            listener._loading_finished(requestId=rid, timestamp=finish, encodedDataLength=size)
+        return listener.wait(timeout=0.01)
+
+    owner = _Owner()
+    listener = Listener(owner)
+    listener.start(True, body_mode="never")
+    timing = {"requestTime": 100.01, "dnsStart": 0, "dnsEnd": 5, "connectStart": 5, "connectEnd": 20, "sslStart": 10,
+              "sslEnd": 20, "sendStart": 20, "sendEnd": 21, "receiveHeadersEnd": 90}
+    packet = fire("t1", "https://cdn.test/a.js", 100.0, 100.2, 500, "Script", timing)
+    t = packet.timing
+    assert_equal((t.host, t.total, t.dns, t.connect, t.ssl, t.send, t.wait, t.ttfb, t.download),
+                 ("cdn.test", 200.0, 5, 15, 10, 1, 69, 100.0, 100.0),
+                 "packet timing should split the request into CDP phases")
+    assert_equal((t.encoded_size, t.decoded_size), (500, None), "skipped bodies should have no decoded size")
+    packet = _make_packet(body=b64encode(b"hello").decode(), base64_body=True)
+    assert_equal(packet.timing.decoded_size, 5, "decoded size should come from the fetched body")
+    assert_equal(packet.timing.as_dict["total"], None, "unknown phases should be None")
+
+    for n, total in enumerate((0.3, 0.1, 0.4, 0.2)):
+        fire(f"h{n}", f"https://api.test/{n}", 1.0, 1.0 + total, 100)
+    fire("f1", "https://api.test/fail", 2.0, 2.5, None, failed=True)
+    summary = listener.summary()
+    assert_equal(summary["requests"], 6, "summary should count finished and failed targets")
+    assert_equal(summary["hosts"]["api.test"], {"count": 5, "bytes": 400, "min": 100.0, "max": 500.0, "avg": 300.0,
+                                                "p50": 300.0, "p95": 500.0},
+                 "host latency percentiles should use nearest rank")
+    assert_equal(summary["types"], {"Script": {"count": 1, "bytes": 500}, "XHR": {"count": 5, "bytes": 400}},
+                 "bytes should be aggregated per resource type")
+    listener.clear()
+    assert_equal(listener.summary()["requests"], 0, "clearing results should reset the summary")
+
+    for n in range(1, 5001):
+        listener._record_stats(SimpleNamespace(timing=SimpleNamespace(host="bulk.test", total=float(n)),
+                                               _resource_type="XHR", _body_size=2))
+    assert_equal((len(listener._stats), len(listener._stats[("bulk.test", "XHR")].samples)), (1, 1024),
+                 "stats should keep one bucket per host and type with a bounded sample")
+    bulk = listener.summary()["hosts"]["bulk.test"]
+    assert_equal((bulk["count"], bulk["bytes"], bulk["min"], bulk["max"], bulk["avg"]),
+                 (5000, 10000, 1.0, 5000.0, 2500.5), "counts, sums and extremes should stay exact")
+    assert_true(2000 < bulk["p50"] < 3000 and 4500 < bulk["p95"] <= 5000,
+                "percentiles should be estimated from the sample")
+
+
+def _check_capture_queue_overflow():
+    owner = _Owner()
+    listener = Listener(owner)
+    owner.listen = listener
+
+    def packet(n):
+        p = DataPacket(owner, ("/api", "GET", "XHR"))
+        p._raw_request = {"requestId": f"r{n}", "request": {"url": f"https://example.test/api/{n}", "method": "GET"}}
+        p._raw_body = f'{{"n": {n}}}'
+        return p
+
+    listener.start(True, queue_size=2, overflow="drop_oldest")
+    for n in range(4):
+        listener._caught.put(packet(n))
+    assert_equal([p.url[-1] for p in listener.wait(count=2, timeout=0.01)], ["2", "3"],
+                 "drop_oldest should keep the newest packets")
+    assert_equal(listener.dropped, 2, "dropped packets should be counted")
+
+    listener.start(overflow="drop_newest")
+    assert_equal(listener.dropped, 0, "restarting should reset the dropped counter")
+    for n in range(3):
+        listener._caught.put(packet(n))
+    assert_equal([p.url[-1] for p in listener.wait(count=2, timeout=0.01)], ["0", "1"],
+                 "drop_newest should keep the oldest packets")
+
+    listener.start(overflow="spill")
+    ws_info = WebSocketConnectInfo(owner, True, "ws-1", "wss://example.test/socket")
+    ws = WebSocketPacket(owner, True, {"requestId": "ws-1", "timestamp": 3.0,
+                                       "response": {"opcode": 1, "payloadData": '{"ok": 1}'}}, False)
+    ws._connect_info = ws_info
+    for n in range(4):
+        listener._caught.put(packet(n))
+    listener._caught.put(ws)
+    assert_equal((len(listener._caught.queue), listener._caught.spilled), (2, 3),
+                 "overflowing packets should be written to disk")
+    got = list(listener.steps(count=5, timeout=0.01))
+    assert_equal([p.url for p in got[:4]], [f"https://example.test/api/{n}" for n in range(4)],
+                 "steps should read spilled packets back in capture order")
+    assert_true(got[2].tab is owner and got[2].target == ("/api", "GET", "XHR"),
+                "restored packets should be bound to their tab with the original target")
+    assert_equal(got[3].response.body, {"n": 3}, "restored packets should keep their body")
+    assert_equal((got[4].url, got[4].data), ("wss://example.test/socket", {"ok": 1}),
+                 "restored websocket packets should keep their connection info")
+    assert_equal(listener._caught.spilled, 0, "reading everything back should empty the spill file")
+
+    queue = CaptureQueue(owner, 1, "block")
+    queue.put(packet(0))
+    Timer(0.05, queue.get_nowait).start()
+    begin = perf_counter()
+    queue.put(packet(1))
+    assert_true(perf_counter() - begin >= 0.04, "block should wait for a free slot")
+    Timer(0.05, queue.close).start()
+    queue.put(packet(2))
+    assert_equal((queue.qsize(), queue.dropped), (1, 1), "closing should release blocked producers")
+    queue = CaptureQueue(owner, 1, "block", block_timeout=0.05)
+    queue.put(packet(0))
+    begin = perf_counter()
+    queue.put(packet(1))
+    assert_true(perf_counter() - begin < 1, "a full blocking queue should not stall the event thread indefinitely")
+    assert_equal((queue.qsize(), queue.dropped), (1, 1), "packets that time out waiting should be dropped and counted")
+    _expect_error(ValueError, lambda: listener.start(overflow="grow"), "unknown overflow policies should be rejected")
+
+
+class _FetchOwner(_Owner):
+    def __init__(self, proxy=False):
+        super().__init__()
+        self._enabled = {"Fetch": 1} if proxy else {}
+        self._proxy_usr = "usr" if proxy else None
+        self._is_diff_domain = False
+        self._event_handlers = {"Fetch.requestPaused": [self._proxy_paused]} if proxy else {}
+        self.streams = {}
+
+    def _proxy_paused(self, **kwargs):
+        pass
+
+    def _set_callback(self, event, callback):
+        if callback:
+            self._event_handlers.setdefault(event, []).append(callback)
+        else:
+            self._event_handlers.pop(event, None)
+
+    def _remove_callback(self, event, callback):
+        if callback in self._event_handlers.get(event, ()):
+            self._event_handlers[event].remove(callback)
+
+    def _enable_domain(self, domain, **kwargs):
+        self.enabled.append((domain, kwargs))
+        self._enabled[domain] = self._enabled.get(domain, 0) + 1
+
+    def _disable_domain(self, domain):
+        self.disabled.append(domain)
+        self._enabled[domain] -= 1
+        if self._enabled[domain] <= 0:
+            self._enabled.pop(domain)
+
+    def _run_cdp(self, method, **kwargs):
+        self.cdp_calls.append((method, kwargs))
+        if method == "Fetch.getResponseBody":
+            return self.response_bodies.get(kwargs["requestId"], {})
+        if method == "Fetch.takeResponseBodyAsStream":
+            return {"stream": f"s-{kwargs['requestId']}"} if kwargs["requestId"] in self.streams else {}
+        if method == "IO.read":
+            parts = self.streams[kwargs["handle"][2:]]
+            return parts.pop(0) if parts else {"data": "", "eof": True}
+        if method in ("Fetch.enable", "Fetch.continueResponse", "Fetch.fulfillRequest", "IO.close"):
+            return {}
+        raise AssertionError(f"unexpected CDP call: {method}")
+
+
+def _check_fetch_intercept_mode():
+    def pause(owner, rid, url, **extra):
+        params = {"requestId": rid, "networkId": f"net-{rid}", "frameId": "frame-17", "resourceType": "XHR",
+                  "request": {"url": url, "method": "GET", "headers": {}}}
+        params.update(extra)
+        for func in list(owner._event_handlers["Fetch.requestPaused"]):
+            func(**params)
+
+    owner = _FetchOwner()
+    listener = Listener(owner)
+    owner.response_bodies["f1"] = {"body": '{"ok": 1}', "base64Encoded": False}
+    listener.start("api", intercept=True)
+    assert_equal(owner.enabled, [("Fetch", {"patterns": [{"urlPattern": "*api*", "requestStage": "Response"}],
+                                            "handleAuthRequests": False})],
+                 "intercept mode should enable Fetch with the target patterns instead of Network")
+    pause(owner, "f1", "https://example.test/api/a", responseStatusCode=200,
+          responseHeaders=[{"name": "Content-Type", "value": "application/json"},
+                           {"name": "Content-Length", "value": "9"}])
+    packet = listener.wait(timeout=0.01)
+    assert_equal((packet.request.url, packet._raw_request["requestId"], packet.response.status,
+                  packet.response.headers["content-type"], packet.response.body),
+                 ("https://example.test/api/a", "net-f1", 200, "application/json", {"ok": 1}),
+                 "paused responses should become complete packets")
+    assert_equal([c[0] for c in owner.cdp_calls], ["Fetch.getResponseBody", "Fetch.continueResponse"],
+                 "the body should be read before the response is released")
+    _expect_error(RuntimeError, listener.wait_silent, "wait_silent() cannot track requests while intercepting")
+    _expect_error(RuntimeError, lambda: packet.wait_extra_info(0), "intercepted packets carry no extra info")
+
+    owner.cdp_calls.clear()
+    owner.streams["f5"] = [{"data": b64encode(b"\x00big").decode(), "base64Encoded": True, "eof": False},
+                           {"data": b64encode(b"body").decode(), "base64Encoded": True, "eof": True}]
+    pause(owner, "f5", "https://example.test/api/big", responseStatusCode=200,
+          responseHeaders=[{"name": "Content-Encoding", "value": "gzip"}, {"name": "X-Id", "value": "5"}])
+    packet = listener.wait(timeout=0.01)
+    assert_equal([c[0] for c in owner.cdp_calls], ["Fetch.takeResponseBodyAsStream", "IO.read", "IO.read",
+                                                  "IO.close", "Fetch.fulfillRequest"],
+                 "bodies of unknown size should be streamed and handed back instead of continued")
+    assert_equal(owner.cdp_calls[-1][1], {"requestId": "f5", "responseCode": 200,
+                                          "responseHeaders": [{"name": "X-Id", "value": "5"}],
+                                          "body": b64encode(b"\x00bigbody").decode(), "_ignore": True,
+                                          "_timeout": 0},
+                 "the streamed body should complete the request without the original encoding headers")
+    assert_equal((packet._raw_body, packet._body_size, list(packet.response.iter_body(4))),
+                 (None, 8, [b"\x00big", b"body"]), "streamed bodies should be read back from the temporary file")
+    assert_equal(packet.response.body, b"\x00bigbody", "streamed binary bodies should still decode as bytes")
+    assert_equal(_dump_packet(packet)["_raw_body"], b64encode(b"\x00bigbody").decode(),
+                 "spilling should write the streamed body with the packet")
+
+    owner.cdp_calls.clear()
+    pause(owner, "f2", "https://example.test/other", responseStatusCode=200)
+    pause(owner, "f3", "https://example.test/api/b", responseErrorReason="Failed")
+    pause(owner, "f4", "https://example.test/api/c")
+    assert_equal([c for c in owner.cdp_calls if c[0] != "Fetch.continueResponse"], [],
+                 "non-target and failed responses should not fetch bodies")
+    assert_equal(len(owner.cdp_calls), 2, "request-stage pauses should be left to other handlers")
+    packet = listener.wait(timeout=0.01)
+    assert_true(packet.is_failed and packet.fail_info.errorText == "Failed", "failed responses should be reported")
+    assert_false(listener.wait(timeout=0.01), "only target responses should be queued")
+
+    listener.stop()
+    assert_equal((owner.disabled, owner._event_handlers.get("Fetch.requestPaused")), (["Fetch"], []),
+                 "stopping should disable Fetch and drop the handler")
+
+    owner = _FetchOwner(proxy=True)
+    listener = Listener(owner)
+    listener.start(True, body_mode="never", intercept=True)
+    assert_equal(owner._event_handlers["Fetch.requestPaused"], [listener._request_paused, owner._proxy_paused],
+                 "the listener should run before the proxy handler releases the response")
+    assert_equal(owner.cdp_calls, [("Fetch.enable", {"patterns": [{"requestStage": "Response"}, {"urlPattern": "*"}],
+                                                     "handleAuthRequests": True})],
+                 "an enabled Fetch domain should be re-enabled with proxy and listener patterns")
+    pause(owner, "p1", "https://example.test/x", responseStatusCode=204)
+    assert_true(listener.wait(timeout=0.01)._body_skipped, "never mode should not fetch bodies")
+    owner.cdp_calls.clear()
+    listener.stop()
+    assert_equal((owner._event_handlers["Fetch.requestPaused"], owner.cdp_calls),
+                 ([owner._proxy_paused], [("Fetch.enable", {"handleAuthRequests": True, "_ignore": True})]),
+                 "stopping should restore the proxy handler and its Fetch settings")
+    listener.start(intercept=False)
+    assert_equal(owner.enabled[-1], ("Network", {}), "turning intercept off should go back to Network events")
+    listener.stop()
+
+    listener.set_urls("api")
+    listener._res_type = {"XHR", "Fetch"}
+    assert_equal(sorted(p["resourceType"] for p in listener._fetch_patterns()), ["Fetch", "XHR"],
+                 "each resource type should get its own Fetch pattern")
+
+
 def _check_websocket_and_sse_callbacks():
     owner = _Owner()
     listener = Listener(owner)
@@ -523,6 +977,50 @@ def _check_websocket_and_sse_callbacks():
     assert_equal(event.data, "ready", "SSE callbacks should retain event data")
 
 
+def _check_websocket_channel():
+    def frame(rid, n, opcode=1):
+        payload = f'{{"n": {n}}}' if opcode == 1 else b64encode(bytes([n])).decode()
+        listener._webSocketFrameReceived(requestId=rid, timestamp=n, response={"opcode": opcode, "payloadData": payload})
+
+    owner = _Owner()
+    listener = Listener(owner)
+    owner.listen = listener
+    listener.set_res_type.XHR(only=True)
+    listener.start(True)
+    listener._webSocketCreated(requestId="ws-old", url="wss://feed.test/old")
+    channel = listener.ws_channel("feed.test/quotes", size=3)
+    assert_in("Network.webSocketFrameReceived", owner.callbacks,
+              "a channel should subscribe to websocket frames even when the filter excludes them")
+    listener._webSocketCreated(requestId="ws-q", url="wss://feed.test/quotes?s=1")
+    listener._webSocketCreated(requestId="ws-x", url="wss://other.test/chat")
+    for n in range(5):
+        frame("ws-q", n)
+    frame("ws-x", 9)
+    frame("ws-old", 9)
+    assert_equal((channel.connections, len(channel), channel.dropped), (["wss://feed.test/quotes?s=1"], 3, 2),
+                 "the ring buffer should keep the newest frames of matching connections only")
+    assert_false(listener.wait(timeout=0.01), "frames outside the res_type filter should not reach the queue")
+    batch = next(channel.batches(size=2, timeout=0.01))
+    assert_equal([p._payload for p in batch], [None, None], "frames should not be decoded when buffered")
+    assert_equal([p.data for p in batch] + [channel.get(timeout=0.01).data], [{"n": 2}, {"n": 3}, {"n": 4}],
+                 "batches should yield frames oldest first")
+    assert_equal(channel.get(timeout=0.01), None, "an empty channel should time out")
+
+    frame("ws-q", 7, opcode=2)
+    packet = channel.drain()[0]
+    assert_true(packet.is_binary and packet.data == b"\x07", "binary frames should decode to bytes lazily")
+    assert_equal(packet.url, "wss://feed.test/quotes?s=1", "channel frames should carry the connection url")
+
+    all_channel = listener.ws_channel(size=10)
+    assert_true(channel.closed, "creating a channel should close the previous one")
+    assert_equal(sorted(all_channel._connections), ["ws-old", "ws-q", "ws-x"],
+                 "a new channel should pick up connections that are already open")
+    listener._webSocketClosed(requestId="ws-x")
+    assert_equal(sorted(all_channel._connections), ["ws-old", "ws-q"], "closed connections should be forgotten")
+    Timer(0.05, listener.stop).start()
+    assert_equal(list(all_channel.batches(timeout=2)), [], "batch iteration should end when listening stops")
+
+
 def _check_browser_data_packet_contracts():
     raw = {
         "requestId": "fetch-1",
@@ -563,6 +1061,113 @@ def _check_browser_data_packet_contracts():
     assert_equal(failed_packet.response.errorReason, "Failed", "browser response errors should remain available")
 
 
+def _check_browser_listener_paused_responses():
+    class Tab:
+        def __init__(self):
+            self.domains = []
+            self._enabled = {}
+
+        def _enable_domain(self, domain):
+            self.domains.append(("enable", domain))
+
+        def _disable_domain(self, domain):
+            self.domains.append(("disable", domain))
+
+        def _run_cdp(self, method, **kwargs):
+            return {"body": "lazy", "base64Encoded": False} if kwargs["requestId"] == "net-3" else {"error": "x"}
+
+    class Driver:
+        def __init__(self):
+            self.calls = []
+
+        def run(self, method, _session_id=None, **kwargs):
+            self.calls.append((method, _session_id))
+            return {}
+
+    class Browser:
+        timeout = 2
+
+        def __init__(self):
+            self._tabs = Tabs()
+            self._driver = Driver()
+            self.calls = []
+
+        def _set_callback(self, event, callback):
+            pass
+
+        def _enable_domain(self, domain, **kwargs):
+            self.calls.append(("enable", domain))
+
+        def _disable_domain(self, domain):
+            self.calls.append(("disable", domain))
+
+        def _run_cdp(self, method, **kwargs):
+            self.calls.append((method, kwargs["requestId"]))
+            return {"body": "eager", "base64Encoded": False} if method == "Fetch.getResponseBody" else {}
+
+    def pause(rid, frame="frame-a"):
+        listener._onRequestPaused(requestId=rid, networkId=f"net-{rid[-1]}", frameId=frame, resourceType="XHR",
+                                  request={"url": f"https://example.test/{rid}", "method": "GET"},
+                                  responseStatusCode=200)
+
+    browser = Browser()
+    listener = BrowserListener(browser)
+    listener.start(True)
+    pause("r1")
+    assert_false(browser._tabs._frames, "the handler should return without waiting for the frame owner")
+    Timer(0.05, browser._tabs.add_frame, ("frame-a", "tab-a")).start()
+    packet = listener._caught.setdefault("tab-a", Queue()).get(timeout=2)
+    assert_equal((packet.tab_id, packet.response.body), ("tab-a", "eager"),
+                 "packets should be routed once the frame owner is known")
+    assert_equal([c[0] for c in browser.calls[1:]], ["Fetch.getResponseBody", "Fetch.continueResponse"],
+                 "eager mode should read the body before releasing the response")
+
+    tab = Tab()
+    browser._tabs.add("session-a", "tab-a", obj=tab)
+    browser.calls.clear()
+    listener.start(body_mode="lazy")
+    assert_equal(tab.domains, [("enable", "Network")], "lazy mode should keep bodies available in connected tabs")
+    pause("r3")
+    assert_equal(browser.calls, [("Fetch.continueResponse", "r3")], "lazy mode should release responses at once")
+    packet = listener._caught["tab-a"].get_nowait()
+    assert_equal(packet.response.body, "lazy", "lazy bodies should be read from the owning tab on first access")
+    browser._tabs.add("session-b", "tab-b")
+    listener._tab_attached("session-b")
+    assert_equal(browser._driver.calls, [("Network.enable", "session-b")],
+                 "tabs opened while listening in lazy mode should get Network enabled")
+    new_tab = Tab()
+    browser._tabs.add_obj("session-b", new_tab)
+    listener._tab_attached("session-b")
+    assert_equal((new_tab.domains, new_tab._enabled), ([], {"Network": 1}),
+                 "an object taking over an enabled session should count the domain instead of enabling it again")
+
+    listener.start(body_mode="never")
+    assert_equal(tab.domains[-1], ("disable", "Network"), "leaving lazy mode should release the tab Network domain")
+    assert_equal(new_tab.domains, [("disable", "Network")], "tabs attached while listening should be released too")
+    browser._tabs.add("session-c", "tab-c")
+    listener._tab_attached("session-c")
+    assert_equal(len(browser._driver.calls), 1, "tabs attached outside lazy mode should be left alone")
+    browser.timeout = 0.01
+    pause("r4", frame="tab-b")
+    packet = listener._caught.setdefault("tab-b", Queue()).get(timeout=2)
+    assert_equal((packet.tab_id, packet.response.body), ("tab-b", None),
+                 "unknown frames should fall back to their own id and never mode should skip bodies")
+    _expect_error(ValueError, lambda: listener.start(body_mode="later"), "unknown body modes should be rejected")
+
+    listener.start(body_mode="eager")
+    browser.timeout = 2
+    for n in range(8):
+        pause(f"o{n}", frame="frame-c")
+    workers = [t for t in enumerate_threads() if getattr(t, "_target", None) == listener._paused_worker]
+    assert_equal(len(workers), 1, "eager mode should hand paused responses to a single worker thread")
+    Timer(0.05, browser._tabs.add_frame, ("frame-c", "tab-c")).start()
+    caught = listener._caught.setdefault("tab-c", Queue())
+    urls = [caught.get(timeout=2).url for _ in range(8)]
+    assert_equal(urls, [f"https://example.test/o{n}" for n in range(8)],
+                 "paused responses should be queued in the order they arrived")
+    listener.stop()
+
+
 def _expect_error(error_type, action, message):
     try:
         action()
@@ -4,6 +4,7 @@ from __future__ import annotations
 from base64 import b64encode
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
+from threading import Condition
 from types import SimpleNamespace
 
 from DrissionPage._units.clicker import Clicker
@@ -391,7 +392,7 @@ def test_waiter_contracts():
 
     mission = Mission()
     dl_mgr = SimpleNamespace(_running=True, _missions={}, set_flag=lambda tid, flag: None,
-                             get_flag=lambda tid: mission)
+                             get_flag=lambda tid: mission, _flag_cond=Condition())
     browser = SimpleNamespace(_dl_mgr=dl_mgr, _messenger_running=True, timeout=0.01)
     assert_true(BrowserWaiter(browser).downloads_done(timeout=0.01),
                 "downloads_done() should succeed when no missions remain")
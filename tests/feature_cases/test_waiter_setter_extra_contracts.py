@@ -5,6 +5,7 @@ from base64 import b64encode
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from threading import Condition
 from types import SimpleNamespace
 
 import DrissionPage._units.downloader as downloader_module
@@ -151,6 +152,7 @@ def test_waiter_failure_and_cleanup_contracts():
     disconnected_manager = SimpleNamespace(
         get_flag=lambda tab_id: flags.get(tab_id),
         set_flag=lambda tab_id, value: flags.__setitem__(tab_id, value),
+        _flag_cond=Condition(),
     )
     disconnected = SimpleNamespace(_messenger_running=False, _dl_mgr=disconnected_manager)
     assert_false(wait_mission(disconnected, 'tab', 0), 'disconnected mission wait should fail immediately')
@@ -410,6 +412,7 @@ def _check_click_download(root, new_tab):
             self._running = True
             self._waiting_tab = set()
             self._tab_missions = {}
+            self._flag_cond = Condition()
             self.flags = {}
 
         def set_flag(self, tab_id, value):